@@ -0,0 +1,228 @@
+"""asyncio adapters for OpenFlow message streams.
+
+:class:`OpenFlowProtocol` is an :class:`asyncio.Protocol` for servers and
+clients created with :meth:`~asyncio.AbstractEventLoop.create_server` or
+:meth:`~asyncio.AbstractEventLoop.create_connection`, and
+:func:`iter_messages` reads messages from an :class:`asyncio.StreamReader`.
+Both frame the byte stream with :class:`~pyof.utils.MessageFramer`, which
+unpacks each message with the library of its OpenFlow version (see
+:data:`~pyof.utils.PYOF_VERSION_LIBS`).
+"""
+import asyncio
+from collections import deque
+
+from pyof.foundation.exceptions import UnpackException
+from pyof.utils import MessageFramer
+
+__all__ = ('OpenFlowProtocol', 'iter_messages')
+
+# asyncio.get_running_loop is new in Python 3.7
+_get_running_loop = getattr(asyncio, 'get_running_loop',
+                            asyncio.get_event_loop)
+
+
+class OpenFlowProtocol(asyncio.Protocol):
+    """Protocol that unpacks received messages and batches sent ones.
+
+    Received messages are queued until they are read with :meth:`receive` or
+    ``async for``. When the queue reaches ``high_water`` messages, reading
+    from the transport is paused, and it is resumed once the queue drops to
+    ``low_water`` messages.
+
+    Messages passed to :meth:`send` are packed right away and all of them are
+    written with a single :meth:`~asyncio.WriteTransport.writelines` call on
+    the next iteration of the event loop.
+
+    .. code-block:: python3
+
+        async def handle(protocol):
+            async for message in protocol:
+                if message.header.message_type == Type.OFPT_ECHO_REQUEST:
+                    protocol.send(EchoReply(xid=message.header.xid))
+    """
+
+    def __init__(self, lazy=False, high_water=1024, low_water=None,
+                 types=None, exclude=None):
+        """Create a protocol for one connection.
+
+        Args:
+            lazy (bool): Whether messages are unpacked lazily. See
+                :meth:`~pyof.foundation.base.GenericMessage.unpack_lazy`.
+            high_water (int): Number of queued messages that pauses reading.
+            low_water (int): Number of queued messages that resumes reading.
+                Defaults to a quarter of ``high_water``.
+            types (iterable): Message types to be decoded (allow list). The
+                others are received as :class:`~pyof.utils.RawMessage`.
+                See :func:`~pyof.utils.iter_unpack`.
+            exclude (iterable): Message types not to be decoded (deny list).
+        """
+        self.high_water = high_water
+        self.low_water = high_water // 4 if low_water is None else low_water
+        self.transport = None
+        self._framer = MessageFramer(lazy=lazy, types=types,
+                                     exclude=exclude)
+        self._loop = None
+        #: Received messages, exceptions and None at the end of the stream
+        self._received = deque()
+        self._receive_waiter = None
+        self._reading_paused = False
+        self._outgoing = []
+        self._writing_paused = False
+        self._drain_waiter = None
+
+    def connection_made(self, transport):
+        """Store the transport."""
+        self.transport = transport
+
+    def _get_loop(self):
+        if self._loop is None:
+            self._loop = _get_running_loop()
+        return self._loop
+
+    def connection_lost(self, exc):
+        """End the stream of received messages and wake up writers."""
+        if exc is not None:
+            self._put(exc)
+        self._put(None)
+        self._wake_up_writers()
+
+    def data_received(self, data):
+        """Unpack the complete messages and queue them."""
+        messages = self._framer.feed(data)
+        while True:
+            pending = len(self._framer)
+            try:
+                for message in messages:
+                    self._put(message)
+                    pending = len(self._framer)
+            except UnpackException as exception:
+                self._put(exception)
+                if len(self._framer) == pending:
+                    # The header is invalid, so the stream can't be framed
+                    self.transport.close()
+                    return
+                messages = iter(self._framer)
+                continue
+            break
+        if (not self._reading_paused and
+                len(self._received) >= self.high_water):
+            self._reading_paused = True
+            self.transport.pause_reading()
+
+    def eof_received(self):
+        """Let the transport close itself."""
+        return False
+
+    def _put(self, item):
+        self._received.append(item)
+        waiter = self._receive_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def receive(self):
+        """Return the next received message.
+
+        Returns:
+            GenericMessage: The message, or None if the connection is closed.
+
+        Raises:
+            UnpackException: If the next message can't be unpacked.
+            Exception: The error that closed the connection, if any.
+
+        """
+        while not self._received:
+            self._receive_waiter = self._get_loop().create_future()
+            try:
+                await self._receive_waiter
+            finally:
+                self._receive_waiter = None
+        item = self._received[0]
+        if item is None:
+            return None
+        self._received.popleft()
+        if (self._reading_paused and
+                len(self._received) <= self.low_water and
+                not self.transport.is_closing()):
+            self._reading_paused = False
+            self.transport.resume_reading()
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.receive()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    def send(self, message):
+        """Queue a message to be written on the next event loop iteration.
+
+        Args:
+            message (GenericMessage, bytes): Message to be packed and sent,
+                or an already packed message.
+        """
+        if not isinstance(message, bytes):
+            message = message.pack()
+        if not self._outgoing:
+            self._get_loop().call_soon(self._flush)
+        self._outgoing.append(message)
+
+    def _flush(self):
+        outgoing, self._outgoing = self._outgoing, []
+        if not self.transport.is_closing():
+            self.transport.writelines(outgoing)
+
+    def pause_writing(self):
+        """Record that the transport buffer is above its high-water mark."""
+        self._writing_paused = True
+
+    def resume_writing(self):
+        """Wake up the coroutines waiting in :meth:`drain`."""
+        self._writing_paused = False
+        self._wake_up_writers()
+
+    def _wake_up_writers(self):
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def drain(self):
+        """Wait until the transport accepts more data to be written."""
+        while self._writing_paused and not self.transport.is_closing():
+            if self._drain_waiter is None or self._drain_waiter.done():
+                self._drain_waiter = self._get_loop().create_future()
+            await self._drain_waiter
+
+
+async def iter_messages(reader, lazy=False, chunk_size=65536, types=None,
+                        exclude=None):
+    """Yield the messages read from a stream.
+
+    Args:
+        reader (asyncio.StreamReader): Stream with OpenFlow messages.
+        lazy (bool): Whether messages are unpacked lazily. See
+            :meth:`~pyof.foundation.base.GenericMessage.unpack_lazy`.
+        chunk_size (int): Maximum number of bytes read at once.
+        types (iterable): Message types to be decoded (allow list). The others
+            are yielded as :class:`~pyof.utils.RawMessage`. See
+            :func:`~pyof.utils.iter_unpack`.
+        exclude (iterable): Message types not to be decoded (deny list).
+
+    Yields:
+        GenericMessage: Each message, until the end of the stream.
+
+    Raises:
+        UnpackException: If a message can't be unpacked.
+
+    """
+    framer = MessageFramer(lazy=lazy, types=types, exclude=exclude)
+    while True:
+        data = await reader.read(chunk_size)
+        if not data:
+            return
+        for message in framer.feed(data):
+            yield message
@@ -19,9 +19,11 @@ These classes are used in all parts of this library.
 import importlib
 import re
 import struct
-from collections import OrderedDict
+import weakref
+from collections import OrderedDict, namedtuple
 from copy import deepcopy
-from enum import Enum, IntEnum
+from enum import Enum
+from functools import lru_cache
 from random import randint
 
 from pyof.foundation.constants import UBINT32_MAX_VALUE as MAXID
@@ -33,7 +35,53 @@ from pyof.foundation.exceptions import (
 
 # This will determine the order on sphinx documentation.
 __all__ = ('GenericStruct', 'GenericMessage', 'GenericType', 'GenericBitMask',
-           'MetaStruct', 'MetaBitMask', 'UBIntBase')
+           'TypeDispatchedStruct', 'MetaStruct', 'MetaBitMask', 'UBIntBase',
+           'HeaderInfo')
+
+#: Header fields read by the ``peek_header`` functions, without creating a
+#: message or header object. ``message_type`` is a member of the ``Type`` enum
+#: of the message version.
+HeaderInfo = namedtuple('HeaderInfo', ('version', 'message_type', 'length',
+                                       'xid'))
+
+#: Value to member dict of each enum used as ``enum_ref``, or None for other
+#: types (e.g. bitmasks)
+_ENUM_MEMBERS = {}
+
+
+def _enum_members(enum_ref):
+    """Return the value to member dict of an :class:`~enum.Enum`.
+
+    It is computed once per enum, so converting unpacked values doesn't go
+    through the slow ``Enum.__call__``.
+
+    Returns:
+        dict: Members by value, or None if ``enum_ref`` is not an Enum.
+
+    """
+    try:
+        return _ENUM_MEMBERS[enum_ref]
+    except KeyError:
+        pass
+    if isinstance(enum_ref, type) and issubclass(enum_ref, Enum):
+        members = {member.value: member for member in enum_ref}
+    else:
+        members = None
+    _ENUM_MEMBERS[enum_ref] = members
+    return members
+
+
+def _to_enum(enum_ref, value):
+    """Return the ``enum_ref`` member (or bitmask) with the given value."""
+    members = _enum_members(enum_ref)
+    if members is not None:
+        try:
+            return members[value]
+        except KeyError:
+            pass
+    # Unknown values raise ValueError, as usual
+    return enum_ref(value)
+
 
 # Classes
 
@@ -43,8 +91,14 @@ class GenericType:
 
     Base class for :class:`~.UBIntBase`, :class:`~.Char`
     and others.
+
+    Instances store only ``_value`` and ``enum_ref`` in slots. Subclasses
+    that declare ``__slots__`` too have no instance ``__dict__``, which saves
+    memory on large decoded messages.
     """
 
+    __slots__ = ('_value', 'enum_ref')
+
     _fmt = None
 
     def __init__(self, value=None, enum_ref=None):
@@ -62,6 +116,21 @@ class GenericType:
         """Improve deepcopy speed."""
         return type(self)(value=self._value, enum_ref=self.enum_ref)
 
+    def _clone(self):
+        """Return a copy of this object without :func:`copy.deepcopy`.
+
+        Used to create struct attributes from the class attributes. Like in
+        :meth:`__deepcopy__`, the value itself is shared with the copy.
+        Subclasses with additional slots must copy them, too.
+        """
+        clone = object.__new__(type(self))
+        clone._value = self._value
+        clone.enum_ref = self.enum_ref
+        instance_dict = getattr(self, '__dict__', None)
+        if instance_dict is not None:
+            clone.__dict__ = instance_dict.copy()
+        return clone
+
     def __repr__(self):
         return "{}({})".format(type(self).__name__, repr(self._value))
 
@@ -137,13 +206,15 @@ class GenericType:
             object: The value of an enum, bitmask, etc.
 
         """
-        if self.is_enum():
-            if isinstance(self._value, self.enum_ref):
-                return self._value.value
-            return self._value
-        if self.is_bitmask():
-            return self._value.bitmask
-        return self._value
+        value = self._value
+        enum_ref = self.enum_ref
+        if enum_ref is not None and _enum_members(enum_ref) is not None:
+            if isinstance(value, enum_ref):
+                return value.value
+            return value
+        if isinstance(value, GenericBitMask):
+            return value.bitmask
+        return value
 
     def pack(self, value=None):
         r"""Pack the value as a binary representation.
@@ -192,6 +263,29 @@ class GenericType:
             msg = 'Expected {}, found value "{}" of type {}'.format(*msg_args)
             raise PackException(msg)
 
+    def pack_into(self, buffer, offset=0, value=None):
+        """Pack the value into a writable buffer, such as a bytearray.
+
+        Like :meth:`pack`, but the binary representation is written into
+        *buffer*, which must be large enough (see :meth:`get_size`), instead
+        of returning a new bytes object.
+
+        Args:
+            buffer (bytearray): Writable buffer, e.g. a :class:`bytearray`,
+                :class:`mmap.mmap` or :class:`memoryview`.
+            offset (int): Where to begin writing.
+            value: Value to be packed instead of this instance's value, as in
+                :meth:`pack`.
+
+        Returns:
+            int: Offset right after the written data.
+
+        Raises:
+            :exc:`~.exceptions.PackException`: If the value can't be packed.
+
+        """
+        return _write_packed(self.pack(value), buffer, offset)
+
     def unpack(self, buff, offset=0):
         """Unpack *buff* into this object.
 
@@ -209,11 +303,12 @@ class GenericType:
         try:
             self._value = struct.unpack_from(self._fmt, buff, offset)[0]
             if self.enum_ref:
-                self._value = self.enum_ref(self._value)
+                self._value = _to_enum(self.enum_ref, self._value)
         except (struct.error, TypeError, ValueError) as exception:
             msg = '{}; fmt = {}, buff = {}, offset = {}.'.format(exception,
                                                                  self._fmt,
-                                                                 buff, offset)
+                                                                 bytes(buff),
+                                                                 offset)
             raise UnpackException(msg)
 
     def get_size(self, value=None):  # pylint: disable=unused-argument
@@ -247,7 +342,8 @@ class GenericType:
             bool: Whether it is an :class:`~enum.Enum`.
 
         """
-        return self.enum_ref and issubclass(self.enum_ref, (Enum, IntEnum))
+        enum_ref = self.enum_ref
+        return enum_ref is not None and _enum_members(enum_ref) is not None
 
     def is_bitmask(self):
         """Test whether it is a :class:`GenericBitMask`.
@@ -256,11 +352,75 @@ class GenericType:
             bool: Whether it is a :class:`GenericBitMask`.
 
         """
-        return self._value and issubclass(type(self._value), GenericBitMask)
+        return isinstance(self._value, GenericBitMask)
+
+    def _codec_format(self):
+        """Return this type's format inside a compiled struct codec.
+
+        Types with a fixed-size binary representation return its
+        :mod:`struct` format, without the byte order character, so
+        :class:`MetaStruct` can merge consecutive struct attributes into a
+        single :class:`struct.Struct`. The format must describe at most one
+        item, which is converted by :meth:`_codec_pack` and
+        :meth:`_codec_unpack`. Other types return None and are packed and
+        unpacked by their own methods.
+
+        The default converters exchange the binary representation itself,
+        so a type whose format is ``'<size>s'`` only needs to override this
+        method. Types whose item is not a byte string (integers, for
+        instance) override the converters as well.
+
+        Subclasses that change the binary representation of a type that
+        returns a format must override this method as well.
+
+        Returns:
+            str: struct format, or None if this type can't be merged.
+
+        """
+        return None
+
+    def _codec_pack(self, value):
+        """Return the struct item that represents ``value``.
+
+        ``self`` is a class attribute and ``value`` is the instance attribute
+        with the same name, like in :meth:`pack`. By default, the item is
+        the packed ``value``.
+        """
+        return self.pack(value)
+
+    def _codec_unpack(self, item):
+        """Return a new instance of this type holding the struct ``item``.
+
+        By default, ``item`` is unpacked into a copy of this type.
+        """
+        clone = self._clone()
+        clone.unpack(item)
+        return clone
+
+    def _intern_key(self):
+        """Return the key that identifies this value in the interning pool.
+
+        Instances with the same key are interchangeable, so
+        :meth:`GenericMessage.unpack_interned` shares a single one of them.
+        Types whose instances can't be shared return None.
+
+        Returns:
+            tuple: Hashable key, including the type, or None.
+
+        """
+        return None
 
 
 class UBIntBase(GenericType):
-    """Base class for UBInt{8,16,32,64,128}."""
+    """Base class for UBInt{8,16,32,64,128}.
+
+    Subclasses define the struct format in ``_fmt`` and its size in bytes in
+    ``_size``.
+    """
+
+    __slots__ = ()
+
+    _size = None
 
     def __int__(self):
         """Allow converting an UBInt() back to an int()."""
@@ -268,6 +428,280 @@ class UBIntBase(GenericType):
         # (because it won't be), and convert directly from _value
         return int(self._value)
 
+    def get_size(self, value=None):
+        """Return the size in bytes of this type.
+
+        Returns:
+            int: Size in bytes.
+
+        """
+        return self._size
+
+    def pack_into(self, buffer, offset=0, value=None):
+        """Write the integer into *buffer* with :func:`struct.pack_into`."""
+        if isinstance(value, type(self)):
+            return value.pack_into(buffer, offset)
+        try:
+            struct.pack_into(self._fmt, buffer, offset,
+                             self._codec_pack(value))
+        except (struct.error, TypeError):
+            # Raise the same error as pack
+            return super().pack_into(buffer, offset, value)
+        return offset + self._size
+
+    def _codec_format(self):
+        """Return the integer format if it is a single struct item."""
+        fmt = self._fmt[1:]
+        return fmt if len(fmt) == 1 else None
+
+    def _codec_pack(self, value):
+        """Return the integer to be packed, as :meth:`pack` does."""
+        if value is None:
+            return self.value
+        if isinstance(value, int):
+            return value
+        # Enums, bitmasks and other pyof types: get only the 'int' value
+        return getattr(value, 'value', value)
+
+    def _codec_unpack(self, item):
+        """Return a new instance holding the unpacked integer."""
+        if self.enum_ref:
+            item = _to_enum(self.enum_ref, item)
+        clone = self._clone()
+        clone._value = item
+        return clone
+
+    def _intern_key(self):
+        """Return the type, enum and value as the interning key."""
+        value = self._value
+        if isinstance(value, GenericBitMask):
+            # The bitmask class is already in the key, as the enum_ref
+            value = value.bitmask
+        return (type(self), self.enum_ref, value)
+
+
+class _FixedRun:
+    """Consecutive fixed-size struct attributes packed as a single struct."""
+
+    is_header = False
+
+    def __init__(self, fields):
+        """Precompile the struct format of ``fields``.
+
+        Args:
+            fields (list): (name, class attribute, format) tuples.
+        """
+        self.fields = tuple(fields)
+        self.names = tuple(name for name, *_ in fields)
+        self.struct = struct.Struct('!' + ''.join(fmt for *_, fmt in fields))
+        self.size = self.struct.size
+        #: Padding formats ('<n>x') have no struct item
+        self.items = tuple((name, obj) for name, obj, fmt in fields
+                           if not fmt.endswith('x'))
+        self.pads = tuple((name, obj) for name, obj, fmt in fields
+                          if fmt.endswith('x'))
+
+    def pack(self, instance):
+        """Pack all attributes of the run with a single struct call."""
+        try:
+            return self.struct.pack(*[obj._codec_pack(getattr(instance, name))
+                                      for name, obj in self.items])
+        except (struct.error, PackException, TypeError, ValueError,
+                AttributeError):
+            # Pack attribute by attribute to report which one is wrong
+            return b''.join(_pack_attribute(instance, name, obj)
+                            for name, obj, _ in self.fields)
+
+    def pack_into(self, instance, buffer, offset):
+        """Write all attributes of the run with a single struct call."""
+        try:
+            self.struct.pack_into(
+                buffer, offset,
+                *[obj._codec_pack(getattr(instance, name))
+                  for name, obj in self.items])
+        except (struct.error, PackException, TypeError, ValueError,
+                AttributeError):
+            for name, obj, _ in self.fields:
+                offset = _pack_attribute_into(instance, name, obj, buffer,
+                                              offset)
+            return offset
+        return offset + self.size
+
+    def unpack(self, instance, buff, begin):
+        """Unpack all attributes of the run with a single struct call."""
+        try:
+            items = self.struct.unpack_from(buff, begin)
+            for (name, obj), item in zip(self.items, items):
+                setattr(instance, name, obj._codec_unpack(item))
+        except (struct.error, TypeError, ValueError):
+            # Unpack attribute by attribute to report which one is wrong
+            size = 0
+            for name, obj, _ in self.fields:
+                size += instance._unpack_attribute(name, obj, buff,
+                                                   begin + size)
+            return size
+        for name, obj in self.pads:
+            setattr(instance, name, obj._clone())
+        return self.size
+
+
+class _Attribute:
+    """Struct attribute with variable size, handled by its own methods."""
+
+    def __init__(self, name, obj):
+        self.name = name
+        self.names = (name,)
+        self.obj = obj
+        self.is_header = type(obj).__name__ == 'Header'
+
+    def pack(self, instance):
+        """Pack the attribute using the class attribute's pack method."""
+        return _pack_attribute(instance, self.name, self.obj)
+
+    def pack_into(self, instance, buffer, offset):
+        """Write the attribute with the class attribute's pack_into."""
+        return _pack_attribute_into(instance, self.name, self.obj, buffer,
+                                    offset)
+
+    def unpack(self, instance, buff, begin):
+        """Unpack the attribute and return its size."""
+        # pylint: disable=protected-access
+        return instance._unpack_attribute(self.name, self.obj, buff, begin)
+
+
+def _pack_attribute(instance, name, obj):
+    """Pack one attribute of a struct instance, naming it on errors."""
+    try:
+        return obj.pack(getattr(instance, name))
+    except PackException as pack_exception:
+        cls = type(instance).__name__
+        msg = f'{cls}.{name} - {pack_exception}'
+        raise PackException(msg)
+
+
+def _pack_attribute_into(instance, name, obj, buffer, offset):
+    """Write one attribute of a struct instance, naming it on errors."""
+    try:
+        return obj.pack_into(buffer, offset, getattr(instance, name))
+    except PackException as pack_exception:
+        cls = type(instance).__name__
+        msg = f'{cls}.{name} - {pack_exception}'
+        raise PackException(msg)
+
+
+def _write_packed(packed, buffer, offset):
+    """Copy packed bytes into *buffer* and return the offset after them."""
+    end = offset + len(packed)
+    if end > len(buffer):
+        msg = 'Buffer of {} bytes is too small to pack {} bytes at {}'
+        raise PackException(msg.format(len(buffer), len(packed), offset))
+    buffer[offset:end] = packed
+    return end
+
+
+class _StructCodec:
+    """Pack and unpack the attributes of a struct class.
+
+    It is compiled once per class by :class:`MetaStruct`. Runs of consecutive
+    attributes with a fixed-size binary representation (see
+    :meth:`GenericType._codec_format`) are merged into a single precompiled
+    :class:`struct.Struct`. Any other attribute is packed and unpacked by its
+    own methods.
+    """
+
+    def __init__(self, layout):
+        """Split the class attributes into segments.
+
+        Args:
+            layout (tuple): (name, class attribute, size) tuples, in order.
+                See :meth:`MetaStruct._get_layout`.
+        """
+        self.segments = []
+        #: Attributes without a fixed size, used by get_size
+        self.variable = tuple((name, obj) for name, obj, size in layout
+                              if size is None)
+        self.fixed_size = sum(size for *_, size in layout if size is not None)
+        run = []
+        for name, obj, size in layout:
+            if size is not None:
+                run.append((name, obj, obj._codec_format()))
+                continue
+            if run:
+                self.segments.append(_FixedRun(run))
+                run = []
+            self.segments.append(_Attribute(name, obj))
+        if run:
+            self.segments.append(_FixedRun(run))
+
+    def pack(self, instance, skip_header=False):
+        """Return the binary representation of all attributes.
+
+        Args:
+            instance (GenericStruct): Object whose attributes are packed.
+            skip_header (bool): Whether to leave the header attribute out.
+
+        Returns:
+            bytes: The packed attributes.
+
+        """
+        return b''.join([segment.pack(instance) for segment in self.segments
+                         if not (skip_header and segment.is_header)])
+
+    def pack_into(self, instance, buffer, offset, skip_header=False):
+        """Write all attributes into *buffer*, like :meth:`pack`.
+
+        Returns:
+            int: Offset right after the last written attribute.
+
+        """
+        for segment in self.segments:
+            if not (skip_header and segment.is_header):
+                offset = segment.pack_into(instance, buffer, offset)
+        return offset
+
+    def get_size(self, instance):
+        """Return the sum of the attributes' sizes."""
+        return self.fixed_size + sum(obj.get_size(getattr(instance, name))
+                                     for name, obj in self.variable)
+
+    def unpack(self, instance, buff, offset=0, skip_header=False):
+        """Unpack all attributes from ``buff`` into ``instance``.
+
+        Args:
+            instance (GenericStruct): Object that receives the attributes.
+            buff (bytes): Binary data to be unpacked.
+            offset (int): Where to begin unpacking.
+            skip_header (bool): Whether to leave the header attribute out.
+
+        Returns:
+            int: Offset right after the last unpacked attribute.
+
+        """
+        begin = offset
+        for segment in self.segments:
+            if skip_header and segment.is_header:
+                continue
+            begin += segment.unpack(instance, buff, begin)
+        return begin
+
+
+def _is_pyof_attribute(obj):
+    """Return whether ``obj`` is a pyof attribute (type or struct)."""
+    return isinstance(obj, GenericType) or isinstance(type(obj), MetaStruct)
+
+
+#: Types whose instances are shared instead of copied by ``_clone``
+_IMMUTABLE_TYPES = (int, float, str, bytes, Enum, type, type(None))
+
+
+def _clone_value(value):
+    """Return a copy of an attribute value, avoiding :func:`deepcopy`."""
+    if _is_pyof_attribute(value):
+        return value._clone()  # pylint: disable=protected-access
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    return deepcopy(value)
+
 
 class MetaStruct(type):
     """MetaClass that dynamically handles openflow version of class attributes.
@@ -350,7 +784,33 @@ class MetaStruct(type):
             inherited_attributes.update(classdict)
             classdict = inherited_attributes
 
-        return super().__new__(cls, name, bases, classdict, **kwargs)
+        new_class = super().__new__(cls, name, bases, classdict, **kwargs)
+        #: Compute the attributes layout and the codec used by pack and
+        #: unpack once per class
+        new_class._layout = MetaStruct._get_layout(classdict)
+        new_class._codec = _StructCodec(new_class._layout)
+        return new_class
+
+    @staticmethod
+    def _get_layout(classdict):
+        """Return the ordered layout of the pyof attributes in ``classdict``.
+
+        Args:
+            classdict (dict): The class namespace, in definition order.
+
+        Returns:
+            tuple: (name, class attribute, size) tuples. The size is None
+                when the attribute does not have a fixed size.
+
+        """
+        layout = []
+        for name, obj in classdict.items():
+            if not _is_pyof_attribute(obj):
+                continue
+            fmt = obj._codec_format() if isinstance(obj, GenericType) else None
+            size = None if fmt is None else struct.calcsize('!' + fmt)
+            layout.append((name, obj, size))
+        return tuple(layout)
 
     @staticmethod
     def _header_message_type_update(obj, attr):
@@ -495,12 +955,28 @@ class GenericStruct(metaclass=MetaStruct):
     .. note:: A struct on this library's context is like a struct in C. It
               has a list of attributes and theses attributes can be structs,
               too.
+
+    The attributes layout is computed once per class by :class:`MetaStruct`
+    and stored in the ``_layout`` class attribute, an ordered tuple of
+    (name, class attribute, size) tuples. The size is None for attributes
+    that do not have a fixed size.
     """
 
     def __init__(self):
-        """Store attributes' deep copies."""
-        for name, value in self.get_class_attributes():
-            setattr(self, name, deepcopy(value))
+        """Store copies of the class attributes."""
+        for name, value, _ in self._layout:
+            setattr(self, name, value._clone())
+
+    def _clone(self):
+        """Return a copy of this struct without :func:`copy.deepcopy`.
+
+        Struct and type attributes are copied with their own ``_clone``,
+        immutable values are shared and anything else is deep copied.
+        """
+        clone = object.__new__(type(self))
+        clone.__dict__.update((name, _clone_value(value))
+                              for name, value in self.__dict__.items())
+        return clone
 
     def __eq__(self, other):
         """Check whether two structures have the same structure and values.
@@ -580,17 +1056,17 @@ class GenericStruct(metaclass=MetaStruct):
                 print("attribute name: {}".format(name))
                 print("attribute type: {}".format(value))
 
+        The attributes are read from the layout that :class:`MetaStruct`
+        computes once, when the class is created.
+
         Returns:
             generator: tuples with attribute name and value.
 
         """
         #: see this method docstring for a important notice about the use of
-        #: cls.__dict__
-        for name, value in cls.__dict__.items():
-            # gets only our (pyof) attributes. this ignores methods, dunder
-            # methods and attributes, and common python type attributes.
-            if GenericStruct._is_pyof_attribute(value):
-                yield (name, value)
+        #: cls.__dict__ by MetaStruct
+        for name, value, _ in cls._layout:
+            yield (name, value)
 
     def _get_instance_attributes(self):
         """Return a generator for instance attributes' name and value.
@@ -605,9 +1081,10 @@ class GenericStruct(metaclass=MetaStruct):
             generator: tuples with attribute name and value.
 
         """
-        for name, value in self.__dict__.items():
-            if name in map((lambda x: x[0]), self.get_class_attributes()):
-                yield (name, value)
+        instance_dict = self.__dict__
+        for name, _, _ in self._layout:
+            if name in instance_dict:
+                yield (name, instance_dict[name])
 
     def _get_attributes(self):
         """Return a generator for instance and class attribute.
@@ -622,9 +1099,8 @@ class GenericStruct(metaclass=MetaStruct):
             generator: Tuples with instance attribute and class attribute
 
         """
-        return map((lambda i, c: (i[1], c[1])),
-                   self._get_instance_attributes(),
-                   self.get_class_attributes())
+        for name, cls_value, _ in self._layout:
+            yield (getattr(self, name), cls_value)
 
     def _get_named_attributes(self):
         """Return generator for attribute's name, instance and class values.
@@ -636,14 +1112,11 @@ class GenericStruct(metaclass=MetaStruct):
             generator: Tuple with attribute's name, instance and class values.
 
         """
-        for cls, instance in zip(self.get_class_attributes(),
-                                 self._get_instance_attributes()):
-            attr_name, cls_value = cls
-            instance_value = instance[1]
-            yield attr_name, instance_value, cls_value
+        for attr_name, cls_value, _ in self._layout:
+            yield attr_name, getattr(self, attr_name), cls_value
 
     def _unpack_attribute(self, name, obj, buff, begin):
-        attribute = deepcopy(obj)
+        attribute = obj._clone()
         setattr(self, name, attribute)
         if not buff:
             size = 0
@@ -675,8 +1148,7 @@ class GenericStruct(metaclass=MetaStruct):
 
         """
         if value is None:
-            return sum(cls_val.get_size(obj_val) for obj_val, cls_val in
-                       self._get_attributes())
+            return self._codec.get_size(self)
         if isinstance(value, type(self)):
             return value.get_size()
         msg = "{} is not an instance of {}".format(value, type(self).__name__)
@@ -687,7 +1159,9 @@ class GenericStruct(metaclass=MetaStruct):
 
         Iterate over the class attributes, according to the
         order of definition, and then convert each attribute to its byte
-        representation using its own ``pack`` method.
+        representation using its own ``pack`` method. Consecutive attributes
+        with a fixed size are converted at once by the codec that
+        :class:`MetaStruct` compiles for the class.
 
         Returns:
             bytes: Binary representation of the struct object.
@@ -701,22 +1175,50 @@ class GenericStruct(metaclass=MetaStruct):
                 error_msg = "Error on validation prior to pack() on class "
                 error_msg += "{}.".format(type(self).__name__)
                 raise ValidationError(error_msg)
-            message = b''
-            # pylint: disable=no-member
-            for attr_info in self._get_named_attributes():
-                name, instance_value, class_value = attr_info
-                try:
-                    message += class_value.pack(instance_value)
-                except PackException as pack_exception:
-                    cls = type(self).__name__
-                    msg = f'{cls}.{name} - {pack_exception}'
-                    raise PackException(msg)
-            return message
+            return self._codec.pack(self)
         if isinstance(value, type(self)):
             return value.pack()
         msg = "{} is not an instance of {}".format(value, type(self).__name__)
         raise PackException(msg)
 
+    def pack_into(self, buffer, offset=0, value=None):
+        """Pack the struct into a writable buffer, such as a bytearray.
+
+        Like :meth:`pack`, but the attributes are written into *buffer*,
+        which must be large enough (see :meth:`get_size`). Fixed-size
+        attributes are written with :func:`struct.pack_into`, without
+        creating intermediate bytes objects. Structs that override
+        :meth:`pack` are packed with it and then copied into *buffer*.
+
+        Args:
+            buffer (bytearray): Writable buffer, e.g. a :class:`bytearray`,
+                :class:`mmap.mmap` or :class:`memoryview`.
+            offset (int): Where to begin writing.
+            value: In structs, the user can assign other value instead of a
+                class' instance.
+
+        Returns:
+            int: Offset right after the written data.
+
+        Raises:
+            :exc:`~.exceptions.PackException`: If an attribute can't be
+                packed or the buffer is too small.
+            :exc:`~.exceptions.ValidationError`: If validation fails.
+
+        """
+        if value is None:
+            if type(self).pack is not GenericStruct.pack:
+                return _write_packed(self.pack(), buffer, offset)
+            if not self.is_valid():
+                error_msg = "Error on validation prior to pack() on class "
+                error_msg += "{}.".format(type(self).__name__)
+                raise ValidationError(error_msg)
+            return self._codec.pack_into(self, buffer, offset)
+        if isinstance(value, type(self)):
+            return value.pack_into(buffer, offset)
+        msg = "{} is not an instance of {}".format(value, type(self).__name__)
+        raise PackException(msg)
+
     def unpack(self, buff, offset=0):
         """Unpack a binary struct into this object's attributes.
 
@@ -727,10 +1229,7 @@ class GenericStruct(metaclass=MetaStruct):
             buff (bytes): Binary data package to be unpacked.
             offset (int): Where to begin unpacking.
         """
-        begin = offset
-        for name, value in self.get_class_attributes():
-            size = self._unpack_attribute(name, value, buff, begin)
-            begin += size
+        self._codec.unpack(self, buff, offset)
 
     def is_valid(self):
         """Check whether all struct attributes in are valid.
@@ -750,6 +1249,139 @@ class GenericStruct(metaclass=MetaStruct):
         return self._validate_attributes_type()
 
 
+class TypeDispatchedStruct(GenericStruct):
+    """Base class of struct families whose class depends on a type field.
+
+    Actions, instructions, meter bands and table properties, for instance,
+    begin with a type and a length (two ``UBInt16``, read with the
+    ``_tlv_header`` struct) and each type is decoded by its own class. A
+    direct subclass of :class:`TypeDispatchedStruct` is the root of a family
+    and its subclasses list the types they decode in ``_allowed_types``.
+    They are registered in the family table when they are defined; the first
+    class that declares a type is used for it. Types without a class are
+    decoded by the family root.
+
+    .. code-block:: python3
+
+        class Instruction(TypeDispatchedStruct):
+            instruction_type = UBInt16(enum_ref=InstructionType)
+            length = UBInt16()
+
+        class InstructionMeter(Instruction):
+            meter_id = UBInt32()
+            _allowed_types = (InstructionType.OFPIT_METER,)
+    """
+
+    #: Types decoded by this class
+    _allowed_types = ()
+    #: Type and length at the beginning of each struct of the family
+    _tlv_header = struct.Struct('!HH')
+    #: Root class of the family, set when it is defined
+    _tlv_root = None
+    #: Class of each type of the family, created with the root class
+    _classes_by_type = None
+
+    def __init_subclass__(cls, **kwargs):
+        """Register the class of the types it declares in its family."""
+        super().__init_subclass__(**kwargs)
+        if TypeDispatchedStruct in cls.__bases__:
+            cls._tlv_root = cls
+            cls._classes_by_type = {}
+        for tlv_type in cls.__dict__.get('_allowed_types', ()):
+            cls._classes_by_type.setdefault(int(tlv_type), cls)
+
+    @classmethod
+    def class_of_type(cls, tlv_type):
+        """Return the class that decodes a type of this family.
+
+        Args:
+            tlv_type (int): Type value or enum member.
+
+        Returns:
+            type: The class registered for the type, or the family root if
+                there is none.
+
+        """
+        return cls._classes_by_type.get(int(tlv_type), cls._tlv_root)
+
+    @classmethod
+    def _peek_tlv(cls, buff, offset):
+        """Return the registered class (or None) and length at ``offset``.
+
+        Raises:
+            :exc:`~.exceptions.UnpackException`: If the header is incomplete
+                or the length is smaller than the header.
+
+        """
+        header = cls._tlv_header
+        try:
+            tlv_type, length = header.unpack_from(buff, offset)
+        except struct.error as exception:
+            raise UnpackException(exception)
+        if length < header.size:
+            raise UnpackException('{}: invalid length {}'.format(
+                cls._tlv_root.__name__, length))
+        return cls._classes_by_type.get(tlv_type), length
+
+    @classmethod
+    def iter_unpack(cls, buff, offset=0):
+        """Yield the structs of this family packed one after the other.
+
+        Each struct is created with the class of its type and decoded once,
+        from *offset* to the end of *buff*.
+
+        Args:
+            buff (bytes): Binary data of the structs.
+            offset (int): Where to begin unpacking.
+
+        Yields:
+            TypeDispatchedStruct: Each struct, in order.
+
+        Raises:
+            :exc:`~.exceptions.UnpackException`: If a struct can't be
+                unpacked.
+
+        """
+        view = memoryview(buff)
+        root = cls._tlv_root
+        limit_buff = len(view)
+        while offset < limit_buff:
+            tlv_class, length = cls._peek_tlv(view, offset)
+            tlv = object.__new__(tlv_class or root)
+            if type(tlv).unpack is TypeDispatchedStruct.unpack:
+                # The class is known already
+                GenericStruct.unpack(tlv, view[:offset+length], offset)
+            else:
+                tlv.unpack(view[:offset+length], offset)
+            yield tlv
+            offset += length
+
+    def unpack(self, buff, offset=0):
+        """Unpack a binary struct into this object's attributes.
+
+        The class of this object becomes the one registered for the type in
+        *buff*, if any, and only the bytes within the length are decoded, by
+        the ``unpack`` method of that class if it overrides this one.
+
+        Args:
+            buff (bytes): Binary data package to be unpacked.
+            offset (int): Where to begin unpacking.
+
+        Raises:
+            :exc:`~.exceptions.UnpackException`: If unpack fails.
+
+        """
+        tlv_class, length = self._peek_tlv(buff, offset)
+        view = memoryview(buff)[:offset+length]
+        if tlv_class is not None and tlv_class is not type(self):
+            self.__class__ = tlv_class
+            if tlv_class.unpack is not TypeDispatchedStruct.unpack:
+                # Overrides usually end up here again, with the new class
+                self.unpack(view, offset)
+                return
+        GenericStruct.unpack(self, view, offset)
+
+
 class GenericMessage(GenericStruct):
     """Base class that is the foundation for all OpenFlow messages.
 
@@ -805,10 +1437,9 @@ class GenericMessage(GenericStruct):
         format.
 
         Since that this is usually used before sending the message to a switch,
-        here we also call :meth:`update_header_length`.
-
-        .. seealso:: This method call its parent's :meth:`GenericStruct.pack`
-            after :meth:`update_header_length`.
+        here we also update the header length. The message body is packed
+        first and the length is taken from it, so the attributes are not
+        traversed once more by :meth:`get_size`.
 
         Returns:
             bytes: A binary data thats represents the Message.
@@ -818,13 +1449,44 @@ class GenericMessage(GenericStruct):
 
         """
         if value is None:
-            self.update_header_length()
-            return super().pack()
+            if not self.is_valid():
+                error_msg = "Error on validation prior to pack() on class "
+                error_msg += "{}.".format(type(self).__name__)
+                raise ValidationError(error_msg)
+            body = self._codec.pack(self, skip_header=True)
+            header = self.header
+            header.length = header.get_size() + len(body)
+            return header.pack() + body
         if isinstance(value, type(self)):
             return value.pack()
         msg = "{} is not an instance of {}".format(value, type(self).__name__)
         raise PackException(msg)
 
+    def pack_into(self, buffer, offset=0, value=None):
+        """Pack the message into a writable buffer, such as a bytearray.
+
+        The body is written after the room left for the header, and then the
+        header is written with the updated length. See
+        :meth:`GenericStruct.pack_into`.
+
+        Returns:
+            int: Offset right after the written message.
+
+        """
+        if value is None and type(self).pack is GenericMessage.pack:
+            if not self.is_valid():
+                error_msg = "Error on validation prior to pack() on class "
+                error_msg += "{}.".format(type(self).__name__)
+                raise ValidationError(error_msg)
+            header = self.header
+            end = self._codec.pack_into(self, buffer,
+                                        offset + header.get_size(),
+                                        skip_header=True)
+            header.length = end - offset
+            header.pack_into(buffer, offset)
+            return end
+        return super().pack_into(buffer, offset, value)
+
     def unpack(self, buff, offset=0):
         """Unpack a binary message into this object's attributes.
 
@@ -837,11 +1499,74 @@ class GenericMessage(GenericStruct):
                 header.
             offset (int): Where to begin unpacking.
         """
-        begin = offset
-        for name, value in self.get_class_attributes():
-            if type(value).__name__ != "Header":
-                size = self._unpack_attribute(name, value, buff, begin)
-                begin += size
+        self._codec.unpack(self, buff, offset, skip_header=True)
+
+    def unpack_lazy(self, buff, offset=0):
+        """Unpack a binary message, decoding each attribute on first access.
+
+        Like :meth:`unpack`, *buff* is the binary data of the message
+        **without the header**. Instead of decoding all the attributes now,
+        only the buffer and the current offset are recorded. Each attribute
+        is decoded the first time it is read or assigned, together with any
+        attribute before it whose size is needed to find its offset. Messages
+        that override :meth:`unpack` are decoded all at once, on the first
+        access to any attribute.
+
+        While no attribute is accessed, :meth:`pack` returns the packed header
+        followed by the original bytes. The header itself is not lazy.
+
+        The class of this object is replaced by a subclass with the same name
+        that holds the lazy attributes, so ``isinstance`` checks still work.
+        A copy of *buff* is kept unless it is ``bytes`` or a
+        :class:`memoryview` over ``bytes``, because a mutable receive buffer
+        may be reused before the attributes are decoded.
+
+        Args:
+            buff (bytes): Binary data package to be unpacked, without the
+                header.
+            offset (int): Where to begin unpacking.
+
+        Raises:
+            :exc:`~.exceptions.UnpackException`: When an attribute is first
+                accessed, if it can't be unpacked.
+
+        """
+        cls = getattr(type(self), '_lazy_base', type(self))
+        lazy_class = _get_lazy_class(cls)
+        if not isinstance(buff, bytes) and not (
+                isinstance(buff, memoryview) and isinstance(buff.obj, bytes)):
+            buff, offset = bytes(buff[offset:]), 0
+        instance_dict = self.__dict__
+        instance_dict['_lazy_state'] = _LazyState(buff, offset)
+        for name in lazy_class._lazy_names:
+            instance_dict.pop(name, None)
+        self.__class__ = lazy_class
+
+    def unpack_interned(self, buff, offset=0):
+        """Unpack a binary message, sharing equal scalar values.
+
+        Like :meth:`unpack`, *buff* is the binary data of the message
+        **without the header**. Afterwards, each scalar attribute of the
+        message, of its header and of its nested structs and lists is replaced
+        by a shared instance with the same type, enum and value (see
+        :meth:`GenericType._intern_key`). Keeping many decoded messages in
+        memory then costs far fewer objects.
+
+        Shared values are frozen, not copied on write: changing one in
+        place (e.g. with its ``unpack`` method) raises :exc:`AttributeError`,
+        because it can't be detached from the other structs that share it.
+        Assigning a new value to a struct attribute (``message.header.xid =
+        1``) replaces the shared one only in that struct, and copies of the
+        message (:func:`copy.deepcopy`) hold ordinary values again.
+
+        Args:
+            buff (bytes): Binary data package to be unpacked, without the
+                header.
+            offset (int): Where to begin unpacking.
+
+        """
+        self.unpack(buff, offset)
+        _intern_attributes(self)
 
     def update_header_length(self):
         """Update the header length attribute based on current message size.
@@ -852,43 +1577,316 @@ class GenericMessage(GenericStruct):
         self.header.length = self.get_size()
 
 
+class _LazyState:
+    """Buffer and progress of a lazily unpacked message."""
+
+    __slots__ = ('buff', 'begin', 'offset', 'decoded', 'decoding', 'touched')
+
+    def __init__(self, buff, offset):
+        self.buff = buff
+        #: Where the message body begins, to repack it untouched
+        self.begin = offset
+        #: Where the next segment to be decoded begins
+        self.offset = offset
+        #: Number of segments already decoded
+        self.decoded = 0
+        #: Whether segments are being decoded right now
+        self.decoding = False
+        #: Whether any lazy attribute was read or assigned by the user
+        self.touched = False
+
+
+class _LazyAttribute:
+    """Data descriptor that decodes a message attribute on first access."""
+
+    def __init__(self, name, obj, index):
+        self.name = name
+        self.obj = obj
+        #: Index of the segment that decodes this attribute
+        self.index = index
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.obj
+        instance_dict = instance.__dict__
+        state = instance_dict['_lazy_state']
+        if not state.decoding:
+            if self.name not in instance_dict:
+                instance._lazy_decode(self.index)
+            state.touched = True
+        try:
+            return instance_dict[self.name]
+        except KeyError:
+            # Not set by the unpack methods (yet), as if just initialized
+            value = instance_dict[self.name] = self.obj._clone()
+            return value
+
+    def __set__(self, instance, value):
+        state = instance.__dict__['_lazy_state']
+        if not state.decoding:
+            # Decode it first, so decoding can't overwrite the new value
+            instance._lazy_decode(self.index)
+            state.touched = True
+        instance.__dict__[self.name] = value
+
+
+class _MethodUnpacker:
+    """Segment that runs the whole unpack method of a message class."""
+
+    is_header = False
+
+    def __init__(self, cls):
+        self.unpack_method = cls.unpack
+        self.names = tuple(name for name, obj, _ in cls._layout
+                           if type(obj).__name__ != 'Header')
+
+    def unpack(self, instance, buff, begin):
+        """Unpack all attributes with the class' own unpack method."""
+        self.unpack_method(instance, buff, begin)
+        return len(buff) - begin
+
+
+class _LazyMessage:
+    """Methods of the lazy classes created by :func:`_get_lazy_class`.
+
+    The class attributes ``_lazy_base`` (the original message class),
+    ``_lazy_segments`` and ``_lazy_names`` are set on each lazy class.
+    """
+
+    def _lazy_decode(self, index):
+        """Decode all segments until the one at ``index``, in order."""
+        state = self.__dict__['_lazy_state']
+        segments = self._lazy_segments
+        state.decoding = True
+        try:
+            while state.decoded <= index:
+                segment = segments[state.decoded]
+                if not segment.is_header:
+                    state.offset += segment.unpack(self, state.buff,
+                                                   state.offset)
+                state.decoded += 1
+        finally:
+            state.decoding = False
+
+    def _lazy_decode_all(self):
+        """Decode all the attributes that are still pending."""
+        self._lazy_decode(len(self._lazy_segments) - 1)
+
+    def _get_instance_attributes(self):
+        self._lazy_decode_all()
+        return super()._get_instance_attributes()
+
+    def _clone(self):
+        """Return a fully decoded copy of this message."""
+        self._lazy_decode_all()
+        clone = object.__new__(self._lazy_base)
+        clone.__dict__.update((name, _clone_value(value))
+                              for name, value in self.__dict__.items()
+                              if name != '_lazy_state')
+        return clone
+
+    def __deepcopy__(self, memo):
+        return self._clone()
+
+    def get_size(self, value=None):
+        """Return the message size, without decoding it if untouched."""
+        state = self.__dict__['_lazy_state']
+        if value is None and not state.touched:
+            return self.header.get_size() + len(state.buff) - state.begin
+        self._lazy_decode_all()
+        return super().get_size(value)
+
+    def pack(self, value=None):
+        """Pack the message, reusing the original bytes if untouched."""
+        state = self.__dict__['_lazy_state']
+        if value is None and not state.touched:
+            self.update_header_length()
+            return self.header.pack() + bytes(state.buff[state.begin:])
+        self._lazy_decode_all()
+        return super().pack(value)
+
+
+#: Lazy class of each message class, created on demand
+_LAZY_CLASSES = {}
+
+
+def _get_lazy_class(cls):
+    """Return the subclass of ``cls`` used by :meth:`~.unpack_lazy`.
+
+    Each attribute but the header is replaced by a :class:`_LazyAttribute`.
+    Messages that override :meth:`GenericMessage.unpack` have a single
+    segment that runs their own method.
+    """
+    try:
+        return _LAZY_CLASSES[cls]
+    except KeyError:
+        pass
+    if cls.unpack is GenericMessage.unpack:
+        segments = tuple(cls._codec.segments)
+    else:
+        segments = (_MethodUnpacker(cls),)
+    prototypes = {name: obj for name, obj, _ in cls._layout}
+    namespace = {'__module__': cls.__module__,
+                 '__qualname__': cls.__qualname__,
+                 '__doc__': cls.__doc__,
+                 '_lazy_base': cls,
+                 '_lazy_segments': segments,
+                 '_lazy_names': ()}
+    for index, segment in enumerate(segments):
+        if segment.is_header:
+            continue
+        for name in segment.names:
+            namespace[name] = _LazyAttribute(name, prototypes[name], index)
+            namespace['_lazy_names'] += (name,)
+    # Bypass MetaStruct.__new__: the layout and codec are inherited from cls
+    lazy_class = type.__new__(MetaStruct, cls.__name__, (_LazyMessage, cls),
+                              namespace)
+    _LAZY_CLASSES[cls] = lazy_class
+    return lazy_class
+
+
+#: Shared scalar values by interning key, kept while any struct uses them
+_INTERNED = weakref.WeakValueDictionary()
+
+#: Read-only class of each interned type, created on demand
+_INTERNED_CLASSES = {}
+
+
+def _copy_state(source, target, slots):
+    """Copy the ``slots`` and ``__dict__`` of a scalar value to another one."""
+    for name in slots:
+        try:
+            object.__setattr__(target, name, getattr(source, name))
+        except AttributeError:
+            pass
+    if hasattr(source, '__dict__'):
+        object.__setattr__(target, '__dict__', source.__dict__.copy())
+
+
+def _thaw(value, memo=None):  # pylint: disable=unused-argument
+    """Return a mutable copy of a shared value, of its original type."""
+    interned_class = type(value)
+    clone = object.__new__(interned_class._interned_base)
+    _copy_state(value, clone, interned_class._interned_slots)
+    return clone
+
+
+def _read_only(value, name, _attribute):
+    """Refuse to change a shared value in place."""
+    msg = ("{} value is shared by unpacked messages and can't be changed; "
+           "assign a new value to the struct attribute instead")
+    raise AttributeError(msg.format(type(value).__name__))
+
+
+def _get_interned_class(cls):
+    """Return the read-only subclass of ``cls`` used for shared values."""
+    try:
+        return _INTERNED_CLASSES[cls]
+    except KeyError:
+        pass
+    slots = []
+    for klass in cls.__mro__:
+        names = klass.__dict__.get('__slots__', ())
+        if isinstance(names, str):
+            names = (names,)
+        slots.extend(name for name in names
+                     if name not in ('__dict__', '__weakref__'))
+    # Shared values are only weakly referenced by the pool
+    weakref_slots = () if cls.__weakrefoffset__ else ('__weakref__',)
+    namespace = {'__module__': cls.__module__,
+                 '__qualname__': cls.__qualname__,
+                 '__doc__': cls.__doc__,
+                 '__slots__': weakref_slots,
+                 '__setattr__': _read_only,
+                 '_interned_base': cls,
+                 '_interned_slots': tuple(slots),
+                 '_clone': _thaw,
+                 '__deepcopy__': _thaw}
+    interned_class = type(cls.__name__, (cls,), namespace)
+    _INTERNED_CLASSES[cls] = interned_class
+    return interned_class
+
+
+def _intern(value):
+    """Return the shared instance equal to the scalar ``value``."""
+    key = value._intern_key()  # pylint: disable=protected-access
+    if key is None:
+        return value
+    try:
+        return _INTERNED[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable key, e.g. a value of an unexpected type
+        return value
+    # Render cached values (e.g. address texts) while they can be stored
+    value.value  # pylint: disable=pointless-statement
+    interned_class = _get_interned_class(type(value))
+    shared = object.__new__(interned_class)
+    _copy_state(value, shared, interned_class._interned_slots)
+    _INTERNED[key] = shared
+    return shared
+
+
+def _intern_attributes(obj):
+    """Replace the scalar values inside a struct or list by shared ones."""
+    if isinstance(obj, list):
+        for index, item in enumerate(obj):
+            if isinstance(item, GenericType):
+                obj[index] = _intern(item)
+            elif isinstance(type(item), MetaStruct):
+                _intern_attributes(item)
+    attributes = obj.__dict__
+    for name, value in attributes.items():
+        if isinstance(value, GenericType):
+            attributes[name] = _intern(value)
+        elif isinstance(type(value), MetaStruct):
+            _intern_attributes(value)
+
+
 class MetaBitMask(type):
     """MetaClass to create a special BitMaskEnum type.
 
     You probably do not need to use this class. Inherit from
     :class:`GenericBitMask` instead.
 
-    This metaclass converts the declared class attributes into elements of an
-    enum. It also replaces the :meth:`__dir__` and :meth:`__getattr__` methods,
-    so the resulting class will behave as an :class:`~Enum` class (you can
-    access object.ELEMENT and recover either values or names).
+    This metaclass collects the declared class attributes as elements of an
+    enum, in the ``_enum`` ordered dict, so the resulting class will behave
+    as an :class:`~Enum` class (you can access object.ELEMENT and recover
+    either values or names). Elements of the base classes are inherited.
     """
 
     def __new__(cls, name, bases, classdict):
-        """Convert class attributes into enum elements."""
-        _enum = OrderedDict([(key, value) for key, value in classdict.items()
-                             if key[0] != '_' and not
-                             hasattr(value, '__call__') and not
-                             isinstance(value, property)])
-        if _enum:
-            classdict = {key: value for key, value in classdict.items()
-                         if key[0] == '_' or hasattr(value, '__call__') or
-                         isinstance(value, property)}
-            classdict['_enum'] = _enum
+        """Collect class attributes as enum elements."""
+        _enum = OrderedDict()
+        for base in reversed(bases):
+            _enum.update(getattr(base, '_enum', {}))
+        _enum.update((key, value) for key, value in classdict.items()
+                     if key[0] != '_' and not
+                     hasattr(value, '__call__') and not
+                     isinstance(value, property))
+        classdict['_enum'] = _enum
         return type.__new__(cls, name, bases, classdict)
 
-    def __getattr__(cls, name):
-        return cls._enum[name]
 
-    def __dir__(cls):
-        res = dir(type(cls)) + list(cls.__dict__.keys())
-        if cls is not GenericBitMask:
-            res.extend(cls._enum)
-        return res
+@lru_cache(maxsize=4096)
+def _bitmask_names(cls, bitmask):
+    """Return the names of the ``cls`` elements selected by ``bitmask``.
+
+    Bitmasks take few distinct values (e.g. port states), so the result is
+    computed once for each of them and kept in a bounded LRU cache.
+    """
+    return tuple(key for key, value in cls._enum.items() if value & bitmask)
 
 
 class GenericBitMask(metaclass=MetaBitMask):
-    """Base class for enums that use bitmask values."""
+    """Base class for enums that use bitmask values.
+
+    Besides :attr:`names`, element names can be tested with ``in`` and
+    iterated over. The ``|``, ``&``, ``^`` and ``-`` operators work like set
+    operations and return a new bitmask of the same class. Their other
+    operand is a bitmask, an integer or an element name.
+    """
 
     def __init__(self, bitmask=None):
         """Create a GenericBitMask with the optional parameter below.
@@ -897,7 +1895,6 @@ class GenericBitMask(metaclass=MetaBitMask):
             bitmask: Bitmask value.
         """
         self.bitmask = bitmask
-        self._enum = {}
 
     def __str__(self):
         return "{}".format(self.bitmask)
@@ -905,6 +1902,58 @@ class GenericBitMask(metaclass=MetaBitMask):
     def __repr__(self):
         return "{}({})".format(type(self).__name__, self.bitmask)
 
+    def __eq__(self, other):
+        if isinstance(other, GenericBitMask):
+            return (type(self) is type(other) and
+                    self.bitmask == other.bitmask)
+        return self.bitmask == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.bitmask)
+
+    def __bool__(self):
+        """Return whether any element is selected."""
+        return bool(self.bitmask)
+
+    def __contains__(self, element):
+        """Return whether an element, by name or value, is selected.
+
+        A bitmask operand is contained if all its elements are selected.
+        """
+        bits = self._bits(element)
+        return bool(bits) and bits & (self.bitmask or 0) == bits
+
+    def __iter__(self):
+        """Yield the names of the selected elements."""
+        return iter(_bitmask_names(type(self), self.bitmask or 0))
+
+    def _bits(self, other):
+        """Return the integer value of a set operation operand."""
+        if isinstance(other, GenericBitMask):
+            return other.bitmask or 0
+        if isinstance(other, str):
+            return self._enum[other]
+        return other
+
+    def __or__(self, other):
+        return type(self)((self.bitmask or 0) | self._bits(other))
+
+    def __and__(self, other):
+        return type(self)((self.bitmask or 0) & self._bits(other))
+
+    def __xor__(self, other):
+        return type(self)((self.bitmask or 0) ^ self._bits(other))
+
+    def __sub__(self, other):
+        return type(self)((self.bitmask or 0) & ~self._bits(other))
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
     @property
     def names(self):
         """List of selected enum names.
@@ -913,11 +1962,7 @@ class GenericBitMask(metaclass=MetaBitMask):
             list: Enum names.
 
         """
-        result = []
-        for key, value in self.iteritems():
-            if value & self.bitmask:
-                result.append(key)
-        return result
+        return list(_bitmask_names(type(self), self.bitmask or 0))
 
     def iteritems(self):
         """Create a generator for attributes' name-value pairs.
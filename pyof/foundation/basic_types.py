@@ -1,12 +1,15 @@
 """Basic types used in structures and messages."""
 
 # System imports
+import socket
 import struct
 from copy import deepcopy
+from functools import lru_cache
 
 # Local source tree imports
 from pyof.foundation import exceptions
-from pyof.foundation.base import GenericStruct, GenericType, UBIntBase
+from pyof.foundation.base import (
+    GenericStruct, GenericType, TypeDispatchedStruct, UBIntBase)
 
 __all__ = ('BinaryData', 'Char', 'ConstantTypeList', 'FixedTypeList',
            'IPAddress', 'DPID', 'HWAddress', 'Pad', 'UBInt8', 'UBInt16',
@@ -16,6 +19,8 @@ __all__ = ('BinaryData', 'Char', 'ConstantTypeList', 'FixedTypeList',
 class Pad(GenericType):
     """Class for padding attributes."""
 
+    __slots__ = ('_length',)
+
     _fmt = ''
 
     def __init__(self, length=0):
@@ -72,6 +77,20 @@ class Pad(GenericType):
         """
         return b'\x00' * self._length
 
+    def _codec_format(self):
+        """Return the padding format for a compiled struct codec."""
+        return '{}x'.format(self._length)
+
+    def _clone(self):
+        """Return a copy of this padding."""
+        clone = super()._clone()
+        clone._length = self._length
+        return clone
+
+    def _intern_key(self):
+        """Return the padding length as the interning key."""
+        return (type(self), self._length)
+
     def __deepcopy__(self, memo):
         """Improve deepcopy speed."""
         return Pad(length=self._length)
@@ -83,7 +102,10 @@ class UBInt8(UBIntBase):
     Class for an 8-bit (1-byte) Unsigned Integer.
     """
 
+    __slots__ = ()
+
     _fmt = "!B"
+    _size = 1
 
 
 class UBInt16(UBIntBase):
@@ -92,7 +114,10 @@ class UBInt16(UBIntBase):
     Class for an 16-bit (2-byte) Unsigned Integer.
     """
 
+    __slots__ = ()
+
     _fmt = "!H"
+    _size = 2
 
 
 class UBInt32(UBIntBase):
@@ -101,7 +126,10 @@ class UBInt32(UBIntBase):
     Class for an 32-bit (4-byte) Unsigned Integer.
     """
 
+    __slots__ = ()
+
     _fmt = "!I"
+    _size = 4
 
 
 class UBInt64(UBIntBase):
@@ -110,7 +138,10 @@ class UBInt64(UBIntBase):
     Class for an 64-bit (8-byte) Unsigned Integer.
     """
 
+    __slots__ = ()
+
     _fmt = "!Q"
+    _size = 8
 
 
 class UBInt128(UBIntBase):
@@ -119,12 +150,17 @@ class UBInt128(UBIntBase):
     Class for an 128-bit (16-byte) Unsigned Integer.
     """
 
+    __slots__ = ()
+
     _fmt = "!8H"
+    _size = 16
 
 
 class DPID(GenericType):
     """DataPath ID. Identifies a switch."""
 
+    __slots__ = ()
+
     _fmt = "!8B"
 
     def __init__(self, dpid=None):
@@ -186,6 +222,18 @@ class DPID(GenericType):
             begin += 1
         self._value = ':'.join(hexas)
 
+    def _codec_format(self):
+        """Return the DPID format for a compiled struct codec."""
+        return '8s'
+
+    def _codec_unpack(self, item):
+        """Return a new DPID from the unpacked bytes."""
+        return DPID(dpid=':'.join('%.2x' % number for number in item))
+
+    def _intern_key(self):
+        """Return the DPID text as the interning key."""
+        return (type(self), self._value)
+
     def __deepcopy__(self, memo):
         """Improve deepcopy speed."""
         return DPID(dpid=self._value)
@@ -194,6 +242,8 @@ class DPID(GenericType):
 class Char(GenericType):
     """Build a double char type according to the length."""
 
+    __slots__ = ('length', '_fmt')
+
     def __init__(self, value=None, length=0):
         """Create a Char with the optional parameters below.
 
@@ -256,9 +306,76 @@ class Char(GenericType):
         """Improve deepcopy speed."""
         return Char(value=self._value, length=self.length)
 
+    def _clone(self):
+        """Return a copy of this Char."""
+        clone = super()._clone()
+        clone.length = self.length
+        clone._fmt = self._fmt
+        return clone
+
+    def _intern_key(self):
+        """Return the length and text as the interning key."""
+        return (type(self), self.length, self._value)
+
+
+#: Maximum number of address texts whose parsed form is cached
+ADDRESS_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _parse_ipv4(text):
+    """Parse an IPv4 address text, such as '192.168.0.1/24'.
+
+    Returns:
+        tuple: The address text without the prefix, its 4 bytes (None if it
+            is invalid) and the prefix length (None if there is none).
+
+    """
+    address, _, prefix = text.partition('/')
+    octets = address.split('.')
+    try:
+        packed = bytes([int(octet) for octet in octets])
+    except ValueError:
+        packed = None
+    if packed is not None and len(packed) != 4:
+        packed = None
+    return address, packed, int(prefix) if prefix else None
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _parse_ipv6(text):
+    """Parse an IPv6 address text, such as 'fe80::1/64'.
+
+    Returns:
+        tuple: The address text without the prefix and with '::' expanded,
+            its 16 bytes (None if it is invalid) and the prefix length (None
+            if there is none).
+
+    """
+    address, _, prefix = text.partition('/')
+    try:
+        packed = socket.inet_pton(socket.AF_INET6, address)
+    except (OSError, ValueError):
+        packed = None
+    if address == '::':
+        address = '0:0:0:0:0:0:0:0'
+    elif '::' in address:
+        temp = address.split(':')
+        index = temp.index('')
+        temp = [x for x in temp if x != '']
+        address = temp[:index] + ['0'] * (8 - len(temp)) + temp[index:]
+        address = ':'.join(address)
+    return address, packed, int(prefix) if prefix else None
+
 
 class IPAddress(GenericType):
-    """Defines a IP address."""
+    """Defines a IP address.
+
+    The address is stored packed, as 4 bytes, and its prefix length as
+    :attr:`netmask`. The dotted text, the :attr:`value`, is rendered only
+    when it is needed. Parsed address texts are kept in a bounded LRU cache
+    of :data:`ADDRESS_CACHE_SIZE` entries.
+    """
 
     netmask = UBInt32()
     max_prefix = UBInt32(32)
@@ -269,14 +386,37 @@ class IPAddress(GenericType):
         Args:
             address (str): IP Address using ipv4. Defaults to '0.0.0.0/32'
         """
-        if '/' in address:
-            address, netmask = address.split('/')
+        if address is None:
+            self._packed = prefix = None
         else:
-            netmask = 32 if netmask is None else netmask
+            address, self._packed, prefix = _parse_ipv4(address)
+        if prefix is not None:
+            netmask = prefix
+        elif netmask is None:
+            netmask = 32
 
         super().__init__(address)
         self.netmask = int(netmask)
 
+    @property
+    def value(self):
+        """Return the address as dotted text, without the prefix length.
+
+        The value is None if the address is None.
+        """
+        if self._value is None and self._packed is not None:
+            self._value = '%d.%d.%d.%d' % tuple(self._packed)
+        return self._value
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, repr(self.value))
+
+    def __str__(self):
+        return str(self.value)
+
+    def __ne__(self, other):
+        return not self == other
+
     def pack(self, value=None):
         """Pack the value as a binary representation.
 
@@ -289,26 +429,27 @@ class IPAddress(GenericType):
             bytes: The binary representation.
 
         Raises:
-            struct.error: If the value does not fit the binary format.
+            :exc:`~.exceptions.PackException`: If the value is not a valid
+                address.
 
         """
         if isinstance(value, type(self)):
             return value.pack()
 
         if value is None:
+            packed = self._packed
             value = self._value
+        elif isinstance(value, str):
+            packed = _parse_ipv4(value)[1]
+        else:
+            packed = None
 
-        if value.find('/') >= 0:
-            value = value.split('/')[0]
-
-        try:
-            value = value.split('.')
-            return struct.pack('!4B', *[int(x) for x in value])
-        except struct.error as err:
+        if packed is None:
             msg = "IPAddress error. "
-            msg += "Class: {}, struct error: {} ".format(type(value).__name__,
-                                                         err)
+            msg += "Class: {}, invalid address: {!r}".format(
+                type(value).__name__, value)
             raise exceptions.PackException(msg)
+        return packed
 
     def unpack(self, buff, offset=0):
         """Unpack a binary message into this object's attributes.
@@ -324,12 +465,12 @@ class IPAddress(GenericType):
             Exception: If there is a struct unpacking error.
 
         """
-        try:
-            unpacked_data = struct.unpack('!4B', buff[offset:offset+4])
-            self._value = '.'.join([str(x) for x in unpacked_data])
-        except struct.error as exception:
-            raise exceptions.UnpackException('%s; %s: %s' % (exception,
-                                                             offset, buff))
+        packed = bytes(buff[offset:offset+4])
+        if len(packed) != 4:
+            raise exceptions.UnpackException(
+                'IPAddress needs 4 bytes; %s: %s' % (offset, bytes(buff)))
+        self._packed = packed
+        self._value = None
 
     def get_size(self, value=None):
         """Return the ip address size in bytes.
@@ -345,13 +486,33 @@ class IPAddress(GenericType):
         """
         return 4
 
+    def _codec_format(self):
+        """Return the address format for a compiled struct codec."""
+        return '4s'
+
+    def _codec_unpack(self, item):
+        """Return a copy of this address with the unpacked bytes."""
+        clone = self._clone()
+        clone._packed = item
+        clone._value = None
+        return clone
+
+    def _intern_key(self):
+        """Return the packed address and prefix as the interning key."""
+        return (type(self), self._packed, self.netmask)
+
     def __deepcopy__(self, memo):
         """Improve deepcopy speed."""
-        return IPAddress(address=self._value, netmask=self.netmask)
+        return self._clone()
 
 
 class IPv6Address(GenericType):
-    """Defines a IPv6 address."""
+    """Defines a IPv6 address.
+
+    The address is stored packed, as 16 bytes, and its prefix length as
+    :attr:`netmask`. Like in :class:`IPAddress`, the text is rendered only
+    when needed and parsed texts are cached.
+    """
 
     netmask = UBInt128()
 
@@ -363,23 +524,38 @@ class IPv6Address(GenericType):
             address (str): IP Address using IPv6.
             Defaults to '0000:0000:0000:0000:0000:0000:0000:0000/128'
         """
-        if '/' in address:
-            address, netmask = address.split('/')
+        if address is None:
+            self._packed = prefix = None
         else:
-            netmask = 128 if netmask is None else netmask
-
-        if address == '::':
-            address = '0:0:0:0:0:0:0:0'
-        elif '::' in address:
-            temp = address.split(':')
-            index = temp.index('')
-            temp = [x for x in temp if x != '']
-            address = temp[:index] + ['0'] * (8 - len(temp)) + temp[index:]
-            address = ':'.join(address)
+            address, self._packed, prefix = _parse_ipv6(address)
+        if prefix is not None:
+            netmask = prefix
+        elif netmask is None:
+            netmask = 128
 
         super().__init__(address)
         self.netmask = int(netmask)
 
+    @property
+    def value(self):
+        """Return the address as text, without the prefix length.
+
+        The value is None if the address is None.
+        """
+        if self._value is None and self._packed is not None:
+            self._value = '%04x:%04x:%04x:%04x:%04x:%04x:%04x:%04x' % (
+                struct.unpack('!8H', self._packed))
+        return self._value
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, repr(self.value))
+
+    def __str__(self):
+        return str(self.value)
+
+    def __ne__(self, other):
+        return not self == other
+
     def pack(self, value=None):
         """Pack the value as a binary representation.
 
@@ -392,26 +568,27 @@ class IPv6Address(GenericType):
             bytes: The binary representation.
 
         Raises:
-            struct.error: If the value does not fit the binary format.
+            :exc:`~.exceptions.PackException`: If the value is not a valid
+                address.
 
         """
         if isinstance(value, type(self)):
             return value.pack()
 
         if value is None:
+            packed = self._packed
             value = self._value
+        elif isinstance(value, str):
+            packed = _parse_ipv6(value)[1]
+        else:
+            packed = None
 
-        if value.find('/') >= 0:
-            value = value.split('/')[0]
-
-        try:
-            value = value.split(':')
-            return struct.pack('!8H', *[int(x, 16) for x in value])
-        except struct.error as err:
+        if packed is None:
             msg = "IPv6Address error. "
-            msg += "Class: {}, struct error: {} ".format(type(value).__name__,
-                                                         err)
+            msg += "Class: {}, invalid address: {!r}".format(
+                type(value).__name__, value)
             raise exceptions.PackException(msg)
+        return packed
 
     def unpack(self, buff, offset=0):
         """Unpack a binary message into this object's attributes.
@@ -427,17 +604,12 @@ class IPv6Address(GenericType):
             Exception: If there is a struct unpacking error.
 
         """
-        def _int2hex(number):
-            return "{0:0{1}x}".format(number, 4)
-
-        try:
-            unpacked_data = struct.unpack('!8H', buff[offset:offset+16])
-        except struct.error as exception:
-            raise exceptions.UnpackException('%s; %s: %s' % (exception,
-                                                             offset, buff))
-
-        transformed_data = ':'.join([_int2hex(x) for x in unpacked_data])
-        self._value = transformed_data
+        packed = bytes(buff[offset:offset+16])
+        if len(packed) != 16:
+            raise exceptions.UnpackException(
+                'IPv6Address needs 16 bytes; %s: %s' % (offset, bytes(buff)))
+        self._packed = packed
+        self._value = None
 
     def get_size(self, value=None):
         """Return the IPv6 address size in bytes.
@@ -453,23 +625,122 @@ class IPv6Address(GenericType):
         """
         return 16
 
+    def _codec_format(self):
+        """Return the address format for a compiled struct codec."""
+        return '16s'
+
+    def _codec_unpack(self, item):
+        """Return a copy of this address with the unpacked bytes."""
+        clone = self._clone()
+        clone._packed = item
+        clone._value = None
+        return clone
+
+    def _intern_key(self):
+        """Return the packed address and prefix as the interning key."""
+        return (type(self), self._packed, self.netmask)
+
     def __deepcopy__(self, memo):
         """Improve deepcopy speed."""
-        return IPv6Address(address=self._value, netmask=self.netmask)
+        return self._clone()
+
+
+def _pack_hw_address(address):
+    """Return the 6 bytes of a hardware address, or None if it is invalid.
+
+    Args:
+        address (str, bytes, int, HWAddress): Colon-separated hexadecimal
+            text, 6 bytes, a 48-bit integer or another HWAddress.
+    """
+    if isinstance(address, str):
+        octets = address.split(':')
+        if len(octets) != 6:
+            return None
+        try:
+            return bytes([int(octet, 16) for octet in octets])
+        except ValueError:
+            return None
+    if isinstance(address, HWAddress):
+        return address._packed  # pylint: disable=protected-access
+    if isinstance(address, (bytes, bytearray, memoryview)):
+        return bytes(address) if len(address) == 6 else None
+    if isinstance(address, int) and 0 <= address < 1 << 48:
+        return address.to_bytes(6, 'big')
+    return None
 
 
 class HWAddress(GenericType):
-    """Defines a hardware address."""
+    """Defines a hardware address.
+
+    The address is stored as 6 bytes. Its colon-separated text, the
+    :attr:`value`, is rendered only when it is needed and then cached.
+    Addresses are compared by their bytes and hashed by their canonical text
+    (lowercase, two digits per octet), so they can be used as dictionary
+    keys. Text is equal to an address only in that canonical form.
+    """
+
+    __slots__ = ('_packed',)
 
-    # pylint: disable=useless-super-delegation
     def __init__(self, hw_address='00:00:00:00:00:00'):
         """Create a HWAddress with the parameters below.
 
         Args:
-            hw_address (bytes): Hardware address. Defaults to
-                '00:00:00:00:00:00'.
+            hw_address (str, bytes, int): Hardware address, as
+                colon-separated hexadecimal text, 6 bytes or a 48-bit
+                integer. Defaults to '00:00:00:00:00:00'.
         """
-        super().__init__(hw_address)
+        super().__init__()
+        self._packed = _pack_hw_address(hw_address)
+        if self._packed is None or isinstance(hw_address, str):
+            # Keep the text as given (or the invalid value, to report it)
+            self._value = hw_address
+
+    @property
+    def value(self):
+        """Return the address as colon-separated hexadecimal text.
+
+        The value is None if the address is None.
+        """
+        if self._value is None and self._packed is not None:
+            self._value = '%.2x:%.2x:%.2x:%.2x:%.2x:%.2x' % tuple(self._packed)
+        return self._value
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, repr(self.value))
+
+    def __str__(self):
+        return str(self.value)
+
+    def __eq__(self, other):
+        if self._packed is None:
+            return self.value == getattr(other, 'value', other)
+        if isinstance(other, HWAddress):
+            if other._packed is None:
+                return self.value == other.value
+            return self._packed == other._packed
+        return self._canonical_value() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        if self._packed is None:
+            return hash(self._value)
+        return hash(self._canonical_value())
+
+    def _canonical_value(self):
+        """Return the lowercase text of the address, e.g. for hashing."""
+        if self._value is None:
+            return self.value
+        return '%.2x:%.2x:%.2x:%.2x:%.2x:%.2x' % tuple(self._packed)
+
+    def _clone(self):
+        """Return a copy of this address, sharing its bytes and text."""
+        clone = object.__new__(type(self))
+        clone._value = self._value
+        clone.enum_ref = self.enum_ref
+        clone._packed = self._packed
+        return clone
 
     def pack(self, value=None):
         """Pack the value as a binary representation.
@@ -481,27 +752,25 @@ class HWAddress(GenericType):
             bytes: The binary representation.
 
         Raises:
-            struct.error: If the value does not fit the binary format.
+            :exc:`~.exceptions.PackException`: If the value is not a valid
+                hardware address.
 
         """
         if isinstance(value, type(self)):
             return value.pack()
 
         if value is None:
+            packed = self._packed
             value = self._value
+        else:
+            packed = _pack_hw_address(value)
 
-        if value == 0:
-            value = '00:00:00:00:00:00'
-
-        value = value.split(':')
-
-        try:
-            return struct.pack('!6B', *[int(x, 16) for x in value])
-        except struct.error as err:
+        if packed is None:
             msg = "HWAddress error. "
-            msg += "Class: {}, struct error: {} ".format(type(value).__name__,
-                                                         err)
+            msg += "Class: {}, invalid address: {!r}".format(
+                type(value).__name__, value)
             raise exceptions.PackException(msg)
+        return packed
 
     def unpack(self, buff, offset=0):
         """Unpack a binary message into this object's attributes.
@@ -517,17 +786,12 @@ class HWAddress(GenericType):
             Exception: If there is a struct unpacking error.
 
         """
-        def _int2hex(number):
-            return "{0:0{1}x}".format(number, 2)
-
-        try:
-            unpacked_data = struct.unpack('!6B', buff[offset:offset+6])
-        except struct.error as exception:
-            raise exceptions.UnpackException('%s; %s: %s' % (exception,
-                                                             offset, buff))
-
-        transformed_data = ':'.join([_int2hex(x) for x in unpacked_data])
-        self._value = transformed_data
+        packed = bytes(buff[offset:offset+6])
+        if len(packed) != 6:
+            raise exceptions.UnpackException(
+                'HWAddress needs 6 bytes; %s: %s' % (offset, bytes(buff)))
+        self._packed = packed
+        self._value = None
 
     def get_size(self, value=None):
         """Return the address size in bytes.
@@ -545,11 +809,26 @@ class HWAddress(GenericType):
 
     def is_broadcast(self):
         """Return true if the value is a broadcast address. False otherwise."""
-        return self.value == 'ff:ff:ff:ff:ff:ff'
+        return self._packed == b'\xff\xff\xff\xff\xff\xff'
+
+    def _codec_format(self):
+        """Return the address format for a compiled struct codec."""
+        return '6s'
+
+    def _codec_unpack(self, item):
+        """Return a new HWAddress from the unpacked bytes."""
+        clone = self._clone()
+        clone._packed = item
+        clone._value = None
+        return clone
+
+    def _intern_key(self):
+        """Return the address bytes as the interning key."""
+        return (type(self), self._packed)
 
     def __deepcopy__(self, memo):
         """Improve deepcopy speed."""
-        return HWAddress(hw_address=self._value)
+        return self._clone()
 
 
 class BinaryData(GenericType):
@@ -588,6 +867,8 @@ class BinaryData(GenericType):
             return value.pack()
         if isinstance(value, bytes):
             return value
+        if isinstance(value, (bytearray, memoryview)):
+            return bytes(value)
         if value is None:
             return b''
         raise ValueError(f"BinaryData can't be {type(value)} = '{value}'")
@@ -598,11 +879,20 @@ class BinaryData(GenericType):
         Unpack the binary value *buff* and update this object attributes based
         on the results. Since the *buff* is binary data, no conversion is done.
 
+        When *buff* is a :class:`memoryview` over a mutable buffer (e.g. a
+        ``bytearray`` used to receive data), the value is kept as a view into
+        that buffer instead of a copy. Views over ``bytes`` are materialized,
+        so unpacking ``bytes`` still results in a ``bytes`` value.
+
         Args:
-            buff (bytes): Binary data package to be unpacked.
+            buff (bytes, bytearray, memoryview): Binary data package to be
+                unpacked.
             offset (int): Where to begin unpacking.
         """
-        self._value = buff[offset:]
+        value = buff[offset:]
+        if isinstance(value, memoryview) and isinstance(value.obj, bytes):
+            value = value.tobytes()
+        self._value = value
 
     def get_size(self, value=None):
         """Return the size in bytes.
@@ -621,6 +911,8 @@ class BinaryData(GenericType):
 
         if hasattr(value, 'get_size'):
             return value.get_size()
+        if isinstance(value, memoryview):
+            return value.nbytes
 
         return len(self.pack(value))
 
@@ -675,11 +967,38 @@ class TypeList(list, GenericStruct):
             container.extend(value)
             value = container
 
-        bin_message = b''
+        try:
+            return b''.join([item.pack() for item in value])
+        except exceptions.PackException as err:
+            msg = "{} pack error: {}".format(type(self).__name__, err)
+            raise exceptions.PackException(msg)
+
+    def pack_into(self, buffer, offset=0, value=None):
+        """Pack the items into a writable buffer, one after the other.
+
+        See :meth:`~pyof.foundation.base.GenericStruct.pack_into`.
+
+        Returns:
+            int: Offset right after the last written item.
+
+        """
+        if isinstance(value, type(self)):
+            return value.pack_into(buffer, offset)
+
+        if value is None:
+            if type(self).pack is not TypeList.pack:
+                # Packed by the overridden method
+                return super().pack_into(buffer, offset)
+            value = self
+        else:
+            container = type(self)(items=None)
+            container.extend(value)
+            value = container
+
         try:
             for item in value:
-                bin_message += item.pack()
-            return bin_message
+                offset = item.pack_into(buffer, offset)
+            return offset
         except exceptions.PackException as err:
             msg = "{} pack error: {}".format(type(self).__name__, err)
             raise exceptions.PackException(msg)
@@ -734,9 +1053,15 @@ class TypeList(list, GenericStruct):
         return "{}".format([str(item) for item in self])
 
     def __deepcopy__(self, memo):
-        """Improve deepcopy speed."""
-        items = [deepcopy(item) for item in self]
-        return TypeList(items=items)
+        """Improve deepcopy speed, keeping the list class and attributes."""
+        clone = list.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        list.extend(clone, (deepcopy(item, memo) for item in self))
+        return clone
+
+    def _clone(self):
+        """Return a copy of the list, as :meth:`__deepcopy__` does."""
+        return self.__deepcopy__({})
 
 
 class FixedTypeList(TypeList):
@@ -800,16 +1125,19 @@ class FixedTypeList(TypeList):
         To use this class with a pyof_class that accepts elements with
         different sizes, you must reimplement the unpack method.
 
+        Lists of :class:`~pyof.foundation.base.TypeDispatchedStruct` structs
+        create each item with the class of its type instead.
+
         Args:
             buff (bytes): The binary data to be unpacked.
             offset (int): If we need to shift the beginning of the data.
         """
-        super().unpack(buff, self._pyof_class, offset)
-
-    def __deepcopy__(self, memo):
-        """Improve deepcopy speed."""
-        items = [deepcopy(item) for item in self]
-        return FixedTypeList(pyof_class=self._pyof_class, items=items)
+        pyof_class = self._pyof_class
+        if issubclass(pyof_class, TypeDispatchedStruct):
+            for item in pyof_class.iter_unpack(buff, offset):
+                self.append(item)
+        else:
+            super().unpack(buff, pyof_class, offset)
 
 
 class ConstantTypeList(TypeList):
@@ -874,8 +1202,3 @@ class ConstantTypeList(TypeList):
         else:
             raise exceptions.WrongListItemType(item.__class__.__name__,
                                                self[0].__class__.__name__)
-
-    def __deepcopy__(self, memo):
-        """Improve deepcopy speed."""
-        items = [deepcopy(item) for item in self]
-        return ConstantTypeList(items=items)
@@ -0,0 +1,126 @@
+"""Message classes of an OpenFlow version, indexed by message type."""
+
+# System imports
+import struct
+
+# Local source tree imports
+from pyof.foundation.base import HeaderInfo
+from pyof.foundation.basic_types import UBInt8, UBInt16, UBInt32
+from pyof.foundation.exceptions import UnpackException
+
+__all__ = ('MessageTable',)
+
+
+class MessageTable:
+    """Find and unpack the messages of one OpenFlow version.
+
+    The message classes are kept in a tuple indexed by the integer message
+    type, so messages are dispatched without converting their type to the
+    ``Type`` enum of the version. Each version builds one table in its
+    ``common.utils`` module, which exports its :attr:`classes`,
+    :meth:`peek_header` and :meth:`unpack_message`.
+    """
+
+    #: Version, message type, length and xid
+    header_struct = struct.Struct('!BBHI')
+
+    def __init__(self, type_enum, message_types):
+        """Build the table of a version.
+
+        Args:
+            type_enum (type): ``Type`` enum of the version.
+            message_types (dict): Message class of each ``Type`` member, by
+                ``str(member)``, as in the ``MESSAGE_TYPES`` of the version.
+        """
+        self.type_enum = type_enum
+        #: Type member of each message type value
+        self.members = {member.value: member for member in type_enum}
+        #: Message class of each message type value (None if there is no
+        #: class), indexed by the integer message type
+        self.classes = tuple(
+            message_types.get(str(self.members[value]))
+            if value in self.members else None
+            for value in range(max(self.members) + 1))
+
+    def peek_header(self, buffer, offset=0):
+        """Read the header fields of a message without unpacking it.
+
+        Args:
+            buffer (bytes): Binary data with an OpenFlow message.
+            offset (int): Where the message begins.
+
+        Returns:
+            :class:`~pyof.foundation.base.HeaderInfo`: Version, message type
+                (member of the ``Type`` enum of the version), length and xid.
+
+        Raises:
+            UnpackException: If the buffer is too short or the message type
+                is unknown.
+
+        """
+        try:
+            version, message_type, length, xid = \
+                self.header_struct.unpack_from(buffer, offset)
+            return HeaderInfo(version, self.members[message_type], length,
+                              xid)
+        except struct.error as exception:
+            raise UnpackException(exception)
+        except KeyError:
+            raise UnpackException(f'Unknown message type {message_type}')
+
+    def unpack_message(self, buffer, lazy=False, intern=False, header=None):
+        """Unpack the whole buffer, including header pack.
+
+        Args:
+            buffer (bytes, bytearray, memoryview): Bytes representation of a
+                openflow message.
+            lazy (bool): Whether to decode the message attributes only when
+                they are first accessed. See
+                :meth:`~pyof.foundation.base.GenericMessage.unpack_lazy`.
+            intern (bool): Whether equal scalar values are shared with other
+                interned messages. See
+                :meth:`~pyof.foundation.base.GenericMessage.unpack_interned`.
+            header (HeaderInfo): Header already read with
+                :meth:`peek_header`, so it is not read again from *buffer*.
+
+        Returns:
+            object: Instance of openflow message.
+
+        Raises:
+            UnpackException: If the buffer is shorter than a header or the
+                message type is unknown.
+            ValueError: If both ``lazy`` and ``intern`` are requested.
+
+        """
+        if lazy and intern:
+            raise ValueError('lazy messages can not be interned')
+        if header is None:
+            if len(buffer) < self.header_struct.size:
+                raise UnpackException('Message shorter than its header')
+            message_type = buffer[1]
+        else:
+            message_type = header.message_type.value
+        classes = self.classes
+        message_class = None
+        if message_type < len(classes):
+            message_class = classes[message_type]
+        if message_class is None:
+            raise UnpackException(f'Unknown message type {message_type}')
+        message = message_class()
+        if header is None:
+            message.header.unpack(buffer)
+        else:
+            message_header = message.header
+            message_header.version = UBInt8(header.version)
+            message_header.message_type = UBInt8(
+                header.message_type, enum_ref=self.type_enum)
+            message_header.length = UBInt16(header.length)
+            message_header.xid = UBInt32(header.xid)
+        body = memoryview(buffer)[self.header_struct.size:]
+        if lazy:
+            message.unpack_lazy(body)
+        elif intern:
+            message.unpack_interned(body)
+        else:
+            message.unpack(body)
+        return message
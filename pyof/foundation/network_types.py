@@ -429,11 +429,11 @@ class GenericTLV(GenericStruct):
 
         """
         header = UBInt16()
-        header.unpack(buff[offset:offset+2])
+        header.unpack(buff, offset)
         self.tlv_type = header.value >> 9
         length = header.value & 511
         begin, end = offset + 2, offset + 2 + length
-        self._value = BinaryData(buff[begin:end])
+        self._value = BinaryData(bytes(buff[begin:end]))
 
     def get_size(self, value=None):
         """Return struct size.
@@ -760,14 +760,14 @@ class TLVWithSubType(GenericTLV):
 
         """
         header = UBInt16()
-        header.unpack(buff[offset:offset+2])
+        header.unpack(buff, offset)
         self.tlv_type = header.value >> 9
         length = header.value & 511
         begin, end = offset + 2, offset + 2 + length
         sub_type = UBInt8()
-        sub_type.unpack(buff[begin:begin+1])
+        sub_type.unpack(buff, begin)
         self.sub_type = sub_type.value
-        self.sub_value = BinaryData(buff[begin+1:end])
+        self.sub_value = BinaryData(bytes(buff[begin+1:end]))
 
 
 class LLDP(GenericStruct):
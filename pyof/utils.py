@@ -3,7 +3,13 @@
 This package was moved from kytos/of_core for the purpose of creating a generic
 method to perform package unpack independent of the OpenFlow version.
 """
+import struct
+from collections import namedtuple
+from functools import lru_cache
+from random import randint
+
 from pyof import v0x01, v0x04
+from pyof.foundation.constants import UBINT32_MAX_VALUE as MAXID
 from pyof.foundation.exceptions import UnpackException
 from pyof.v0x01.common import utils as u_v0x01  # pylint: disable=unused-import
 from pyof.v0x04.common import utils as u_v0x04  # pylint: disable=unused-import
@@ -11,6 +17,28 @@ from pyof.v0x04.common import utils as u_v0x04  # pylint: disable=unused-import
 PYOF_VERSION_LIBS = {0x01: v0x01,
                      0x04: v0x04}
 
+_HEADER_STRUCT = struct.Struct('!BBHI')
+
+#: Largest message length that fits in the header
+_MAX_MESSAGE_SIZE = 0xFFFF
+
+
+class RawMessage(namedtuple('RawMessage', ('header', 'body'))):
+    """Message left undecoded by a message type filter.
+
+    ``header`` is a :class:`~pyof.foundation.base.HeaderInfo` and ``body`` is
+    a :class:`memoryview` of the bytes after the header, in the buffer the
+    message was read from.
+    """
+
+    __slots__ = ()
+
+    def pack(self):
+        """Return the message bytes, header included."""
+        version, message_type, length, xid = self.header
+        return _HEADER_STRUCT.pack(version, message_type, length,
+                                   xid) + bytes(self.body)
+
 
 def validate_packet(packet):
     """Check if packet is valid OF packet.
@@ -19,7 +47,7 @@ def validate_packet(packet):
         UnpackException: If the packet is invalid.
 
     """
-    if not isinstance(packet, bytes):
+    if not isinstance(packet, (bytes, bytearray, memoryview)):
         raise UnpackException('invalid packet')
 
     packet_length = len(packet)
@@ -35,19 +63,65 @@ def validate_packet(packet):
         raise UnpackException('invalid packet')
 
 
-def unpack(packet):
+def peek_header(buffer, offset=0):
+    """Read the header fields of a message of any supported version.
+
+    No message or header object is created. See the ``peek_header`` function
+    of each version (e.g. :func:`pyof.v0x04.common.utils.peek_header`).
+
+    Args:
+        buffer (bytes): Binary data with an OpenFlow message.
+        offset (int): Where the message begins.
+
+    Returns:
+        :class:`~pyof.foundation.base.HeaderInfo`: Version, message type,
+            length and xid.
+
+    Raises:
+        UnpackException: If the buffer is too short or the version or the
+            message type are not supported.
+
+    """
+    try:
+        pyof_lib = PYOF_VERSION_LIBS[buffer[offset]]
+    except IndexError:
+        raise UnpackException('invalid packet')
+    except KeyError:
+        raise UnpackException('Version not supported')
+    return pyof_lib.common.utils.peek_header(buffer, offset)
+
+
+def unpack(packet, lazy=False, intern=False, types=None, exclude=None):
     """Unpack the OpenFlow Packet and returns a message.
 
     Args:
-        packet: buffer with the openflow packet.
+        packet: buffer with the openflow packet. Besides ``bytes``, a
+            ``bytearray`` or ``memoryview`` is accepted and unpacked without
+            copying the message body.
+        lazy (bool): Whether to decode the message attributes only when they
+            are first accessed, instead of unpacking the whole message now.
+            See :meth:`~pyof.foundation.base.GenericMessage.unpack_lazy`.
+        intern (bool): Whether to share equal scalar values among the
+            messages unpacked this way, to reduce the memory used by messages
+            that are kept for a long time. The shared values are frozen:
+            they can be replaced, but not changed in place. See
+            :meth:`~pyof.foundation.base.GenericMessage.unpack_interned`.
+        types (iterable): Message types to be decoded (allow list). See
+            :func:`iter_unpack`. Pass a tuple to cache the filter.
+        exclude (iterable): Message types not to be decoded (deny list).
 
     Returns:
-        GenericMessage: Message unpacked based on openflow packet.
+        GenericMessage: Message unpacked based on openflow packet, or a
+            :class:`RawMessage` if its type is filtered out by ``types`` or
+            ``exclude``.
 
     Raises:
         UnpackException: if the packet can't be unpacked.
+        ValueError: If both ``lazy`` and ``intern`` are requested.
 
     """
+    if lazy and intern:
+        raise ValueError('lazy messages can not be interned')
     validate_packet(packet)
 
     version = packet[0]
@@ -56,8 +130,400 @@ def unpack(packet):
     except KeyError:
         raise UnpackException('Version not supported')
 
+    decoded = _decoded_types(types, exclude)
+    if decoded is not None and packet[1] not in decoded[version]:
+        return _raw_message(pyof_lib, packet)
+
     try:
-        message = pyof_lib.common.utils.unpack_message(packet)
+        message = pyof_lib.common.utils.unpack_message(packet, lazy=lazy,
+                                                       intern=intern)
         return message
     except (UnpackException, ValueError) as exception:
         raise UnpackException(exception)
+
+
+def _selected_types(types):
+    """Return the integer message types selected by ``types``, by version.
+
+    Args:
+        types (iterable): ``Type`` members of a version, which select only
+            that version's type, and type names or integers, which select
+            the type of every version.
+
+    Returns:
+        dict: sets of integer message types by version.
+
+    """
+    selected = {version: set() for version in PYOF_VERSION_LIBS}
+    for message_type in types:
+        for version, pyof_lib in PYOF_VERSION_LIBS.items():
+            type_enum = pyof_lib.common.header.Type
+            if isinstance(message_type, type_enum):
+                selected[version].add(message_type.value)
+                break
+        else:
+            for version, pyof_lib in PYOF_VERSION_LIBS.items():
+                if isinstance(message_type, str):
+                    type_enum = pyof_lib.common.header.Type
+                    if message_type in type_enum.__members__:
+                        selected[version].add(
+                            type_enum[message_type].value)
+                else:
+                    selected[version].add(int(message_type))
+    return selected
+
+
+@lru_cache(maxsize=32)
+def _cached_decoded_types(types, exclude):
+    return _decoded_types(types, exclude, cache=False)
+
+
+def _decoded_types(types=None, exclude=None, cache=True):
+    """Return the message types to be decoded, by version.
+
+    Args:
+        types (iterable): Allow list of message types. See
+            :func:`_selected_types`.
+        exclude (iterable): Deny list of message types.
+        cache (bool): Whether to cache the result, if the lists are
+            hashable (e.g. tuples).
+
+    Returns:
+        dict: frozensets of integer message types by version, or None if
+            every message is decoded.
+
+    """
+    if types is None and exclude is None:
+        return None
+    if cache:
+        try:
+            return _cached_decoded_types(types, exclude)
+        except TypeError:
+            # Unhashable lists
+            pass
+    if types is None:
+        decoded = {version: {member.value
+                             for member in pyof_lib.common.header.Type}
+                   for version, pyof_lib in PYOF_VERSION_LIBS.items()}
+    else:
+        decoded = _selected_types(types)
+    if exclude is not None:
+        for version, message_types in _selected_types(exclude).items():
+            decoded[version] -= message_types
+    return {version: frozenset(message_types)
+            for version, message_types in decoded.items()}
+
+
+def _raw_message(pyof_lib, buffer, offset=0, header=None):
+    """Return the :class:`RawMessage` of the message at ``offset``."""
+    if header is None:
+        header = pyof_lib.common.utils.peek_header(buffer, offset)
+    body = memoryview(buffer)[offset + 8:offset + header.length]
+    return RawMessage(header, body)
+
+
+def iter_unpack(buffer, types=None, lazy=False, exclude=None, raw=False):
+    """Unpack concatenated OpenFlow messages, e.g. from a capture.
+
+    The messages are found by their header lengths over a single
+    :class:`memoryview` of *buffer*, without copying nor validating each of
+    them like :func:`unpack` does.
+
+    Args:
+        buffer (bytes): Concatenated messages of any supported version. A
+            ``bytearray`` or ``memoryview`` is accepted, too.
+        types (iterable): If given, only messages of these types are
+            decoded (allow list). ``Type`` members select a type of their
+            version only; type names (e.g. ``'OFPT_PACKET_IN'``) and integers
+            select it in every version.
+        lazy (bool): Whether messages are unpacked lazily. See
+            :meth:`~pyof.foundation.base.GenericMessage.unpack_lazy`.
+        exclude (iterable): Message types not to be decoded (deny list).
+        raw (bool): Whether to yield the messages that are not decoded as
+            :class:`RawMessage` records, whose body is a view of *buffer*,
+            instead of skipping them.
+
+    Yields:
+        GenericMessage: Each selected message, in order, or a
+            :class:`RawMessage` if ``raw`` is True.
+
+    Raises:
+        UnpackException: If a message is truncated, has an invalid length
+            or version, or can't be unpacked.
+
+    """
+    decoded = _decoded_types(types, exclude)
+    view = memoryview(buffer)
+    size = len(view)
+    offset = 0
+    while offset < size:
+        if size - offset < 8:
+            raise UnpackException(f'truncated header at offset {offset}')
+        version, message_type, length = MessageFramer._HEADER.unpack_from(
+            view, offset)
+        end = offset + length
+        if length < 8 or end > size:
+            raise UnpackException(
+                f'invalid message length {length} at offset {offset}')
+        try:
+            pyof_lib = PYOF_VERSION_LIBS[version]
+        except KeyError:
+            raise UnpackException('Version not supported')
+        if decoded is None or message_type in decoded[version]:
+            try:
+                yield pyof_lib.common.utils.unpack_message(view[offset:end],
+                                                           lazy=lazy)
+            except (UnpackException, ValueError) as exception:
+                raise UnpackException(exception)
+        elif raw:
+            yield _raw_message(pyof_lib, view, offset)
+        offset = end
+
+
+def unpack_all(buffer, types=None, lazy=False, exclude=None, raw=False):
+    """Return the list of messages unpacked by :func:`iter_unpack`."""
+    return list(iter_unpack(buffer, types, lazy, exclude, raw))
+
+
+class MessageFramer:
+    """Split an OpenFlow byte stream (e.g. a TCP connection) into messages.
+
+    Chunks of any size are appended to a growable buffer by :meth:`feed`. A
+    read cursor marks where the next message begins, so complete messages
+    are unpacked straight from a :class:`memoryview` of the buffer, without
+    copying them. Unpacked messages may keep views into the buffer (e.g.
+    their ``BinaryData``), so the consumed bytes are never discarded in
+    place: once per :meth:`feed` call, the unconsumed bytes are moved to a
+    new buffer.
+
+    .. code-block:: python3
+
+        framer = MessageFramer()
+        while True:
+            for message in framer.feed(sock.recv(65536)):
+                handle(message)
+
+    Both OpenFlow 1.0 (0x01) and 1.3 (0x04) messages are supported.
+    Messages whose type is filtered out by ``types`` or ``exclude`` are
+    yielded as :class:`RawMessage` records, without decoding their body.
+    """
+
+    _HEADER = struct.Struct('!BBH')
+
+    def __init__(self, lazy=False, types=None, exclude=None):
+        """Create an empty framer.
+
+        Args:
+            lazy (bool): Whether messages are unpacked lazily. See
+                :meth:`~pyof.foundation.base.GenericMessage.unpack_lazy`.
+            types (iterable): Message types to be decoded (allow list). See
+                :func:`iter_unpack`.
+            exclude (iterable): Message types not to be decoded (deny list).
+        """
+        self.lazy = lazy
+        self._decoded = _decoded_types(types, exclude)
+        self._buffer = bytearray()
+        self._cursor = 0
+
+    def __len__(self):
+        """Return the number of buffered bytes not yet framed."""
+        return len(self._buffer) - self._cursor
+
+    def __iter__(self):
+        """Yield the complete messages in the buffer."""
+        return self._messages()
+
+    def feed(self, data):
+        """Append a chunk of the stream.
+
+        Args:
+            data (bytes): Bytes received from the stream, of any size.
+
+        Returns:
+            iterator: Complete messages unpacked from the stream. Messages
+                that are not consumed remain buffered for the next call.
+
+        """
+        if self._cursor:
+            # Leave the consumed bytes to the messages that are views of them
+            self._buffer = self._buffer[self._cursor:]
+            self._cursor = 0
+        self._buffer += data
+        return self._messages()
+
+    def _messages(self):
+        """Yield messages while the buffer holds complete ones.
+
+        Raises:
+            UnpackException: If a message can't be unpacked. The message is
+                skipped, so the stream can still be read. If the header
+                length is invalid, the stream can't be framed anymore.
+
+        """
+        buffer = self._buffer
+        view = memoryview(buffer)
+        while len(buffer) - self._cursor >= 8:
+            start = self._cursor
+            version, message_type, length = self._HEADER.unpack_from(
+                buffer, start)
+            if length < 8:
+                raise UnpackException(f'invalid message length {length}')
+            end = start + length
+            if end > len(buffer):
+                return
+            self._cursor = end
+            try:
+                pyof_lib = PYOF_VERSION_LIBS[version]
+            except KeyError:
+                raise UnpackException('Version not supported')
+            utils = pyof_lib.common.utils
+            header = utils.peek_header(buffer, start)
+            decoded = self._decoded
+            if decoded is not None and message_type not in decoded[version]:
+                yield _raw_message(pyof_lib, view, start, header)
+                continue
+            try:
+                message = utils.unpack_message(view[start:end],
+                                               lazy=self.lazy, header=header)
+            except (UnpackException, ValueError) as exception:
+                raise UnpackException(exception)
+            yield message
+
+
+class MessageBatch:
+    """Pack many messages of one OpenFlow version into a single buffer.
+
+    Each added message gets the next xid of a counter and is packed right
+    away with ``pack_into``, after the previous one, so the whole batch can
+    be sent with one write. The buffer always has room for one more message
+    of the largest size and grows by doubling. :meth:`pack` returns the
+    packed messages and the offset of each message by xid, to find the
+    request of an error reply.
+
+    .. code-block:: python3
+
+        batch = MessageBatch()
+        for flow_mod in flow_mods:
+            batch.add(flow_mod)
+        buffer, offsets = batch.pack(barrier=True)
+        transport.write(buffer)
+
+    :meth:`add_new` creates each message with its xid, skipping the random
+    xid that :class:`~pyof.foundation.base.GenericMessage` would draw and
+    :meth:`add` would replace.
+    """
+
+    def __init__(self, version=None, first_xid=None):
+        """Create an empty batch.
+
+        Args:
+            version (int): OpenFlow version of the messages. Defaults to the
+                version of the first added message.
+            first_xid (int): xid of the first message. Defaults to a random
+                one.
+        """
+        self.version = version
+        if first_xid is None:
+            first_xid = randint(0, MAXID)
+        self._xid = first_xid
+        self._buffer = bytearray()
+        #: Size of the packed messages at the beginning of the buffer
+        self._end = 0
+        #: Whether the last message is a barrier added by :meth:`pack`
+        self._barrier = False
+        #: Offset of each message in the buffer, by xid
+        self.offsets = {}
+
+    def __len__(self):
+        """Return the number of messages in the batch."""
+        return len(self.offsets)
+
+    def add(self, message):
+        """Assign the next xid to a message and pack it into the batch.
+
+        Args:
+            message (GenericMessage): Message of the batch version.
+
+        Returns:
+            int: The message xid.
+
+        Raises:
+            ValueError: If the message has a different version.
+            PackException: If the message can't be packed.
+
+        """
+        self._check_version(message)
+        xid = self._xid & MAXID
+        message.header.xid = xid
+        self._pack(message, xid)
+        return xid
+
+    def add_new(self, message_class, **kwargs):
+        """Create a message with the next xid and pack it into the batch.
+
+        Args:
+            message_class (type): Message class of the batch version.
+            kwargs: Other keyword arguments of the message class.
+
+        Returns:
+            GenericMessage: The new message.
+
+        Raises:
+            ValueError: If the message has a different version.
+            PackException: If the message can't be packed.
+
+        """
+        xid = self._xid & MAXID
+        message = message_class(xid=xid, **kwargs)
+        self._check_version(message)
+        self._pack(message, xid)
+        return message
+
+    def _check_version(self, message):
+        version = int(message.header.version)
+        if self.version is None:
+            self.version = version
+        elif version != self.version:
+            msg = 'Message version {} in a batch of version {}'
+            raise ValueError(msg.format(version, self.version))
+
+    def _pack(self, message, xid):
+        """Pack a message with its xid already set after the others."""
+        offset = self._end
+        buffer = self._buffer
+        if len(buffer) - offset < _MAX_MESSAGE_SIZE:
+            # Room for any message, without computing its size first
+            buffer.extend(bytes(max(_MAX_MESSAGE_SIZE, len(buffer))))
+        self._end = message.pack_into(buffer, offset)
+        self.offsets[xid] = offset
+        self._xid += 1
+        self._barrier = False
+
+    def pack(self, barrier=False):
+        """Return the packed messages.
+
+        Args:
+            barrier (bool): Whether to append a ``BarrierRequest`` to the
+                batch first, unless the batch already ends with one added
+                this way.
+
+        Returns:
+            tuple: The packed messages (:class:`bytes`) and a copy of the
+                message offsets by xid (:class:`dict`).
+
+        Raises:
+            ValueError: If a barrier is requested but the version is unknown.
+
+        """
+        if barrier and not self._barrier:
+            try:
+                pyof_lib = PYOF_VERSION_LIBS[self.version]
+            except KeyError:
+                raise ValueError('Unknown batch version')
+            message_type = pyof_lib.common.header.Type.OFPT_BARRIER_REQUEST
+            self.add_new(pyof_lib.common.utils.MESSAGE_CLASSES[
+                message_type.value])
+            self._barrier = True
+        with memoryview(self._buffer) as view:
+            packed = bytes(view[:self._end])
+        return packed, dict(self.offsets)
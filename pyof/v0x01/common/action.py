@@ -3,7 +3,7 @@
 # System imports
 
 # Local source tree imports
-from pyof.foundation.base import GenericBitMask, GenericStruct
+from pyof.foundation.base import GenericBitMask, TypeDispatchedStruct
 from pyof.foundation.basic_types import (
     FixedTypeList, HWAddress, Pad, UBInt8, UBInt16, UBInt32)
 from pyof.foundation.constants import UBINT16_MAX_VALUE
@@ -52,7 +52,7 @@ class ActionType(GenericBitMask):
 # Classes
 
 
-class ActionHeader(GenericStruct):
+class ActionHeader(TypeDispatchedStruct):
     """Defines the Header that is common to all actions."""
 
     action_type = UBInt16(enum_ref=ActionType)
@@ -76,30 +76,6 @@ class ActionHeader(GenericStruct):
         self.action_type = action_type
         self.length = length
 
-    def unpack(self, buff, offset=0):
-        """Unpack a binary message into this object's attributes.
-
-        Unpack the binary value *buff* and update this object attributes based
-        on the results.
-
-        Args:
-            buff (bytes): Binary data package to be unpacked.
-            offset (int): Where to begin unpacking.
-
-        Raises:
-            Exception: If there is a struct unpacking error.
-
-        """
-        self.action_type = UBInt16(enum_ref=ActionType)
-        self.action_type.unpack(buff, offset)
-
-        for cls in ActionHeader.__subclasses__():
-            if self.action_type.value in cls.get_allowed_types():
-                self.__class__ = cls
-                break
-
-        super().unpack(buff, offset)
-
     @classmethod
     def get_allowed_types(cls):
         """Return allowed types for the class."""
@@ -63,8 +63,27 @@ class FlowWildCards(GenericBitMask):
 # Classes
 
 
+#: Fields of the match key with their wildcard bits. See Match.match_key.
+_KEY_FIELDS = (('in_port', FlowWildCards.OFPFW_IN_PORT),
+               ('dl_src', FlowWildCards.OFPFW_DL_SRC),
+               ('dl_dst', FlowWildCards.OFPFW_DL_DST),
+               ('dl_vlan', FlowWildCards.OFPFW_DL_VLAN),
+               ('dl_vlan_pcp', FlowWildCards.OFPFW_DL_VLAN_PCP),
+               ('dl_type', FlowWildCards.OFPFW_DL_TYPE),
+               ('nw_tos', FlowWildCards.OFPFW_NW_TOS),
+               ('nw_proto', FlowWildCards.OFPFW_NW_PROTO),
+               ('nw_src', FlowWildCards.OFPFW_NW_SRC_SHIFT),
+               ('nw_dst', FlowWildCards.OFPFW_NW_DST_SHIFT),
+               ('tp_src', FlowWildCards.OFPFW_TP_SRC),
+               ('tp_dst', FlowWildCards.OFPFW_TP_DST))
+
+
 class Match(GenericStruct):
-    """Describes a flow entry. Fields to match against flows."""
+    """Describes a flow entry. Fields to match against flows.
+
+    Matches are compared and hashed by their :meth:`match_key`, so they can
+    be used in sets and as dictionary keys.
+    """
 
     #: Wildcards fields.
     wildcards = UBInt32(value=FlowWildCards.OFPFW_ALL, enum_ref=FlowWildCards)
@@ -141,6 +160,52 @@ class Match(GenericStruct):
         super().__setattr__(name, value)
         self.fill_wildcards(name, value)
 
+    def match_key(self):
+        """Return a canonical, hashable key of this match.
+
+        Matches with the same key match the same packets: wildcarded fields
+        are None, the IP addresses are masked by their wildcard bit counts
+        and the padding is left out. The key is computed on each call, so it
+        reflects attributes changed in place too.
+
+        Returns:
+            tuple: The value of each field, or None if it is wildcarded.
+                IP addresses are (address, prefix length) tuples.
+
+        """
+        wildcards = self.wildcards
+        # The value of unpacked wildcards, or an int
+        wildcards = int(getattr(wildcards, 'value', wildcards))
+        key = []
+        for name, wildcard in _KEY_FIELDS:
+            value = getattr(self, name)
+            if name in ('nw_src', 'nw_dst'):
+                # wildcard is the shift of the 6-bit wildcarded bit count
+                bits = (wildcards >> wildcard) & 0x3f
+                if bits >= 32:
+                    value = None
+                else:
+                    mask = 0xffffffff ^ ((1 << bits) - 1)
+                    value = (int.from_bytes(value.pack(), 'big') & mask,
+                             32 - bits)
+            elif wildcards & wildcard:
+                value = None
+            elif isinstance(value, HWAddress):
+                value = value.pack()
+            else:
+                value = int(value)
+            key.append(value)
+        return tuple(key)
+
+    def __eq__(self, other):
+        """Compare the canonical keys of two matches."""
+        if isinstance(other, Match):
+            return self.match_key() == other.match_key()
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash(self.match_key())
+
     def unpack(self, buff, offset=0):
         """Unpack *buff* into this object.
 
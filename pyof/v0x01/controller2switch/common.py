@@ -243,7 +243,7 @@ class FlowStats(GenericStruct):
         self.length = UBInt16()
         self.length.unpack(buff, offset)
         max_length = offset + self.length.value
-        super().unpack(buff[:max_length], offset)
+        super().unpack(memoryview(buff)[:max_length], offset)
 
 
 class FlowStatsRequest(GenericStruct):
@@ -68,7 +68,7 @@ class StatsReply(GenericMessage):
             buff (bytes): Binary data package to be unpacked, without the
                 header.
         """
-        super().unpack(buff[offset:])
+        super().unpack(buff, offset)
         self._unpack_body()
 
     def _unpack_body(self):
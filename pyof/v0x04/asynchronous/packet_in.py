@@ -97,5 +97,4 @@ class PacketIn(GenericMessage):
             it exists. Otherwise return None.
 
         """
-        in_port = self.match.get_field(OxmOfbMatchField.OFPXMT_OFB_IN_PORT)
-        return int.from_bytes(in_port, 'big')
+        return self.match.get_value(OxmOfbMatchField.OFPXMT_OFB_IN_PORT)
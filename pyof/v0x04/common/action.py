@@ -4,7 +4,7 @@ from enum import IntEnum
 from math import ceil
 
 # Local source tree imports
-from pyof.foundation.base import GenericStruct
+from pyof.foundation.base import TypeDispatchedStruct
 from pyof.foundation.basic_types import (
     BinaryData, FixedTypeList, Pad, UBInt8, UBInt16, UBInt32)
 from pyof.v0x04.common.flow_match import OxmTLV
@@ -76,8 +76,7 @@ class ControllerMaxLen(IntEnum):
 
 # Classes
 
-
-class ActionHeader(GenericStruct):
+class ActionHeader(TypeDispatchedStruct):
     """Action header that is common to all actions.
 
     The length includes the header and any padding used to make the action
@@ -117,33 +116,6 @@ class ActionHeader(GenericStruct):
             return ceil(current_size / 8) * 8
         raise ValueError(f'Invalid value "{value}" for Action*.get_size()')
 
-    def unpack(self, buff, offset=0):
-        """Unpack a binary message into this object's attributes.
-
-        Unpack the binary value *buff* and update this object attributes based
-        on the results.
-
-        Args:
-            buff (bytes): Binary data package to be unpacked.
-            offset (int): Where to begin unpacking.
-
-        Raises:
-            Exception: If there is a struct unpacking error.
-
-        """
-        self.action_type = UBInt16(enum_ref=ActionType)
-        self.action_type.unpack(buff, offset)
-
-        self.length = UBInt16()
-        self.length.unpack(buff, offset=offset+2)
-
-        for cls in ActionHeader.__subclasses__():
-            if self.action_type.value in cls.get_allowed_types():
-                self.__class__ = cls
-                break
-
-        super().unpack(buff[:offset+self.length], offset)
-
     @classmethod
     def get_allowed_types(cls):
         """Return allowed types for the class."""
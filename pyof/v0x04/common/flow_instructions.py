@@ -7,7 +7,7 @@ flow matches the entry.
 from enum import IntEnum
 
 # Local source tree imports
-from pyof.foundation.base import GenericStruct
+from pyof.foundation.base import TypeDispatchedStruct
 from pyof.foundation.basic_types import (
     FixedTypeList, Pad, UBInt8, UBInt16, UBInt32, UBInt64)
 from pyof.foundation.exceptions import PackException
@@ -45,15 +45,12 @@ class InstructionType(IntEnum):
 
     def find_class(self):
         """Return a class related with this type."""
-        classes = {1: InstructionGotoTable, 2: InstructionWriteMetadata,
-                   3: InstructionWriteAction, 4: InstructionApplyAction,
-                   5: InstructionClearAction, 6: InstructionMeter}
-        return classes.get(self.value, None)
+        return Instruction.class_of_type(self)
 
 
 # Classes
 
-class Instruction(GenericStruct):
+class Instruction(TypeDispatchedStruct):
     """Generic Instruction class.
 
     This class represents a Generic Instruction that can be instanciated as
@@ -95,29 +92,6 @@ class Instruction(GenericStruct):
         """Update length attribute."""
         self.length = self.get_size()
 
-    def unpack(self, buff=None, offset=0):
-        """Unpack *buff* into this object.
-
-        This method will convert a binary data into a readable value according
-        to the attribute format.
-
-        Args:
-            buff (bytes): Binary buffer.
-            offset (int): Where to begin unpacking.
-
-        Raises:
-            :exc:`~.exceptions.UnpackException`: If unpack fails.
-
-        """
-        instruction_type = UBInt16(enum_ref=InstructionType)
-        instruction_type.unpack(buff, offset)
-        self.__class__ = InstructionType(instruction_type.value).find_class()
-
-        length = UBInt16()
-        length.unpack(buff, offset=offset+2)
-
-        super().unpack(buff[:offset+length.value], offset)
-
 
 class InstructionApplyAction(Instruction):
     """Instruction structure for OFPIT_APPLY_ACTIONS.
@@ -131,6 +105,8 @@ class InstructionApplyAction(Instruction):
     #: Actions associated with OFPIT_APPLY_ACTIONS
     actions = ListOfActions()
 
+    _allowed_types = (InstructionType.OFPIT_APPLY_ACTIONS,)
+
     def __init__(self, actions=None):
         """Create a InstructionApplyAction with the optional parameters below.
 
@@ -153,6 +129,8 @@ class InstructionClearAction(Instruction):
     #: OFPIT_CLEAR_ACTIONS does not have any action on the list of actions.
     actions = ListOfActions()
 
+    _allowed_types = (InstructionType.OFPIT_CLEAR_ACTIONS,)
+
     def __init__(self, actions=None):
         """Create a InstructionClearAction with the optional parameters below.
 
@@ -172,6 +150,8 @@ class InstructionGotoTable(Instruction):
     #: Pad to 64 bits.
     pad = Pad(3)
 
+    _allowed_types = (InstructionType.OFPIT_GOTO_TABLE,)
+
     def __init__(self, table_id=Meter.OFPM_ALL):
         """Create a InstructionGotoTable with the optional parameters below.
 
@@ -192,6 +172,8 @@ class InstructionMeter(Instruction):
     #: Meter instance.
     meter_id = UBInt32()
 
+    _allowed_types = (InstructionType.OFPIT_METER,)
+
     def __init__(self, meter_id=Meter.OFPM_ALL):
         """Create a InstructionMeter with the optional parameters below.
 
@@ -214,6 +196,8 @@ class InstructionWriteAction(Instruction):
     #: Actions associated with OFPIT_WRITE_ACTIONS
     actions = ListOfActions()
 
+    _allowed_types = (InstructionType.OFPIT_WRITE_ACTIONS,)
+
     def __init__(self, actions=None):
         """Create a InstructionWriteAction with the optional parameters below.
 
@@ -235,6 +219,8 @@ class InstructionWriteMetadata(Instruction):
     #: Metadata write bitmask
     metadata_mask = UBInt64()
 
+    _allowed_types = (InstructionType.OFPIT_WRITE_METADATA,)
+
     def __init__(self, metadata=0, metadata_mask=0):
         """Create InstructionWriteMetadata with the optional parameters below.
 
@@ -4,18 +4,21 @@ An OpenFlow match is composed of a flow match header and a sequence of zero or
 more flow match fields.
 """
 # System imports
+import struct
+from copy import deepcopy
 from enum import Enum, IntEnum
 from math import ceil
 
 # Local source tree imports
 from pyof.foundation.base import GenericStruct
 from pyof.foundation.basic_types import (
-    BinaryData, FixedTypeList, Pad, UBInt8, UBInt16, UBInt32)
+    BinaryData, FixedTypeList, HWAddress, IPAddress, IPv6Address, Pad, UBInt8,
+    UBInt16, UBInt32)
 from pyof.foundation.exceptions import PackException, UnpackException
 
-__all__ = ('Ipv6ExtHdrFlags', 'ListOfOxmHeader', 'Match', 'MatchType',
-           'OxmClass', 'OxmExperimenterHeader', 'OxmMatchFields',
-           'OxmOfbMatchField', 'OxmTLV', 'VlanId')
+__all__ = ('OXM_CODECS', 'Ipv6ExtHdrFlags', 'ListOfOxmHeader', 'Match',
+           'MatchType', 'OxmClass', 'OxmCodec', 'OxmExperimenterHeader',
+           'OxmMatchFields', 'OxmOfbMatchField', 'OxmTLV', 'VlanId')
 
 
 class Ipv6ExtHdrFlags(Enum):
@@ -180,6 +183,194 @@ class VlanId(IntEnum):
     OFPVID_NONE = 0x0000
 
 
+# Value codecs
+
+class OxmCodec:
+    """Wire format of the value of an OpenFlow basic match field.
+
+    Values are converted with :class:`struct.Struct` objects compiled once
+    per field. In masked TLVs, the value is followed by a mask of the same
+    width. The mask of IP address fields can also be given as the prefix
+    length of the value (e.g. ``'10.0.0.0/8'``).
+    """
+
+    __slots__ = ('width', 'maskable', '_struct', '_masked_struct',
+                 '_to_item', '_from_item', '_prefix_type')
+
+    def __init__(self, width, item_format, maskable=False, to_item=None,
+                 from_item=None, prefix_type=None):
+        """Create the codec of a field.
+
+        Args:
+            width (int): Size of the value in bytes, from the spec.
+            item_format (str): :mod:`struct` format of the value.
+            maskable (bool): Whether the field can be masked.
+            to_item (callable): Converts a value to a struct item.
+            from_item (callable): Converts a struct item to a value.
+            prefix_type (type): Address type whose ``netmask`` prefix length
+                is turned into the mask, if the value has one.
+
+        Raises:
+            ValueError: If the format size is not the given width.
+
+        """
+        self.width = width
+        self.maskable = maskable
+        self._struct = struct.Struct('!' + item_format)
+        self._masked_struct = struct.Struct('!' + item_format * 2)
+        self._to_item = to_item
+        self._from_item = from_item
+        self._prefix_type = prefix_type
+        if self._struct.size != width:
+            raise ValueError(f'Format "{item_format}" is not {width} bytes')
+
+    @property
+    def mask_width(self):
+        """Return the size of the mask in bytes, or 0 if not maskable."""
+        return self.width if self.maskable else 0
+
+    def encode(self, value, mask=None):
+        """Return the TLV payload of a value and an optional mask.
+
+        Raises:
+            ValueError: If the value or mask can't be packed, the field
+                can't be masked, or the value has both a prefix length and a
+                mask.
+
+        """
+        to_item = self._to_item
+        try:
+            if self._prefix_type is not None:
+                prefix_mask = self._prefix_mask(value)
+                if prefix_mask is not None:
+                    if mask is not None:
+                        raise ValueError('Both a prefix length and a mask')
+                    return self._masked_struct.pack(to_item(value),
+                                                    prefix_mask)
+            if to_item is not None:
+                value = to_item(value)
+            if mask is None:
+                return self._struct.pack(value)
+            if not self.maskable:
+                raise ValueError('Field can\'t be masked')
+            if to_item is not None:
+                mask = to_item(mask)
+            return self._masked_struct.pack(value, mask)
+        except (struct.error, OverflowError, PackException) as exception:
+            raise ValueError(exception)
+
+    def _prefix_mask(self, value):
+        """Return the mask bytes of the prefix length of an address value.
+
+        Returns:
+            bytes: The mask, or None if the value has no prefix length or a
+                full one.
+
+        """
+        if isinstance(value, str):
+            if '/' not in value:
+                return None
+            value = self._prefix_type(value)
+        elif not isinstance(value, self._prefix_type):
+            return None
+        bits = 8 * self.width
+        prefix = int(value.netmask)
+        if prefix == bits:
+            return None
+        if not 0 <= prefix < bits:
+            raise ValueError(f'Invalid prefix length {prefix}')
+        if not self.maskable:
+            raise ValueError('Field can\'t be masked')
+        mask = ((1 << bits) - 1) ^ ((1 << (bits - prefix)) - 1)
+        return mask.to_bytes(self.width, 'big')
+
+    def decode(self, payload):
+        """Return the value and mask (None if unmasked) of a TLV payload.
+
+        Raises:
+            UnpackException: If the payload size doesn't match the field.
+
+        """
+        length = len(payload)
+        if length == self.width:
+            value, mask = self._struct.unpack(payload)[0], None
+        elif length == 2 * self.width and self.maskable:
+            value, mask = self._masked_struct.unpack(payload)
+        else:
+            raise UnpackException(f'Invalid OXM value size: {length} bytes')
+        from_item = self._from_item
+        if from_item is not None:
+            value = from_item(value)
+            if mask is not None:
+                mask = from_item(mask)
+        return value, mask
+
+
+def _int_codec(width, maskable=False):
+    """Return the codec of an unsigned integer field."""
+    if width == 3:
+        return OxmCodec(3, '3s', maskable,
+                        lambda value: int(value).to_bytes(3, 'big'),
+                        lambda item: int.from_bytes(item, 'big'))
+    return OxmCodec(width, {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}[width], maskable)
+
+
+def _address_codec(address_type, maskable=False):
+    """Return the codec of a field of a basic address type."""
+    prototype = address_type()
+    size = prototype.get_size()
+    # IP addresses have a prefix length
+    prefix_type = address_type if hasattr(prototype, 'netmask') else None
+    # pylint: disable=protected-access
+    return OxmCodec(size, prototype._codec_format(), maskable,
+                    prototype._codec_pack, prototype._codec_unpack,
+                    prefix_type)
+
+
+#: Codec of each OpenFlow basic match field, after the OpenFlow 1.3 spec
+OXM_CODECS = {
+    OxmOfbMatchField.OFPXMT_OFB_IN_PORT: _int_codec(4),
+    OxmOfbMatchField.OFPXMT_OFB_IN_PHY_PORT: _int_codec(4),
+    OxmOfbMatchField.OFPXMT_OFB_METADATA: _int_codec(8, True),
+    OxmOfbMatchField.OFPXMT_OFB_ETH_DST: _address_codec(HWAddress, True),
+    OxmOfbMatchField.OFPXMT_OFB_ETH_SRC: _address_codec(HWAddress, True),
+    OxmOfbMatchField.OFPXMT_OFB_ETH_TYPE: _int_codec(2),
+    OxmOfbMatchField.OFPXMT_OFB_VLAN_VID: _int_codec(2, True),
+    OxmOfbMatchField.OFPXMT_OFB_VLAN_PCP: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFB_IP_DSCP: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFB_IP_ECN: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFB_IP_PROTO: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFB_IPV4_SRC: _address_codec(IPAddress, True),
+    OxmOfbMatchField.OFPXMT_OFB_IPV4_DST: _address_codec(IPAddress, True),
+    OxmOfbMatchField.OFPXMT_OFB_TCP_SRC: _int_codec(2),
+    OxmOfbMatchField.OFPXMT_OFB_TCP_DST: _int_codec(2),
+    OxmOfbMatchField.OFPXMT_OFB_UDP_SRC: _int_codec(2),
+    OxmOfbMatchField.OFPXMT_OFB_UDP_DST: _int_codec(2),
+    OxmOfbMatchField.OFPXMT_OFB_SCTP_SRC: _int_codec(2),
+    OxmOfbMatchField.OFPXMT_OFB_SCTP_DST: _int_codec(2),
+    OxmOfbMatchField.OFPXMT_OFB_ICMPV4_TYPE: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFB_ICMPV4_CODE: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFB_ARP_OP: _int_codec(2),
+    OxmOfbMatchField.OFPXMT_OFB_ARP_SPA: _address_codec(IPAddress, True),
+    OxmOfbMatchField.OFPXMT_OFB_ARP_TPA: _address_codec(IPAddress, True),
+    OxmOfbMatchField.OFPXMT_OFB_ARP_SHA: _address_codec(HWAddress, True),
+    OxmOfbMatchField.OFPXMT_OFB_ARP_THA: _address_codec(HWAddress, True),
+    OxmOfbMatchField.OFPXMT_OFB_IPV6_SRC: _address_codec(IPv6Address, True),
+    OxmOfbMatchField.OFPXMT_OFB_IPV6_DST: _address_codec(IPv6Address, True),
+    OxmOfbMatchField.OFPXMT_OFB_IPV6_FLABEL: _int_codec(4, True),
+    OxmOfbMatchField.OFPXMT_OFB_ICMPV6_TYPE: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFB_ICMPV6_CODE: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFB_IPV6_ND_TARGET: _address_codec(IPv6Address),
+    OxmOfbMatchField.OFPXMT_OFB_IPV6_ND_SLL: _address_codec(HWAddress),
+    OxmOfbMatchField.OFPXMT_OFB_IPV6_ND_TLL: _address_codec(HWAddress),
+    OxmOfbMatchField.OFPXMT_OFB_MPLS_LABEL: _int_codec(4),
+    OxmOfbMatchField.OFPXMT_OFB_MPLS_TC: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFP_MPLS_BOS: _int_codec(1),
+    OxmOfbMatchField.OFPXMT_OFB_PBB_ISID: _int_codec(3, True),
+    OxmOfbMatchField.OFPXMT_OFB_TUNNEL_ID: _int_codec(8, True),
+    OxmOfbMatchField.OFPXMT_OFB_IPV6_EXTHDR: _int_codec(2, True)}
+
+
 # Classes
 
 class OxmTLV(GenericStruct):
@@ -211,6 +402,75 @@ class OxmTLV(GenericStruct):
         self.oxm_field = oxm_field
         self.oxm_hasmask = oxm_hasmask
 
+    @classmethod
+    def from_value(cls, field, value, mask=None):
+        """Create an OpenFlow basic TLV from a value and an optional mask.
+
+        Args:
+            field (OxmOfbMatchField, int): Match field.
+            value: Integer value, or address (instance or text) for address
+                fields. The prefix length of an IP address (e.g.
+                ``'10.0.0.0/8'``) is turned into the mask.
+            mask: Mask of the same type as the value, if any.
+
+        Returns:
+            OxmTLV: TLV with the packed value (and mask).
+
+        Raises:
+            ValueError: If the field is unknown, the value or mask can't be
+                packed or the field can't be masked.
+
+        """
+        try:
+            codec = OXM_CODECS[field]
+        except KeyError:
+            raise ValueError(f'Unknown OpenFlow basic field "{field}"')
+        payload = codec.encode(value, mask)
+        # The attributes set by __init__, without copying the class ones first
+        tlv = object.__new__(cls)
+        tlv.__dict__.update(oxm_class=OxmClass.OFPXMC_OPENFLOW_BASIC,
+                            oxm_field_and_mask=None, oxm_length=None,
+                            oxm_value=payload,
+                            oxm_field=OxmOfbMatchField(field),
+                            oxm_hasmask=len(payload) > codec.width)
+        return tlv
+
+    def _decode_value(self):
+        """Return the value and mask decoded by the field codec."""
+        if self.oxm_class != OxmClass.OFPXMC_OPENFLOW_BASIC:
+            raise ValueError('Only OpenFlow basic fields have typed values')
+        try:
+            codec = OXM_CODECS[self.oxm_field]
+        except KeyError:
+            raise ValueError(f'Unknown OpenFlow basic field '
+                             f'"{self.oxm_field}"')
+        value = self.oxm_value
+        if isinstance(value, BinaryData):
+            value = value.value
+        return codec.decode(value)
+
+    @property
+    def typed_value(self):
+        """Return the value, without the mask, decoded by the field codec.
+
+        Returns:
+            An int, or a :class:`~pyof.foundation.basic_types.HWAddress`,
+            :class:`~pyof.foundation.basic_types.IPAddress` or
+            :class:`~pyof.foundation.basic_types.IPv6Address` for address
+            fields. See :data:`OXM_CODECS`.
+
+        Raises:
+            ValueError: If the TLV is not of a known OpenFlow basic field.
+            UnpackException: If the value size doesn't match the field.
+
+        """
+        return self._decode_value()[0]
+
+    @property
+    def typed_mask(self):
+        """Return the decoded mask, or None. See :attr:`typed_value`."""
+        return self._decode_value()[1]
+
     def unpack(self, buff, offset=0):
         """Unpack the buffer into a OxmTLV.
 
@@ -232,7 +492,7 @@ class OxmTLV(GenericStruct):
         # Unpack oxm_value that has oxm_length bytes
         start = offset + 4  # 4 bytes: class, field_and_mask and length
         end = start + self.oxm_length
-        self.oxm_value = buff[start:end]
+        self.oxm_value = bytes(buff[start:end])
 
     def _unpack_oxm_field(self):
         """Unpack oxm_field from oxm_field_and_mask.
@@ -301,13 +561,40 @@ class OxmTLV(GenericStruct):
         return self.oxm_field
 
 
+def _tlv_key(tlv):
+    """Return the canonical key of a TLV. See :meth:`Match.match_key`."""
+    value = tlv.oxm_value
+    if isinstance(value, BinaryData):
+        value = value.value
+    value = bytes(value)
+    mask = b''
+    if tlv.oxm_hasmask:
+        size = len(value) // 2
+        value, mask = value[:size], value[size:]
+        if mask == b'\xff' * size:
+            mask = b''
+        else:
+            value = (int.from_bytes(value, 'big') &
+                     int.from_bytes(mask, 'big')).to_bytes(size, 'big')
+    return (int(tlv.oxm_class), int(tlv.oxm_field), value, mask)
+
+
 class OxmMatchFields(FixedTypeList):
     """Generic Openflow EXtensible Match header.
 
     Abstract class that can be instantiated as Match or OxmExperimenterHeader.
 
+    The TLVs are indexed by field on the first :meth:`find`, and the
+    :meth:`match_key` is cached too. Both are dropped whenever the list
+    changes. Changing a TLV in the list is not tracked: replace it instead
+    (e.g. ``fields[0] = OxmTLV.from_value(...)``).
     """
 
+    #: First TLV of each field, built on demand
+    _index = None
+    #: Cached result of match_key
+    _key = None
+
     def __init__(self, items=None):
         """Initialize ``items`` attribute.
 
@@ -316,6 +603,96 @@ class OxmMatchFields(FixedTypeList):
         """
         super().__init__(pyof_class=OxmTLV, items=items)
 
+    def find(self, field_type):
+        """Return the first TLV of a field.
+
+        Args:
+            field_type (OxmOfbMatchField, int): Field of the TLV.
+
+        Returns:
+            OxmTLV: The TLV, or None if there is no TLV of the field.
+
+        """
+        index = self._index
+        if index is None:
+            index = {}
+            for tlv in self:
+                index.setdefault(tlv.oxm_field, tlv)
+            self._index = index
+        return index.get(field_type)
+
+    def match_key(self):
+        """Return a canonical, hashable key of the TLVs.
+
+        The key is the same for lists with the same TLVs in any order. The
+        mask of masked TLVs is applied to their value, and all-ones masks
+        are left out.
+
+        Returns:
+            tuple: Sorted tuples of class, field, value and mask bytes.
+
+        """
+        key = self._key
+        if key is None:
+            key = self._key = tuple(sorted(_tlv_key(tlv) for tlv in self))
+        return key
+
+    def _changed(self):
+        """Drop the data computed from the items."""
+        self._index = None
+        self._key = None
+
+    def append(self, item):
+        """Append one item to the list. See :meth:`FixedTypeList.append`."""
+        self._changed()
+        super().append(item)
+
+    def insert(self, index, item):
+        """Insert an item at an index. See :meth:`FixedTypeList.insert`."""
+        self._changed()
+        super().insert(index, item)
+
+    def __setitem__(self, key, value):
+        self._changed()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._changed()
+        super().__delitem__(key)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def pop(self, *args):
+        """Remove and return an item. See :meth:`list.pop`."""
+        self._changed()
+        return super().pop(*args)
+
+    def remove(self, value):
+        """Remove the first item equal to ``value``."""
+        self._changed()
+        super().remove(value)
+
+    def clear(self):
+        """Remove all items."""
+        self._changed()
+        super().clear()
+
+    def reverse(self):
+        """Reverse the items in place."""
+        self._changed()
+        super().reverse()
+
+    def sort(self, *args, **kwargs):
+        """Sort the items in place. See :meth:`list.sort`."""
+        self._changed()
+        super().sort(*args, **kwargs)
+
+    def __deepcopy__(self, memo):
+        """Improve deepcopy speed, keeping the list type."""
+        return type(self)(items=[deepcopy(item) for item in self])
+
 
 class Match(GenericStruct):
     """Describes the flow match header structure.
@@ -349,7 +726,9 @@ class Match(GenericStruct):
         """
         super().__init__()
         self.match_type = match_type
-        self.oxm_match_fields = oxm_match_fields or OxmMatchFields()
+        if not isinstance(oxm_match_fields, OxmMatchFields):
+            oxm_match_fields = OxmMatchFields(oxm_match_fields)
+        self.oxm_match_fields = oxm_match_fields
 
         self._update_match_length()
 
@@ -391,7 +770,60 @@ class Match(GenericStruct):
             size = self._unpack_attribute(name, value, buff, begin)
             begin += size
         self._unpack_attribute('oxm_match_fields', type(self).oxm_match_fields,
-                               buff[:offset+self.length], begin)
+                               memoryview(buff)[:offset+self.length], begin)
+
+    def match_key(self):
+        """Return a canonical, hashable key of this match.
+
+        Matches with the same key match the same packets: the OXM TLVs are
+        sorted, masks are applied to the values and all-ones masks are left
+        out. The key of an :class:`OxmMatchFields` list is cached until the
+        list changes.
+
+        Returns:
+            tuple: Match type and the sorted keys of the TLVs.
+
+        """
+        fields = self.oxm_match_fields
+        try:
+            key = fields.match_key()
+        except AttributeError:
+            # A plain list assigned to the attribute
+            key = tuple(sorted(_tlv_key(tlv) for tlv in fields))
+        return (int(self.match_type), key)
+
+    def __eq__(self, other):
+        """Compare the canonical keys of two matches."""
+        if isinstance(other, Match):
+            return self.match_key() == other.match_key()
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash(self.match_key())
+
+    def get_tlv(self, field_type):
+        """Return the TLV of the 'field_type' field in oxm_match_fields.
+
+        The TLVs of an :class:`OxmMatchFields` list are looked up in its
+        index by field, so each lookup takes constant time.
+
+        Args:
+            field_type (~pyof.v0x04.common.flow_match.OxmOfbMatchField, int):
+                The type of the OXM field.
+
+        Returns:
+            OxmTLV: The TLV if it exists. Otherwise return None.
+
+        """
+        fields = self.oxm_match_fields
+        try:
+            return fields.find(field_type)
+        except AttributeError:
+            # A plain list assigned to the attribute
+            for field in fields:
+                if field.oxm_field == field_type:
+                    return field
+            return None
 
     def get_field(self, field_type):
         """Return the value for the 'field_type' field in oxm_match_fields.
@@ -402,15 +834,32 @@ class Match(GenericStruct):
                 The type of the OXM field you want the value.
 
         Returns:
-            The integer number of the 'field_type' if it exists. Otherwise
+            The binary value of the 'field_type' if it exists. Otherwise
             return None.
 
         """
-        for field in self.oxm_match_fields:
-            if field.oxm_field == field_type:
-                return field.oxm_value
+        tlv = self.get_tlv(field_type)
+        return None if tlv is None else tlv.oxm_value
+
+    def get_value(self, field_type):
+        """Return the decoded value of an OpenFlow basic field.
+
+        Args:
+            field_type (~pyof.v0x04.common.flow_match.OxmOfbMatchField):
+                The type of the OXM field you want the value.
 
-        return None
+        Returns:
+            The value of the field, without its mask, if it exists: an int,
+            or a :class:`~pyof.foundation.basic_types.HWAddress`,
+            :class:`~pyof.foundation.basic_types.IPAddress` or
+            :class:`~pyof.foundation.basic_types.IPv6Address` for address
+            fields. Otherwise return None.
+
+        """
+        tlv = self.get_tlv(field_type)
+        if tlv is None or tlv.oxm_class != OxmClass.OFPXMC_OPENFLOW_BASIC:
+            return None
+        return tlv.typed_value
 
 
 class OxmExperimenterHeader(GenericStruct):
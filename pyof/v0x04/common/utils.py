@@ -5,13 +5,14 @@
 # Third-party imports
 
 # Local source tree imports
+from pyof.foundation.message_table import MessageTable
 # Importing asynchronous messages
 from pyof.v0x04.asynchronous.error_msg import ErrorMsg
 from pyof.v0x04.asynchronous.flow_removed import FlowRemoved
 from pyof.v0x04.asynchronous.packet_in import PacketIn
 from pyof.v0x04.asynchronous.port_status import PortStatus
 # Importing controller2switch messages
-from pyof.v0x04.common.header import Header, Type
+from pyof.v0x04.common.header import Type
 from pyof.v0x04.controller2switch.barrier_reply import BarrierReply
 from pyof.v0x04.controller2switch.barrier_request import BarrierRequest
 from pyof.v0x04.controller2switch.features_reply import FeaturesReply
@@ -42,8 +43,8 @@ from pyof.v0x04.symmetric.echo_request import EchoRequest
 from pyof.v0x04.symmetric.experimenter import ExperimenterHeader
 from pyof.v0x04.symmetric.hello import Hello
 
-__all__ = ('MESSAGE_TYPES', 'new_message_from_header',
-           'new_message_from_message_type', 'unpack_message')
+__all__ = ('MESSAGE_CLASSES', 'MESSAGE_TYPES', 'new_message_from_header',
+           'new_message_from_message_type', 'peek_header', 'unpack_message')
 
 MESSAGE_TYPES = {
 
@@ -107,6 +108,17 @@ MESSAGE_TYPES = {
 }
 
 
+#: Message classes of this version and the functions that use them
+_MESSAGE_TABLE = MessageTable(Type, MESSAGE_TYPES)
+
+#: Message class of each message type value (None if there is no class),
+#: indexed by the integer message type
+MESSAGE_CLASSES = _MESSAGE_TABLE.classes
+
+peek_header = _MESSAGE_TABLE.peek_header
+unpack_message = _MESSAGE_TABLE.unpack_message
+
+
 def new_message_from_message_type(message_type):
     """Given an OpenFlow Message Type, return an empty message of that type.
 
@@ -121,15 +133,17 @@ def new_message_from_message_type(message_type):
         KytosUndefinedMessageType: Unkown Message_Type.
 
     """
-    message_type = str(message_type)
-    if message_type not in MESSAGE_TYPES:
+    if isinstance(message_type, int) and \
+            0 <= message_type < len(MESSAGE_CLASSES):
+        message_class = MESSAGE_CLASSES[message_type]
+    else:
+        message_class = MESSAGE_TYPES.get(str(message_type))
+
+    if message_class is None:
         msg = "Define class for {} in {}".format(message_type, __file__)
         raise ValueError(msg)
 
-    message_class = MESSAGE_TYPES.get(message_type)
-    message_instance = message_class()
-
-    return message_instance
+    return message_class()
 
 
 def new_message_from_header(header):
@@ -149,36 +163,13 @@ def new_message_from_header(header):
 
     """
     message_type = header.message_type
-    if not isinstance(message_type, Type):
-        try:
-            if isinstance(message_type, str):
-                message_type = Type[message_type]
-            elif isinstance(message_type, int):
-                message_type = Type(message_type)
-        except ValueError:
-            raise ValueError
+    if isinstance(message_type, str):
+        message_type = Type[message_type]
+    # Type members, UBInt8 and int: use the integer value
+    message_type = getattr(message_type, 'value', message_type)
 
     message = new_message_from_message_type(message_type)
     message.header.xid = header.xid
     message.header.length = header.length
 
     return message
-
-
-def unpack_message(buffer):
-    """Unpack the whole buffer, including header pack.
-
-    Args:
-        buffer (bytes): Bytes representation of a openflow message.
-
-    Returns:
-        object: Instance of openflow message.
-
-    """
-    hdr_size = Header().get_size()
-    hdr_buff, msg_buff = buffer[:hdr_size], buffer[hdr_size:]
-    header = Header()
-    header.unpack(hdr_buff)
-    message = new_message_from_header(header)
-    message.unpack(msg_buff)
-    return message
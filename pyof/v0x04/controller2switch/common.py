@@ -3,7 +3,8 @@
 # System imports
 from enum import IntEnum
 
-from pyof.foundation.base import GenericMessage, GenericStruct
+from pyof.foundation.base import (
+    GenericMessage, GenericStruct, TypeDispatchedStruct)
 from pyof.foundation.basic_types import (
     Char, FixedTypeList, Pad, UBInt8, UBInt16, UBInt32, UBInt64)
 from pyof.foundation.constants import OFP_MAX_TABLE_NAME_LEN
@@ -92,17 +93,9 @@ class TableFeaturePropType(IntEnum):
     # Experimenter for table-miss.
     OFPTFPT_EXPERIMENTER_MISS = 0xFFFF
 
-    # pylint: disable=comparison-with-callable
     def find_class(self):
         """Return a class related with this type."""
-        if self.value <= 1:
-            return InstructionsProperty
-        if self.value <= 3:
-            return NextTablesProperty
-        if self.value <= 7:
-            return ActionsProperty
-
-        return OxmProperty
+        return Property.class_of_type(self)
 
 
 class MultipartType(IntEnum):
@@ -235,7 +228,8 @@ class Bucket(GenericStruct):
         """
         length = UBInt16()
         length.unpack(buff, offset=offset)
-        super().unpack(buff[:offset + length.value], offset=offset)
+        super().unpack(memoryview(buff)[:offset + length.value],
+                       offset=offset)
 
     def get_size(self, value=None):
         """
@@ -426,7 +420,7 @@ class ExperimenterMultipartHeader(GenericStruct):
         self.exp_type = exp_type
 
 
-class Property(GenericStruct):
+class Property(TypeDispatchedStruct):
     """Table Property class.
 
     This class represents a Table Property generic structure.
@@ -456,28 +450,6 @@ class Property(GenericStruct):
         self.update_length()
         return super().pack(value)
 
-    def unpack(self, buff=None, offset=0):
-        """Unpack *buff* into this object.
-
-        This method will convert a binary data into a readable value according
-        to the attribute format.
-
-        Args:
-            buff (bytes): Binary buffer.
-            offset (int): Where to begin unpacking.
-
-        Raises:
-            :exc:`~.exceptions.UnpackException`: If unpack fails.
-
-        """
-        property_type = UBInt16(enum_ref=TableFeaturePropType)
-        property_type.unpack(buff, offset)
-        self.__class__ = TableFeaturePropType(property_type.value).find_class()
-
-        length = UBInt16()
-        length.unpack(buff, offset=offset+2)
-        super().unpack(buff[:offset+length.value], offset=offset)
-
     def update_length(self):
         """Update the length of current instance."""
         self.length = self.get_size()
@@ -493,6 +465,9 @@ class InstructionsProperty(Property):
 
     instruction_ids = ListOfInstruction()
 
+    _allowed_types = (TableFeaturePropType.OFPTFPT_INSTRUCTIONS,
+                      TableFeaturePropType.OFPTFPT_INSTRUCTIONS_MISS)
+
     def __init__(self, property_type=TableFeaturePropType.OFPTFPT_INSTRUCTIONS,
                  instruction_ids=None):
         """Create a InstructionsProperty with the optional parameters below.
@@ -519,6 +494,9 @@ class NextTablesProperty(Property):
 
     next_table_ids = ListOfInstruction()
 
+    _allowed_types = (TableFeaturePropType.OFPTFPT_NEXT_TABLES,
+                      TableFeaturePropType.OFPTFPT_NEXT_TABLES_MISS)
+
     def __init__(self, property_type=TableFeaturePropType.OFPTFPT_NEXT_TABLES,
                  next_table_ids=None):
         """Create a NextTablesProperty with the optional parameters below.
@@ -548,6 +526,11 @@ class ActionsProperty(Property):
 
     action_ids = ListOfActions()
 
+    _allowed_types = (TableFeaturePropType.OFPTFPT_WRITE_ACTIONS,
+                      TableFeaturePropType.OFPTFPT_WRITE_ACTIONS_MISS,
+                      TableFeaturePropType.OFPTFPT_APPLY_ACTIONS,
+                      TableFeaturePropType.OFPTFPT_APPLY_ACTIONS_MISS)
+
     def __init__(self,
                  property_type=TableFeaturePropType.OFPTFPT_WRITE_ACTIONS,
                  action_ids=None):
@@ -579,6 +562,13 @@ class OxmProperty(Property):
 
     oxm_ids = ListOfOxmHeader()
 
+    _allowed_types = (TableFeaturePropType.OFPTFPT_MATCH,
+                      TableFeaturePropType.OFPTFPT_WILDCARDS,
+                      TableFeaturePropType.OFPTFPT_WRITE_SETFIELD,
+                      TableFeaturePropType.OFPTFPT_WRITE_SETFIELD_MISS,
+                      TableFeaturePropType.OFPTFPT_APPLY_SETFIELD,
+                      TableFeaturePropType.OFPTFPT_APPLY_SETFIELD_MISS)
+
     def __init__(self, property_type=TableFeaturePropType.OFPTFPT_MATCH,
                  oxm_ids=None):
         """Create an OxmProperty with the optional parameters below.
@@ -703,4 +693,4 @@ class TableFeatures(GenericStruct):
         """
         length = UBInt16()
         length.unpack(buff, offset)
-        super().unpack(buff[:offset+length.value], offset)
+        super().unpack(memoryview(buff)[:offset+length.value], offset)
@@ -1,9 +1,10 @@
 """Meter modification message."""
 from enum import IntEnum
 
-from pyof.foundation.base import GenericBitMask, GenericMessage
+from pyof.foundation.base import (
+    GenericBitMask, GenericMessage, TypeDispatchedStruct)
 from pyof.foundation.basic_types import (
-    FixedTypeList, GenericStruct, Pad, UBInt8, UBInt16, UBInt32)
+    FixedTypeList, Pad, UBInt8, UBInt16, UBInt32)
 from pyof.v0x04.common.header import Header, Type
 
 __all__ = ('MeterMod', 'Meter', 'MeterModCommand', 'MeterFlags',
@@ -62,12 +63,10 @@ class MeterBandType(IntEnum):
 
     def find_class(self):
         """Return a class related with this type."""
-        types = {1: MeterBandDrop, 2: MeterBandDscpRemark,
-                 3: MeterBandExperimenter}
-        return types[self.value]
+        return MeterBandHeader.class_of_type(self)
 
 
-class MeterBandHeader(GenericStruct):
+class MeterBandHeader(TypeDispatchedStruct):
     """Common header for all meter bands."""
 
     band_type = UBInt16(enum_ref=MeterBandType)
@@ -93,29 +92,6 @@ class MeterBandHeader(GenericStruct):
         """Update the length attribute of current instance."""
         self.length = self.get_size()
 
-    def unpack(self, buff=None, offset=0):
-        """Unpack *buff* into this object.
-
-        This method will convert a binary data into a readable value according
-        to the attribute format.
-
-        Args:
-            buff (bytes): Binary buffer.
-            offset (int): Where to begin unpacking.
-
-        Raises:
-            :exc:`~.exceptions.UnpackException`: If unpack fails.
-
-        """
-        band_type = UBInt16(enum_ref=MeterBandType)
-        band_type.unpack(buff, offset)
-        self.__class__ = MeterBandType(band_type.value).find_class()
-
-        length = UBInt16()
-        length.unpack(buff, offset=offset+2)
-
-        super().unpack(buff[:offset+length.value], offset)
-
 
 class MeterMod(GenericMessage):
     """Meter configuration."""
@@ -150,6 +126,8 @@ class MeterBandDrop(MeterBandHeader):
 
     pad = Pad(4)
 
+    _allowed_types = (MeterBandType.OFPMBT_DROP,)
+
     def __init__(self, rate=None, burst_size=None):
         """Create a MeterBandDrop with the optional parameters below.
 
@@ -166,6 +144,8 @@ class MeterBandDscpRemark(MeterBandHeader):
     prec_level = UBInt8()
     pad = Pad(3)
 
+    _allowed_types = (MeterBandType.OFPMBT_DSCP_REMARK,)
+
     def __init__(self, rate=None, burst_size=None, prec_level=None):
         """Create a MeterBandDscpRemark with the optional parameters below.
 
@@ -183,6 +163,8 @@ class MeterBandExperimenter(MeterBandHeader):
 
     experimenter = UBInt32()
 
+    _allowed_types = (MeterBandType.OFPMBT_EXPERIMENTER,)
+
     def __init__(self, rate=None, burst_size=None, experimenter=None):
         """Create a MeterBandExperimenter with the optional parameters below.
 
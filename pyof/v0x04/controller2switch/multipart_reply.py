@@ -129,7 +129,7 @@ class MultipartReply(GenericMessage):
                 header.
 
         """
-        super().unpack(buff[offset:])
+        super().unpack(buff, offset)
         self._unpack_body()
 
     def _unpack_body(self):
@@ -310,7 +310,7 @@ class FlowStats(GenericStruct):
         """
         unpack_length = UBInt16()
         unpack_length.unpack(buff, offset)
-        super().unpack(buff[:offset+unpack_length], offset)
+        super().unpack(memoryview(buff)[:offset+unpack_length], offset)
 
 
 class PortStats(GenericStruct):
@@ -716,7 +716,8 @@ class MeterStats(GenericStruct):
         length.unpack(buff, offset)
 
         length.unpack(buff, offset=offset+MeterStats.meter_id.get_size())
-        super().unpack(buff[:offset+length.value], offset=offset)
+        super().unpack(memoryview(buff)[:offset+length.value],
+                       offset=offset)
 
 
 class TableStats(GenericStruct):
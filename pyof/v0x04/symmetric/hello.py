@@ -4,7 +4,7 @@
 
 from enum import IntEnum
 
-from pyof.foundation.base import GenericMessage, GenericStruct
+from pyof.foundation.base import GenericMessage, TypeDispatchedStruct
 from pyof.foundation.basic_types import BinaryData, FixedTypeList, UBInt16
 from pyof.foundation.exceptions import PackException
 from pyof.v0x04.common.header import Header, Type
@@ -26,7 +26,7 @@ class HelloElemType(IntEnum):
 # Classes
 
 
-class HelloElemHeader(GenericStruct):
+class HelloElemHeader(TypeDispatchedStruct):
     """Common header for all Hello Elements."""
 
     element_type = UBInt16()
@@ -68,25 +68,6 @@ class HelloElemHeader(GenericStruct):
         """Update length attribute."""
         self.length = self.get_size()
 
-    def unpack(self, buff=None, offset=0):
-        """Unpack *buff* into this object.
-
-        This method will convert a binary data into a readable value according
-        to the attribute format.
-
-        Args:
-            buff (bytes): Binary buffer.
-            offset (int): Where to begin unpacking.
-
-        Raises:
-            :exc:`~.exceptions.UnpackException`: If unpack fails.
-
-        """
-        length = UBInt16()
-        length.unpack(buff, offset=offset+2)
-
-        super().unpack(buff[:offset+length.value], offset)
-
 
 class ListOfHelloElements(FixedTypeList):
     """List of Hello elements.
@@ -0,0 +1,137 @@
+"""Test the asyncio adapters."""
+import asyncio
+import unittest
+from unittest.mock import Mock
+
+from pyof.aio import OpenFlowProtocol, iter_messages
+from pyof.foundation.exceptions import UnpackException
+from pyof.utils import RawMessage
+from pyof.v0x01.symmetric.echo_reply import EchoReply as EchoReply_v0x01
+from pyof.v0x01.symmetric.echo_request import (
+    EchoRequest as EchoRequest_v0x01)
+from pyof.v0x04.symmetric.echo_reply import EchoReply
+from pyof.v0x04.symmetric.echo_request import EchoRequest
+
+
+async def echo(protocol):
+    """Answer the echo requests received by ``protocol``."""
+    async for request in protocol:
+        if request.header.version == 1:
+            protocol.send(EchoReply_v0x01(xid=request.header.xid))
+        else:
+            protocol.send(EchoReply(xid=request.header.xid,
+                                    data=request.data))
+
+
+class TestOpenFlowProtocol(unittest.TestCase):
+    """Test the OpenFlowProtocol class."""
+
+    def setUp(self):
+        """Create an event loop."""
+        self.loop = asyncio.new_event_loop()
+        self.protocol = OpenFlowProtocol(high_water=4, low_water=1)
+        self.transport = Mock()
+        self.transport.is_closing.return_value = False
+        self.protocol.connection_made(self.transport)
+
+    def tearDown(self):
+        """Close the event loop."""
+        self.loop.close()
+
+    def test_loopback(self):
+        """Answer requests of both versions over a loopback connection."""
+        tasks = []
+
+        def factory():
+            protocol = OpenFlowProtocol()
+            tasks.append(asyncio.ensure_future(echo(protocol)))
+            return protocol
+
+        async def run():
+            server = await self.loop.create_server(factory, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            requests = [EchoRequest(xid=xid, data=b'ping').pack()
+                        for xid in range(5)]
+            requests.append(EchoRequest_v0x01(xid=5).pack())
+            writer.write(b''.join(requests))
+            replies = []
+            async for reply in iter_messages(reader):
+                replies.append(reply)
+                if len(replies) == len(requests):
+                    break
+            writer.close()
+            await asyncio.gather(*tasks)
+            server.close()
+            await server.wait_closed()
+            return replies
+
+        replies = self.loop.run_until_complete(run())
+        self.assertEqual([reply.header.xid for reply in replies],
+                         list(range(6)))
+        self.assertEqual(replies[0].data, b'ping')
+        self.assertIsInstance(replies[5], EchoReply_v0x01)
+
+    def test_backpressure(self):
+        """Pause reading at the high-water mark and resume at the low one."""
+        data = b''.join(EchoRequest(xid=xid).pack() for xid in range(4))
+        self.protocol.data_received(data)
+        self.transport.pause_reading.assert_called_once_with()
+
+        receive = self.protocol.receive
+        for xid in range(3):
+            message = self.loop.run_until_complete(receive())
+            self.assertEqual(message.header.xid, xid)
+        self.transport.resume_reading.assert_called_once_with()
+
+    def test_batched_writes(self):
+        """Write all messages sent in a loop iteration at once."""
+        async def send():
+            for xid in range(3):
+                self.protocol.send(EchoRequest(xid=xid))
+            self.protocol.send(b'packed')
+            await asyncio.sleep(0)
+
+        self.loop.run_until_complete(send())
+        self.transport.writelines.assert_called_once_with(
+            [EchoRequest(xid=xid).pack() for xid in range(3)] + [b'packed'])
+
+    def test_end_of_stream(self):
+        """Iteration should stop when the connection is lost."""
+        async def receive_all():
+            return [message async for message in self.protocol]
+
+        self.protocol.data_received(EchoRequest(xid=1).pack())
+        self.protocol.connection_lost(None)
+        messages = self.loop.run_until_complete(receive_all())
+        self.assertEqual([message.header.xid for message in messages], [1])
+
+    def test_filtered_types(self):
+        """Receive the messages of the filtered out types undecoded."""
+        protocol = OpenFlowProtocol(types=['OFPT_ECHO_REPLY'])
+        protocol.connection_made(self.transport)
+        protocol.data_received(EchoRequest(xid=1).pack() +
+                               EchoReply(xid=2).pack())
+        request = self.loop.run_until_complete(protocol.receive())
+        reply = self.loop.run_until_complete(protocol.receive())
+        self.assertIsInstance(request, RawMessage)
+        self.assertEqual(request.header.xid, 1)
+        self.assertIsInstance(reply, EchoReply)
+
+    def test_invalid_stream(self):
+        """Close the transport when the stream can't be framed."""
+        self.protocol.data_received(b'\x04\x00\x00\x04\x00\x00\x00\x00')
+        self.transport.close.assert_called_once_with()
+        self.assertRaises(UnpackException, self.loop.run_until_complete,
+                          self.protocol.receive())
+
+    def test_invalid_stream_after_message(self):
+        """Queue a framing error once, after the messages before it."""
+        self.protocol.data_received(EchoRequest(xid=1).pack() +
+                                    b'\x04\x00\x00\x04\x00\x00\x00\x00')
+        self.transport.close.assert_called_once_with()
+        self.assertEqual(len(self.protocol._received), 2)
+        message = self.loop.run_until_complete(self.protocol.receive())
+        self.assertEqual(message.header.xid, 1)
+        self.assertRaises(UnpackException, self.loop.run_until_complete,
+                          self.protocol.receive())
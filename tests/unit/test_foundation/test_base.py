@@ -1,7 +1,11 @@
 """Test Base module of python-openflow."""
 import unittest
+from unittest.mock import patch
 
 from pyof.foundation import base, basic_types
+from pyof.foundation.exceptions import PackException, UnpackException
+from pyof.v0x04.common.header import Type
+from pyof.v0x04.common.port import PortConfig
 
 
 class TestGenericStruct(unittest.TestCase):
@@ -62,6 +66,49 @@ class TestGenericStruct(unittest.TestCase):
         self.assertIsNot(message1.b.c.c1, message2.b.c.c1)
         self.assertIsNot(message1.b.c.c2, message2.b.c.c2)
 
+    @patch('pyof.foundation.base.deepcopy')
+    def test_init_without_deepcopy(self, mock_deepcopy):
+        """[Foundation/Base/GenericStruct] - Attributes are cloned."""
+        message = self.MyMessage()
+        mock_deepcopy.assert_not_called()
+        self.assertIsNot(message.b.c, self.MyMessage.b.c)
+        self.assertIsNot(message.b.c.c1, self.MyMessage.b.c.c1)
+        self.assertEqual(message.b.c.c2, 4)
+
+    def test_layout(self):
+        """[Foundation/Base/GenericStruct] - Cached attributes layout."""
+        layout = self.MyMessage._layout
+        self.assertEqual([(name, size) for name, _, size in layout],
+                         [('header', None), ('a', None), ('b', None),
+                          ('i', 4)])
+        self.assertIs(layout[3][1], self.MyMessage.i)
+        self.assertEqual(list(self.MyMessage.get_class_attributes()),
+                         [(name, obj) for name, obj, _ in layout])
+
+    def test_get_size(self):
+        """[Foundation/Base/GenericStruct] - Size from the layout."""
+        self.assertEqual(self.MyMessage().get_size(), 4 + 3 + 12 + 4)
+
+    def test_pack_header_length(self):
+        """[Foundation/Base/GenericMessage] - Length from the packed body."""
+        message = self.MyMessage()
+        message.header.xid = 4
+        with patch.object(self.MyMessage, 'get_size') as mock_get_size:
+            packed = message.pack()
+        mock_get_size.assert_not_called()
+        self.assertEqual(len(packed), 4 + 3 + 12 + 4)
+        self.assertEqual(message.header.length, len(packed))
+        self.assertEqual(packed[2], len(packed))
+
+    def test_pack_into_header_length(self):
+        """[Foundation/Base/GenericMessage] - Pack into a buffer."""
+        message = self.MyMessage()
+        message.header.xid = 4
+        buffer = bytearray(30)
+        end = message.pack_into(buffer, 3)
+        self.assertEqual(buffer[3:end], message.pack())
+        self.assertEqual(message.header.length, end - 3)
+
 
 class TestGenericType(unittest.TestCase):
     """Testing GenericType class."""
@@ -95,3 +142,263 @@ class TestGenericType(unittest.TestCase):
         self.assertEqual(1 ^ a, 0)
         self.assertEqual(b ^ 1, 3)
         self.assertEqual(1 ^ b, 3)
+
+    def test_enum_unpack(self):
+        """Unpacked values should be enum members, unknown ones an error."""
+        value = basic_types.UBInt8(enum_ref=Type)
+        value.unpack(b'\x02')
+        self.assertIs(value._value, Type.OFPT_ECHO_REQUEST)
+        self.assertEqual(value.value, 2)
+        self.assertTrue(value.is_enum())
+        self.assertFalse(value.is_bitmask())
+        self.assertRaises(UnpackException, value.unpack, b'\xfe')
+
+    def test_bitmask_value(self):
+        """The value of a bitmask should be its integer."""
+        value = basic_types.UBInt32(enum_ref=PortConfig)
+        value.unpack(b'\x00\x00\x00\x05')
+        self.assertTrue(value.is_bitmask())
+        self.assertFalse(value.is_enum())
+        self.assertEqual(value.value, 5)
+
+
+class TestGenericBitMask(unittest.TestCase):
+    """Testing GenericBitMask class."""
+
+    def test_names(self):
+        """Selected element names should be listed in definition order."""
+        config = PortConfig(PortConfig.OFPPC_NO_RECV |
+                            PortConfig.OFPPC_PORT_DOWN)
+        self.assertEqual(config.names, ['OFPPC_PORT_DOWN', 'OFPPC_NO_RECV'])
+        self.assertEqual(list(config), config.names)
+        self.assertEqual(PortConfig().names, [])
+
+    def test_contains(self):
+        """Elements should be tested by name or by value."""
+        config = PortConfig(PortConfig.OFPPC_NO_RECV)
+        self.assertIn('OFPPC_NO_RECV', config)
+        self.assertIn(PortConfig.OFPPC_NO_RECV, config)
+        self.assertNotIn('OFPPC_PORT_DOWN', config)
+
+    def test_contains_bitmask(self):
+        """A bitmask should be contained only if it is a non-empty subset."""
+        config = PortConfig(PortConfig.OFPPC_NO_RECV |
+                            PortConfig.OFPPC_PORT_DOWN)
+        self.assertIn(PortConfig(PortConfig.OFPPC_NO_RECV), config)
+        self.assertIn(config, config)
+        self.assertNotIn(PortConfig(1), PortConfig(4))
+        self.assertNotIn(PortConfig(5), PortConfig(4))
+        self.assertNotIn(PortConfig(0), config)
+        self.assertNotIn(PortConfig(), config)
+
+    def test_bool(self):
+        """Only bitmasks with selected elements should be true."""
+        self.assertFalse(PortConfig(0))
+        self.assertFalse(PortConfig())
+        self.assertTrue(PortConfig(PortConfig.OFPPC_NO_RECV))
+
+    def test_set_operations(self):
+        """Set operations should return bitmasks of the same class."""
+        config = PortConfig(PortConfig.OFPPC_NO_RECV)
+        union = config | 'OFPPC_PORT_DOWN'
+        self.assertIsInstance(union, PortConfig)
+        self.assertEqual(union, PortConfig(5))
+        self.assertEqual(union & config, config)
+        self.assertEqual(union - config, PortConfig.OFPPC_PORT_DOWN)
+        self.assertEqual(union ^ PortConfig(1), config)
+        self.assertNotEqual(config, union)
+
+    def test_unknown_element(self):
+        """Unknown element names should raise AttributeError."""
+        self.assertFalse(hasattr(PortConfig, 'OFPPC_UNKNOWN'))
+
+
+class TestStructCodec(unittest.TestCase):
+    """Testing the codec compiled by MetaStruct."""
+
+    def setUp(self):
+        """Basic Test Setup."""
+        class MyStruct(base.GenericStruct):
+            """Example class."""
+
+            a = basic_types.UBInt8(1)
+            pad = basic_types.Pad(1)
+            b = basic_types.UBInt16(2)
+            hw_addr = basic_types.HWAddress('00:11:22:33:44:55')
+            name = basic_types.Char('abc', length=4)
+            c = basic_types.UBInt32(3)
+
+        self.MyStruct = MyStruct
+        self.packed = (b'\x01\x00\x00\x02\x00\x11\x22\x33\x44\x55abc\x00'
+                       b'\x00\x00\x00\x03')
+
+    def test_fixed_runs(self):
+        """[Foundation/Base/StructCodec] - Merge fixed-size attributes."""
+        formats = [getattr(segment, 'struct', None)
+                   for segment in self.MyStruct._codec.segments]
+        self.assertEqual(formats[0].format, '!B1xH6s')
+        self.assertIsNone(formats[1])
+        self.assertEqual(formats[2].format, '!I')
+
+    def test_pack(self):
+        """[Foundation/Base/StructCodec] - Pack."""
+        self.assertEqual(self.MyStruct().pack(), self.packed)
+
+    def test_pack_into(self):
+        """[Foundation/Base/StructCodec] - Pack into a buffer."""
+        buffer = bytearray(b'\xff' * (len(self.packed) + 4))
+        end = self.MyStruct().pack_into(buffer, 2)
+        self.assertEqual(end, 2 + len(self.packed))
+        self.assertEqual(buffer, b'\xff\xff' + self.packed + b'\xff\xff')
+
+    def test_pack_into_small_buffer(self):
+        """[Foundation/Base/StructCodec] - Buffer too small to pack into."""
+        buffer = bytearray(len(self.packed) - 1)
+        self.assertRaises(PackException, self.MyStruct().pack_into, buffer)
+
+    def test_unpack(self):
+        """[Foundation/Base/StructCodec] - Unpack."""
+        unpacked = self.MyStruct()
+        unpacked.unpack(b'\x05\x00\x00\x06\x00\x00\x00\x00\x00\x01'
+                        b'xy\x00\x00\x00\x00\x00\x07')
+        self.assertEqual(unpacked.a, 5)
+        self.assertEqual(unpacked.b, 6)
+        self.assertEqual(unpacked.hw_addr.value, '00:00:00:00:00:01')
+        self.assertEqual(unpacked.name.value, 'xy')
+        self.assertEqual(unpacked.c, 7)
+
+    def test_default_converters(self):
+        """[Foundation/Base/StructCodec] - Merge a type with only a format."""
+        class Word(base.GenericType):
+            """Example type of two bytes."""
+
+            _fmt = '!2s'
+
+            def _codec_format(self):
+                """Return the word format."""
+                return '2s'
+
+        class WordStruct(base.GenericStruct):
+            """Example class."""
+
+            a = basic_types.UBInt8(1)
+            word = Word(b'ab')
+
+        self.assertEqual(WordStruct._codec.segments[0].struct.format, '!B2s')
+        self.assertEqual(WordStruct().pack(), b'\x01ab')
+        unpacked = WordStruct()
+        unpacked.unpack(b'\x02cd')
+        self.assertIsInstance(unpacked.word, Word)
+        self.assertEqual(unpacked.word.value, b'cd')
+
+    def test_pack_error_names_attribute(self):
+        """[Foundation/Base/StructCodec] - Pack error names the attribute."""
+        struct = self.MyStruct()
+        struct.b = 2 ** 16
+        with self.assertRaises(PackException) as context:
+            struct.pack()
+        self.assertIn('MyStruct.b', str(context.exception))
+
+    def test_unpack_error_names_attribute(self):
+        """[Foundation/Base/StructCodec] - Unpack error names the attribute."""
+        with self.assertRaises(UnpackException) as context:
+            self.MyStruct().unpack(b'\x05\x00\x00')
+        self.assertIn('MyStruct.b', str(context.exception))
+
+
+class TestTypeDispatchedStruct(unittest.TestCase):
+    """Testing the TypeDispatchedStruct class."""
+
+    def setUp(self):
+        """Define a family with two types and a list of it."""
+        class Root(base.TypeDispatchedStruct):
+            """Example family root."""
+
+            tlv_type = basic_types.UBInt16()
+            length = basic_types.UBInt16(4)
+
+        class Short(Root):
+            """Example class of types 1 and 2."""
+
+            value = basic_types.UBInt16()
+            pad = basic_types.Pad(2)
+            _allowed_types = (1, 2)
+
+        class Long(Root):
+            """Example class of type 3."""
+
+            value = basic_types.UBInt32()
+            _allowed_types = (3,)
+
+        class Other(Root):
+            """Example class that declares a type already declared."""
+
+            _allowed_types = (3,)
+
+        self.Root, self.Short, self.Long = Root, Short, Long
+        self.packed = (b'\x00\x01\x00\x08\x00\x05\x00\x00'
+                       b'\x00\x09\x00\x06\xff\xff'
+                       b'\x00\x03\x00\x08\x00\x00\x00\x07')
+
+    def test_registry(self):
+        """[Foundation/Base/TypeDispatched] - Register types in the family."""
+        self.assertIs(self.Long._tlv_root, self.Root)
+        self.assertEqual(self.Root._classes_by_type,
+                         {1: self.Short, 2: self.Short, 3: self.Long})
+
+    def test_class_of_type(self):
+        """[Foundation/Base/TypeDispatched] - Class of each type value."""
+        self.assertIs(self.Root.class_of_type(2), self.Short)
+        self.assertIs(self.Short.class_of_type(3), self.Long)
+        self.assertIs(self.Root.class_of_type(9), self.Root)
+
+    def test_iter_unpack(self):
+        """[Foundation/Base/TypeDispatched] - Unpack with the type classes."""
+        tlvs = list(self.Root.iter_unpack(self.packed))
+        self.assertEqual([type(tlv) for tlv in tlvs],
+                         [self.Short, self.Root, self.Long])
+        self.assertEqual([tlv.length for tlv in tlvs], [8, 6, 8])
+        self.assertEqual(tlvs[0].value, 5)
+        self.assertEqual(tlvs[2].value, 7)
+
+    def test_unpack(self):
+        """[Foundation/Base/TypeDispatched] - Change the class on unpack."""
+        tlv = self.Root()
+        tlv.unpack(self.packed, 14)
+        self.assertIsInstance(tlv, self.Long)
+        self.assertEqual(tlv.value, 7)
+
+    def test_unpack_override(self):
+        """[Foundation/Base/TypeDispatched] - Use the overridden unpack."""
+        class Custom(self.Root):
+            """Example class of type 4 with its own unpack."""
+
+            value = basic_types.UBInt16()
+            _allowed_types = (4,)
+
+            def unpack(self, buff, offset=0):
+                """Unpack the struct and double its value."""
+                super().unpack(buff, offset)
+                self.value = self.value.value * 2
+
+        packed = b'\x00\x04\x00\x06\x00\x05'
+        for tlv in self.Root(), Custom():
+            tlv.unpack(packed)
+            self.assertIsInstance(tlv, Custom)
+            self.assertEqual(tlv.value, 10)
+        tlv, = self.Root.iter_unpack(packed)
+        self.assertEqual(tlv.value, 10)
+
+    def test_fixed_type_list(self):
+        """[Foundation/Base/TypeDispatched] - Unpack a FixedTypeList."""
+        tlvs = basic_types.FixedTypeList(self.Root)
+        tlvs.unpack(self.packed)
+        self.assertEqual(len(tlvs), 3)
+        self.assertEqual(tlvs.pack(), self.packed[:12] + self.packed[14:])
+
+    def test_invalid_length(self):
+        """[Foundation/Base/TypeDispatched] - Length below the header size."""
+        self.assertRaises(UnpackException, list,
+                          self.Root.iter_unpack(b'\x00\x01\x00\x02'))
+        self.assertRaises(UnpackException, list,
+                          self.Root.iter_unpack(b'\x00\x01'))
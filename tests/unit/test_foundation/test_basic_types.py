@@ -36,6 +36,28 @@ class TestUBInt8(unittest.TestCase):
         self.assertEqual(255, int(self.ubint8))
 
 
+class TestSlottedTypes(unittest.TestCase):
+    """Test the compact representation of scalar types."""
+
+    def test_no_instance_dict(self):
+        """Scalar types store their state in slots only."""
+        for obj in (basic_types.UBInt8(1), basic_types.UBInt16(2),
+                    basic_types.UBInt32(3), basic_types.UBInt64(4),
+                    basic_types.Pad(4), basic_types.HWAddress(),
+                    basic_types.DPID('00:00:00:00:00:00:00:01'),
+                    basic_types.Char('a', length=2)):
+            with self.subTest(type=type(obj).__name__):
+                self.assertFalse(hasattr(obj, '__dict__'))
+
+    def test_clone(self):
+        """Clones keep the value, the enum and the extra slots."""
+        char = basic_types.Char('abc', length=8)._clone()
+        self.assertEqual(char.pack(), b'abc' + b'\x00' * 5)
+        self.assertEqual(basic_types.Pad(3)._clone().get_size(), 3)
+        ubint = basic_types.UBInt16(5, enum_ref=int)._clone()
+        self.assertEqual((ubint.value, ubint.enum_ref), (5, int))
+
+
 class TestUBInt16(unittest.TestCase):
     """Test of UBInt16 BasicType."""
 
@@ -134,6 +156,53 @@ class TestHWAddress(unittest.TestCase):
         unpacked.unpack(packed)
         self.assertEqual(mac, unpacked.value)
 
+    def test_other_representations(self):
+        """Testing HWAddress from bytes and integers."""
+        mac = '0a:d3:98:a5:30:47'
+        for address in b'\x0a\xd3\x98\xa5\x30\x47', 0x0ad398a53047:
+            with self.subTest(address=address):
+                hw_addr = basic_types.HWAddress(address)
+                self.assertEqual(hw_addr.value, mac)
+                self.assertEqual(hw_addr.pack(), bytes.fromhex('0ad398a53047'))
+
+    def test_compare_and_hash(self):
+        """Testing comparison and hashing without the text."""
+        hw_addr = basic_types.HWAddress('0A:D3:98:A5:30:47')
+        unpacked = basic_types.HWAddress()
+        unpacked.unpack(hw_addr.pack())
+        self.assertEqual(hw_addr, unpacked)
+        self.assertEqual(hash(hw_addr), hash(unpacked))
+        self.assertEqual(unpacked, '0a:d3:98:a5:30:47')
+        self.assertNotEqual(unpacked, basic_types.HWAddress())
+        self.assertIn(unpacked, {hw_addr: 1})
+        self.assertNotEqual(unpacked, hw_addr.pack())
+        self.assertTrue(basic_types.HWAddress('ff:ff:ff:ff:ff:ff')
+                        .is_broadcast())
+
+    def test_compare_text(self):
+        """Equal text should have the same hash as the address."""
+        hw_addr = basic_types.HWAddress('0A:D3:98:A5:30:47')
+        mac = '0a:d3:98:a5:30:47'
+        self.assertEqual(hw_addr, mac)
+        self.assertEqual(hash(hw_addr), hash(mac))
+        self.assertIn(mac, {hw_addr})
+        self.assertIn(hw_addr, {mac})
+        self.assertNotEqual(hw_addr, '0A:D3:98:A5:30:47')
+
+    def test_invalid_address(self):
+        """Testing pack of invalid addresses."""
+        for address in '0a:d3:98', 'gg:d3:98:a5:30:47', b'\x0a', 1 << 48:
+            with self.subTest(address=address):
+                hw_addr = basic_types.HWAddress(address)
+                self.assertRaises(PackException, hw_addr.pack)
+
+    def test_none(self):
+        """An address created with None should have None as value."""
+        hw_addr = basic_types.HWAddress(None)
+        self.assertIsNone(hw_addr.value)
+        self.assertEqual(str(hw_addr), 'None')
+        self.assertRaises(PackException, hw_addr.pack)
+
 
 class TestIPAddress(unittest.TestCase):
     """Test of IPAddress BasicType."""
@@ -175,6 +244,56 @@ class TestIPAddress(unittest.TestCase):
         ip_addr = basic_types.IPAddress('192.168.0.1/24')
         self.assertEqual(ip_addr.get_size(), 4)
 
+    def test_invalid_address(self):
+        """Packing an invalid address should raise PackException."""
+        for address in ('192.168.0', '192.168.0.256', 'host'):
+            with self.subTest(address=address):
+                ip_addr = basic_types.IPAddress(address)
+                self.assertRaises(PackException, ip_addr.pack)
+
+    def test_compare_unpacked(self):
+        """An unpacked address should compare with its text."""
+        unpacked = basic_types.IPAddress()
+        unpacked.unpack(b'\x0a\x00\x00\x01')
+        self.assertEqual(unpacked, '10.0.0.1')
+        self.assertFalse(unpacked != '10.0.0.1')
+        self.assertEqual(str(unpacked), '10.0.0.1')
+
+    def test_none(self):
+        """An address created with None should have None as value."""
+        ip_addr = basic_types.IPAddress(None)
+        self.assertIsNone(ip_addr.value)
+        self.assertEqual(ip_addr.netmask, 32)
+        self.assertEqual(str(ip_addr), 'None')
+        self.assertRaises(PackException, ip_addr.pack)
+
+
+class TestIPv6Address(unittest.TestCase):
+    """Test of IPv6Address BasicType."""
+
+    def test_unpack_packed(self):
+        """Test unpacking of packed IPv6Address."""
+        ip_addr = basic_types.IPv6Address('fe80::1/64')
+        self.assertEqual(ip_addr.value, 'fe80:0:0:0:0:0:0:1')
+        self.assertEqual(ip_addr.netmask, 64)
+        unpacked = basic_types.IPv6Address()
+        unpacked.unpack(ip_addr.pack())
+        self.assertEqual(unpacked.value,
+                         'fe80:0000:0000:0000:0000:0000:0000:0001')
+        self.assertEqual(unpacked.pack(), ip_addr.pack())
+
+    def test_pack_text(self):
+        """Texts with '::' should be packed as struct attribute values."""
+        ip_addr = basic_types.IPv6Address()
+        self.assertEqual(ip_addr.pack('::1'), b'\x00' * 15 + b'\x01')
+        self.assertRaises(PackException, ip_addr.pack, 'fe80::1::1')
+
+    def test_none(self):
+        """An address created with None should have None as value."""
+        ip_addr = basic_types.IPv6Address(None)
+        self.assertIsNone(ip_addr.value)
+        self.assertRaises(PackException, ip_addr.pack)
+
 
 class TestBinaryData(unittest.TestCase):
     """Test Binary data type."""
@@ -214,3 +333,21 @@ class TestBinaryData(unittest.TestCase):
         """Should raise ValueError if pack value is not bytes."""
         data = BinaryData('Some string')
         self.assertRaises(ValueError, data.pack, "can't be a string")
+
+    def test_unpack_bytes_view(self):
+        """Views over bytes should be unpacked as bytes."""
+        data = BinaryData()
+        data.unpack(memoryview(b'\x00forty two'), 1)
+        self.assertIsInstance(data.value, bytes)
+        self.assertEqual(b'forty two', data.value)
+
+    def test_unpack_mutable_buffer_view(self):
+        """Views over a mutable buffer should be kept without copying."""
+        buff = bytearray(b'\x00forty two')
+        data = BinaryData()
+        data.unpack(memoryview(buff), 1)
+        self.assertIsInstance(data.value, memoryview)
+        self.assertEqual(9, data.get_size())
+        self.assertEqual(b'forty two', data.pack())
+        buff[1:6] = b'FORTY'
+        self.assertEqual(b'FORTY two', data.pack())
@@ -0,0 +1,52 @@
+"""Tests for the MessageTable of each OpenFlow version."""
+import unittest
+
+from pyof.foundation.exceptions import UnpackException
+from pyof.foundation.message_table import MessageTable
+from pyof.v0x01.common import utils as utils_v0x01
+from pyof.v0x01.common.header import Type as TypeV0x01
+from pyof.v0x04.common import utils as utils_v0x04
+from pyof.v0x04.common.header import Type
+from pyof.v0x04.symmetric.echo_request import EchoRequest
+
+
+class TestMessageTable(unittest.TestCase):
+    """Test the message classes and functions of a version table."""
+
+    def setUp(self):
+        """Build a table with one message class."""
+        self.table = MessageTable(Type, {str(Type.OFPT_ECHO_REQUEST):
+                                         EchoRequest})
+        self.packed = EchoRequest(xid=3, data=b'abc').pack()
+
+    def test_classes(self):
+        """Classes should be indexed by the integer message type."""
+        self.assertEqual(len(self.table.classes), max(Type).value + 1)
+        self.assertIs(self.table.classes[2], EchoRequest)
+        self.assertIsNone(self.table.classes[0])
+
+    def test_unpack_message(self):
+        """Messages should be unpacked with or without a peeked header."""
+        header = self.table.peek_header(self.packed)
+        self.assertIs(header.message_type, Type.OFPT_ECHO_REQUEST)
+        for message in (self.table.unpack_message(self.packed),
+                        self.table.unpack_message(self.packed,
+                                                  header=header)):
+            self.assertIsInstance(message, EchoRequest)
+            self.assertEqual(message.header.xid, 3)
+            self.assertEqual(message.data, b'abc')
+
+    def test_unknown_type(self):
+        """Types without a class should raise UnpackException."""
+        packed = b'\x04\x00\x00\x08\x00\x00\x00\x01'
+        self.assertRaises(UnpackException, self.table.unpack_message, packed)
+        self.assertRaises(UnpackException, self.table.peek_header,
+                          b'\x04\xff\x00\x08\x00\x00\x00\x01')
+
+    def test_versions(self):
+        """Each version should export the functions of its own table."""
+        for utils, type_enum in ((utils_v0x01, TypeV0x01),
+                                 (utils_v0x04, Type)):
+            self.assertIs(utils.peek_header.__self__.type_enum, type_enum)
+            self.assertIs(utils.unpack_message.__self__.classes,
+                          utils.MESSAGE_CLASSES)
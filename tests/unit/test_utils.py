@@ -1,9 +1,22 @@
 """Automate utils tests."""
 import unittest
+from copy import deepcopy
 
-from pyof.utils import UnpackException, unpack, validate_packet
+from pyof.utils import (
+    MessageBatch, MessageFramer, RawMessage, UnpackException, iter_unpack,
+    peek_header, unpack, unpack_all, validate_packet)
+from pyof.v0x01.common.header import Type as Type_v0x01
 from pyof.v0x01.symmetric.hello import Hello as Hello_v0x01
+from pyof.v0x04.asynchronous.packet_in import PacketIn as PacketIn_v0x04
+from pyof.v0x04.common.header import Type as Type_v0x04
+from pyof.v0x04.common.utils import (
+    MESSAGE_CLASSES, new_message_from_message_type, unpack_message)
+from pyof.v0x04.controller2switch.barrier_request import BarrierRequest
+from pyof.v0x04.controller2switch.flow_mod import FlowMod
+from pyof.v0x04.controller2switch.multipart_reply import (
+    MultipartReply as MultipartReply_v0x04)
 from pyof.v0x04.symmetric.hello import Hello as Hello_v0x04
+from tests.unit.raw_dump import RawDump
 
 
 class TestUtils(unittest.TestCase):
@@ -37,3 +50,370 @@ class TestUtils(unittest.TestCase):
 
         hello.header.version = 0
         self.assertRaises(UnpackException, validate_packet, hello.pack())
+
+    def test_peek_header(self):
+        """Test reading the header fields of both versions."""
+        data = Hello_v0x01(xid=1).pack() + Hello_v0x04(xid=2).pack()
+        self.assertEqual(peek_header(data),
+                         (1, Type_v0x01.OFPT_HELLO, 8, 1))
+        header = peek_header(data, 8)
+        self.assertIs(header.message_type, Type_v0x04.OFPT_HELLO)
+        self.assertEqual((header.version, header.xid), (4, 2))
+
+    def test_peek_invalid_header(self):
+        """Test peeking headers with invalid values."""
+        invalid = b'', b'\x04\x00', b'\x02' + bytes(7), b'\x04\xff' + bytes(6)
+        for data in invalid:
+            with self.subTest(data=data):
+                self.assertRaises(UnpackException, peek_header, data)
+
+    def test_pack_into(self):
+        """Messages packed back to back should match their pack output."""
+        messages = [unpack(RawDump('v0x04', name).read())
+                    for name in ('ofpt_packet_in', 'ofpt_port_desc',
+                                 'ofpt_flow_mod')]
+        buffer = bytearray(sum(message.get_size() for message in messages))
+        offset = 0
+        for message in messages:
+            offset = message.pack_into(buffer, offset)
+        self.assertEqual(offset, len(buffer))
+        self.assertEqual(buffer, b''.join(message.pack()
+                                          for message in messages))
+
+    def test_message_classes(self):
+        """Test the message class table indexed by message type."""
+        self.assertIs(MESSAGE_CLASSES[Type_v0x04.OFPT_PACKET_IN],
+                      PacketIn_v0x04)
+        for message_type in (Type_v0x04.OFPT_HELLO, 0,
+                             str(Type_v0x04.OFPT_HELLO)):
+            with self.subTest(message_type=message_type):
+                message = new_message_from_message_type(message_type)
+                self.assertIsInstance(message, Hello_v0x04)
+        for message_type in 30, -1, 'Type.OFPT_UNKNOWN':
+            with self.subTest(message_type=message_type):
+                self.assertRaises(ValueError, new_message_from_message_type,
+                                  message_type)
+
+    def test_unpack_message_unknown_type(self):
+        """Test unpacking messages without a class for their type."""
+        for data in b'\x04\x1e\x00\x08' + bytes(4), b'\x04\x00':
+            with self.subTest(data=data):
+                self.assertRaises(UnpackException, unpack_message, data)
+
+    def test_unpack_message_peeked_header(self):
+        """Test unpacking a message whose header was already read."""
+        data = Hello_v0x04(xid=3).pack()
+        message = unpack_message(data, header=peek_header(data))
+        self.assertEqual(message.header.xid, 3)
+        self.assertEqual(message.header.message_type,
+                         Type_v0x04.OFPT_HELLO)
+        self.assertEqual(message.pack(), data)
+
+    def test_unpack_buffer_types(self):
+        """Test unpacking from bytearray and memoryview buffers."""
+        data = Hello_v0x04(xid=3).pack()
+        for buffer in bytearray(data), memoryview(data):
+            with self.subTest(buffer_type=type(buffer)):
+                self.assertEqual(unpack(buffer).pack(), data)
+
+    def test_unpack_filtered_type(self):
+        """Test that filtered out messages are not decoded."""
+        data = Hello_v0x04(xid=3).pack()
+        raw = unpack(data, exclude=['OFPT_HELLO'])
+        self.assertIsInstance(raw, RawMessage)
+        self.assertEqual(raw.header.xid, 3)
+        self.assertEqual(raw.pack(), data)
+        self.assertIsInstance(unpack(data, types=[Type_v0x04.OFPT_HELLO]),
+                              Hello_v0x04)
+        self.assertIsInstance(unpack(data, types=[Type_v0x01.OFPT_HELLO]),
+                              RawMessage)
+
+    def test_unpack_keeps_view_on_data(self):
+        """Test that PacketIn data is a view into a mutable buffer."""
+        packet_in = PacketIn_v0x04(xid=1, buffer_id=1, total_len=3,
+                                   reason=0, table_id=0, cookie=0,
+                                   data=b'abc')
+        buffer = bytearray(packet_in.pack())
+        unpacked = unpack(buffer)
+        self.assertIsInstance(unpacked.data.value, memoryview)
+        self.assertEqual(unpacked.data.value, b'abc')
+        self.assertIsInstance(unpack(bytes(buffer)).data.value, bytes)
+
+
+class TestLazyUnpack(unittest.TestCase):
+    """Test unpacking messages with lazy attribute decoding."""
+
+    def setUp(self):
+        """Read a PacketIn v0x04 raw dump."""
+        self.data = RawDump('v0x04', 'ofpt_packet_in').read()
+        self.expected = unpack(self.data)
+
+    def test_untouched_pack(self):
+        """Packing an untouched message should return the original bytes."""
+        message = unpack(self.data, lazy=True)
+        self.assertIsInstance(message, PacketIn_v0x04)
+        self.assertEqual(type(message).__name__, 'PacketIn')
+        self.assertEqual(message.header.xid, self.expected.header.xid)
+        self.assertEqual(message.get_size(), len(self.data))
+        self.assertEqual(message.pack(), self.data)
+        self.assertNotIn('match', message.__dict__)
+
+    def test_decode_on_access(self):
+        """Attributes should be decoded only up to the accessed one."""
+        message = unpack(self.data, lazy=True)
+        self.assertEqual(message.cookie, self.expected.cookie)
+        self.assertNotIn('match', message.__dict__)
+        self.assertEqual(message.data, self.expected.data)
+        self.assertEqual(message.match, self.expected.match)
+        self.assertEqual(message, self.expected)
+
+    def test_assignment(self):
+        """Assigned attributes should be kept and packed."""
+        message = unpack(self.data, lazy=True)
+        message.buffer_id = 42
+        self.expected.buffer_id = 42
+        self.assertEqual(message.buffer_id, 42)
+        self.assertEqual(message.pack(), self.expected.pack())
+
+    def test_mutable_buffer_is_copied(self):
+        """Reusing a mutable receive buffer should not affect the message."""
+        buffer = bytearray(self.data)
+        message = unpack(buffer, lazy=True)
+        buffer[8:] = bytes(len(buffer) - 8)
+        self.assertEqual(message.pack(), self.data)
+        self.assertEqual(message.match, self.expected.match)
+
+    def test_deepcopy(self):
+        """A copy of a lazy message should be a regular, decoded message."""
+        copy = deepcopy(unpack(self.data, lazy=True))
+        self.assertIs(type(copy), PacketIn_v0x04)
+        self.assertEqual(copy.pack(), self.data)
+
+    def test_overridden_unpack(self):
+        """Messages with their own unpack method are decoded at once."""
+        data = RawDump('v0x04', 'ofpt_port_desc').read()
+        message = unpack(data, lazy=True)
+        self.assertIsInstance(message, MultipartReply_v0x04)
+        self.assertEqual(message.pack(), data)
+        self.assertEqual(message.body, unpack(data).body)
+
+
+class TestInternedUnpack(unittest.TestCase):
+    """Test unpacking messages that share equal scalar values."""
+
+    def setUp(self):
+        """Read a PortDesc v0x04 raw dump."""
+        self.data = RawDump('v0x04', 'ofpt_port_desc').read()
+
+    def test_shared_values(self):
+        """Equal values of different messages should be the same object."""
+        first = unpack(self.data, intern=True)
+        second = unpack(self.data, intern=True)
+        self.assertEqual(first.pack(), self.data)
+        self.assertEqual(first, unpack(self.data))
+        self.assertIs(first.header.version, second.header.version)
+        self.assertIs(first.body[0].hw_addr, second.body[0].hw_addr)
+        self.assertIs(first.body[0].config, second.body[0].config)
+
+    def test_copy_on_write(self):
+        """Shared values are read-only and struct assignment detaches them."""
+        first = unpack(self.data, intern=True)
+        second = unpack(self.data, intern=True)
+        port_no = second.body[0].port_no.value
+        with self.assertRaises(AttributeError):
+            first.body[0].port_no.unpack(b'\x00\x00\x00\x07')
+        first.body[0].port_no = 7
+        self.assertEqual(second.body[0].port_no, port_no)
+        copy = deepcopy(second)
+        copy.body[0].port_no.unpack(b'\x00\x00\x00\x07')
+        self.assertEqual(copy.body[0].port_no, 7)
+        self.assertEqual(second.pack(), self.data)
+
+    def test_lazy(self):
+        """Lazy messages can't be interned."""
+        self.assertRaises(ValueError, unpack, self.data, lazy=True,
+                          intern=True)
+
+
+class TestBulkUnpack(unittest.TestCase):
+    """Test unpacking concatenated messages."""
+
+    def setUp(self):
+        """Create a buffer with v0x04 and v0x01 messages."""
+        self.messages = [RawDump('v0x04', 'ofpt_packet_in').read(),
+                         RawDump('v0x01', 'ofpt_hello').read(),
+                         RawDump('v0x04', 'ofpt_port_desc').read()]
+        self.buffer = b''.join(self.messages)
+
+    def test_unpack_all(self):
+        """All messages should be unpacked, in order."""
+        messages = unpack_all(bytearray(self.buffer))
+        self.assertEqual([message.pack() for message in messages],
+                         self.messages)
+
+    def test_types(self):
+        """Only messages of the selected types should be unpacked."""
+        messages = list(iter_unpack(self.buffer,
+                                    types=[Type_v0x04.OFPT_HELLO,
+                                           'OFPT_PACKET_IN']))
+        self.assertEqual(len(messages), 1)
+        self.assertIsInstance(messages[0], PacketIn_v0x04)
+        messages = unpack_all(self.buffer, types=[Type_v0x01.OFPT_HELLO])
+        self.assertIsInstance(messages[0], Hello_v0x01)
+        self.assertEqual(len(messages), 1)
+
+    def test_exclude(self):
+        """Messages of the excluded types should be skipped."""
+        messages = unpack_all(self.buffer, exclude=['OFPT_PACKET_IN'])
+        self.assertEqual([message.pack() for message in messages],
+                         self.messages[1:])
+        messages = unpack_all(self.buffer, types=('OFPT_PACKET_IN',
+                                                  'OFPT_HELLO'),
+                              exclude=(Type_v0x01.OFPT_HELLO,))
+        self.assertEqual(len(messages), 1)
+        self.assertIsInstance(messages[0], PacketIn_v0x04)
+
+    def test_raw(self):
+        """Filtered out messages should be yielded undecoded if raw."""
+        messages = unpack_all(self.buffer, types=['OFPT_HELLO'], raw=True)
+        self.assertIsInstance(messages[0], RawMessage)
+        self.assertIsInstance(messages[1], Hello_v0x01)
+        self.assertIsInstance(messages[2], RawMessage)
+        header = messages[0].header
+        self.assertEqual(header.message_type, Type_v0x04.OFPT_PACKET_IN)
+        self.assertEqual(header.length, len(self.messages[0]))
+        self.assertEqual(bytes(messages[0].body), self.messages[0][8:])
+        self.assertEqual([message.pack() for message in messages],
+                         self.messages)
+
+    def test_truncated(self):
+        """A truncated message should raise UnpackException."""
+        self.assertRaises(UnpackException, unpack_all, self.buffer[:-1])
+        self.assertRaises(UnpackException, unpack_all, self.buffer + b'\x04')
+
+
+class TestMessageFramer(unittest.TestCase):
+    """Test framing messages from a byte stream."""
+
+    def setUp(self):
+        """Create a stream with v0x04 and v0x01 messages."""
+        self.messages = [RawDump('v0x04', 'ofpt_packet_in').read(),
+                         RawDump('v0x01', 'ofpt_hello').read(),
+                         RawDump('v0x04', 'ofpt_port_desc').read()]
+        self.stream = b''.join(self.messages)
+
+    def test_single_chunk(self):
+        """All messages in a chunk should be unpacked."""
+        framer = MessageFramer()
+        packed = [message.pack() for message in framer.feed(self.stream)]
+        self.assertEqual(packed, self.messages)
+        self.assertEqual(len(framer), 0)
+
+    def test_byte_by_byte(self):
+        """Messages should be unpacked as soon as they are complete."""
+        framer = MessageFramer()
+        packed = []
+        for index in range(len(self.stream)):
+            packed.extend(message.pack() for message in
+                          framer.feed(self.stream[index:index+1]))
+        self.assertEqual(packed, self.messages)
+        self.assertEqual(len(framer), 0)
+
+    def test_partial_message(self):
+        """Incomplete messages should stay buffered."""
+        framer = MessageFramer()
+        messages = list(framer.feed(self.stream[:-1]))
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(len(framer), len(self.messages[2]) - 1)
+        messages = list(framer.feed(self.stream[-1:]))
+        self.assertEqual([message.pack() for message in messages],
+                         self.messages[2:])
+
+    def test_lazy(self):
+        """Lazy framers should unpack messages lazily."""
+        framer = MessageFramer(lazy=True)
+        message = next(framer.feed(self.stream))
+        self.assertNotIn('match', message.__dict__)
+        self.assertEqual(message.pack(), self.messages[0])
+
+    def test_types(self):
+        """Filtered out messages should be framed as RawMessage."""
+        framer = MessageFramer(exclude=[Type_v0x04.OFPT_MULTIPART_REPLY])
+        messages = list(framer.feed(self.stream))
+        self.assertIsInstance(messages[0], PacketIn_v0x04)
+        self.assertIsInstance(messages[1], Hello_v0x01)
+        self.assertIsInstance(messages[2], RawMessage)
+        self.assertEqual(messages[2].pack(), self.messages[2])
+
+    def test_views_into_stream(self):
+        """Messages should be views of the stream, not copies of it."""
+        framer = MessageFramer()
+        packet_in = next(framer.feed(self.messages[0] + self.messages[1]))
+        data = bytes(packet_in.data.value)
+        self.assertIsInstance(packet_in.data.value, memoryview)
+        messages = list(framer.feed(self.messages[2]))
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(packet_in.data.value, data)
+        self.assertEqual(packet_in.pack(), self.messages[0])
+
+    def test_invalid_length(self):
+        """A header with a length smaller than itself can't be framed."""
+        framer = MessageFramer()
+        self.assertRaises(UnpackException, list,
+                          framer.feed(b'\x04\x00\x00\x04\x00\x00\x00\x00'))
+
+
+class TestMessageBatch(unittest.TestCase):
+    """Test packing many messages into one buffer."""
+
+    def test_pack(self):
+        """Messages should be packed back to back with sequential xids."""
+        batch = MessageBatch(first_xid=2 ** 32 - 1)
+        xids = [batch.add(FlowMod(xid=0, command=0, priority=priority))
+                for priority in range(3)]
+        self.assertEqual(xids, [2 ** 32 - 1, 0, 1])
+        buffer, offsets = batch.pack(barrier=True)
+        messages = list(MessageFramer().feed(buffer))
+        self.assertEqual(len(batch), 4)
+        self.assertIsInstance(messages[-1], BarrierRequest)
+        for message in messages:
+            xid = message.header.xid.value
+            self.assertEqual(peek_header(buffer, offsets[xid]).xid, xid)
+        self.assertEqual([message.priority for message in messages[:3]],
+                         [0, 1, 2])
+
+    def test_pack_copies(self):
+        """The packed batch should not share state with the batch."""
+        batch = MessageBatch(first_xid=1)
+        batch.add(Hello_v0x04())
+        buffer, offsets = batch.pack()
+        self.assertIsInstance(buffer, bytes)
+        offsets.clear()
+        self.assertEqual(batch.pack()[1], {1: 0})
+
+    def test_single_barrier(self):
+        """Packing twice with a barrier should append a single one."""
+        batch = MessageBatch(first_xid=1)
+        batch.add(Hello_v0x04())
+        first = batch.pack(barrier=True)
+        self.assertEqual(batch.pack(barrier=True), first)
+        self.assertEqual(len(batch), 2)
+        batch.add(Hello_v0x04())
+        batch.pack(barrier=True)
+        self.assertEqual(len(batch), 4)
+
+    def test_add_new(self):
+        """Messages created by the batch should get the next xid."""
+        batch = MessageBatch(first_xid=7)
+        message = batch.add_new(FlowMod, command=0, priority=5)
+        self.assertEqual(message.header.xid, 7)
+        buffer, offsets = batch.pack()
+        self.assertEqual(offsets, {7: 0})
+        self.assertEqual(buffer, message.pack())
+
+    def test_single_version(self):
+        """Messages of another version should be refused."""
+        batch = MessageBatch()
+        batch.add(Hello_v0x04())
+        self.assertRaises(ValueError, batch.add, Hello_v0x01())
+        self.assertRaises(ValueError, MessageBatch().pack, barrier=True)
@@ -1,7 +1,11 @@
 """Testing Port structures."""
+from unittest import TestCase
+
+from pyof.foundation.exceptions import UnpackException
 from pyof.v0x01.common.action import (
-    ActionDLAddr, ActionEnqueue, ActionNWAddr, ActionNWTos, ActionOutput,
-    ActionTPPort, ActionType, ActionVendorHeader, ActionVlanPCP, ActionVlanVid)
+    ActionDLAddr, ActionEnqueue, ActionHeader, ActionNWAddr, ActionNWTos,
+    ActionOutput, ActionStripVlan, ActionTPPort, ActionType,
+    ActionVendorHeader, ActionVlanPCP, ActionVlanVid, ListOfActions)
 from pyof.v0x01.common.phy_port import Port
 from tests.unit.test_struct import TestStruct
 
@@ -122,3 +126,36 @@ class TestActionVendorHeader(TestStruct):
         super().set_raw_dump_file('v0x01', 'ofpt_action_vendor_header')
         super().set_raw_dump_object(ActionVendorHeader, length=16, vendor=1)
         super().set_minimum_size(8)
+
+
+class TestActionDispatch(TestCase):
+    """Test unpacking actions with the class of their type."""
+
+    def setUp(self):
+        """Pack actions of several types."""
+        self.actions = [ActionOutput(port=1),
+                        ActionTPPort(ActionType.OFPAT_SET_TP_DST, 80),
+                        ActionStripVlan(),
+                        ActionVendorHeader(length=8, vendor=2)]
+        self.packed = ListOfActions(self.actions).pack()
+
+    def test_list(self):
+        """Each action of a list should have the class of its type."""
+        actions = ListOfActions()
+        actions.unpack(self.packed)
+        self.assertEqual([type(action) for action in actions],
+                         [type(action) for action in self.actions])
+        self.assertEqual(actions.pack(), self.packed)
+
+    def test_header(self):
+        """ActionHeader.unpack should change the class of the action."""
+        action = ActionHeader()
+        action.unpack(self.packed, 8)
+        self.assertIsInstance(action, ActionTPPort)
+        self.assertEqual(action.tp_port, 80)
+
+    def test_invalid_length(self):
+        """A length smaller than the header should raise UnpackException."""
+        actions = ListOfActions()
+        self.assertRaises(UnpackException, actions.unpack,
+                          b'\x00\x00\x00\x00')
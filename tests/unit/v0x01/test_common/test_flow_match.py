@@ -43,3 +43,49 @@ class TestMatch(unittest.TestCase):
     def test_unpack(self):
         """[Common/FlowMatch] - unpacking."""
         pass
+
+
+class TestMatchKey(unittest.TestCase):
+    """Test the canonical key of Match."""
+
+    def test_unpacked(self):
+        """Unpacked matches should be equal to the original one."""
+        match = flow_match.Match(in_port=1, dl_type=0x800,
+                                 nw_src='10.0.0.0/8')
+        unpacked = flow_match.Match()
+        unpacked.unpack(match.pack())
+        self.assertEqual(unpacked.match_key(), match.match_key())
+        self.assertEqual(hash(unpacked), hash(match))
+        self.assertEqual(len({match, unpacked}), 1)
+
+    def test_wildcarded_values(self):
+        """Values of wildcarded fields should be ignored."""
+        match = flow_match.Match(dl_type=0x800, nw_src='10.1.2.3/8')
+        other = flow_match.Match(dl_type=0x800, nw_src='10.0.0.0/8')
+        self.assertEqual(match, other)
+        key = match.match_key()
+        self.assertEqual(key[0], None)
+        self.assertEqual(key[5], 0x800)
+        self.assertEqual(key[8], (0x0a000000, 8))
+        self.assertIsNone(key[9])
+        other.wildcards = int(other.wildcards) | \
+            flow_match.FlowWildCards.OFPFW_DL_TYPE
+        self.assertNotEqual(match, other)
+
+    def test_assignment(self):
+        """Assigning an attribute should change the key."""
+        match = flow_match.Match(in_port=1)
+        key = match.match_key()
+        match.in_port = 2
+        self.assertNotEqual(match.match_key(), key)
+        self.assertEqual(match.match_key()[0], 2)
+
+    def test_in_place(self):
+        """Changing an attribute in place should change the key."""
+        match = flow_match.Match(in_port=1)
+        unpacked = flow_match.Match()
+        unpacked.unpack(match.pack())
+        unpacked.in_port.unpack(b'\x00\x03')
+        self.assertEqual(unpacked.match_key()[0], 3)
+        self.assertNotEqual(unpacked, match)
+        self.assertNotEqual(hash(unpacked), hash(match))
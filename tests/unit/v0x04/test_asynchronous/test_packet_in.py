@@ -22,6 +22,10 @@ class TestPacketInRaw(TestStruct):
                                     match=_new_match(), data=_get_data())
         super().set_minimum_size(34)
 
+    def test_in_port(self):
+        """The in_port should be decoded from the match."""
+        self.assertEqual(self.get_raw_object().in_port, 2)
+
     def test_valid_physical_in_port(self):
         """Physical port limits from 1.3.0 spec."""
         try:
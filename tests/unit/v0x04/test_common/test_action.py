@@ -0,0 +1,51 @@
+"""Testing action structures."""
+from unittest import TestCase
+
+from pyof.foundation.exceptions import UnpackException
+from pyof.v0x04.common.action import (
+    ActionGroup, ActionHeader, ActionOutput, ActionPopVLAN, ActionPush,
+    ActionSetField, ActionType, ListOfActions)
+from pyof.v0x04.common.flow_match import OxmOfbMatchField, OxmTLV
+
+
+class TestActionDispatch(TestCase):
+    """Test unpacking actions with the class of their type."""
+
+    def setUp(self):
+        """Pack actions of several types and sizes."""
+        field = OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_VLAN_VID, 42)
+        self.actions = [ActionOutput(port=1),
+                        ActionSetField(field=field),
+                        ActionPush(ActionType.OFPAT_PUSH_MPLS, 0x8847),
+                        ActionPopVLAN(),
+                        ActionGroup(group_id=3)]
+        self.packed = ListOfActions(self.actions).pack()
+
+    def test_list(self):
+        """Each action of a list should have the class of its type."""
+        actions = ListOfActions()
+        actions.unpack(self.packed)
+        self.assertEqual([type(action) for action in actions],
+                         [type(action) for action in self.actions])
+        self.assertEqual(actions[1].field.typed_value, 42)
+        self.assertEqual(actions.pack(), self.packed)
+
+    def test_header(self):
+        """ActionHeader.unpack should change the class of the action."""
+        action = ActionHeader()
+        action.unpack(self.packed, 16)
+        self.assertIsInstance(action, ActionSetField)
+        self.assertEqual(action.pack(), self.actions[1].pack())
+
+    def test_unknown_type(self):
+        """Actions of unknown types should raise UnpackException."""
+        actions = ListOfActions()
+        self.assertRaises(UnpackException, actions.unpack,
+                          b'\x00\x63\x00\x08' + bytes(4))
+
+    def test_invalid_length(self):
+        """A length smaller than the header should raise UnpackException."""
+        actions = ListOfActions()
+        self.assertRaises(UnpackException, actions.unpack,
+                          b'\x00\x00\x00\x00')
+        self.assertRaises(UnpackException, actions.unpack, b'\x00')
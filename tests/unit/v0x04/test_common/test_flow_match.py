@@ -1,9 +1,12 @@
 """Test OXM-related implementations."""
+from copy import deepcopy
 from unittest import TestCase
 
+from pyof.foundation.basic_types import HWAddress, IPAddress, IPv6Address
 from pyof.foundation.exceptions import PackException, UnpackException
 from pyof.v0x04.common.flow_match import (
-    Match, MatchType, OxmClass, OxmOfbMatchField, OxmTLV)
+    OXM_CODECS, Match, MatchType, OxmClass, OxmMatchFields, OxmOfbMatchField,
+    OxmTLV)
 
 
 class TestMatch(TestCase):
@@ -34,6 +37,86 @@ class TestMatch(TestCase):
         self.assertEqual(expected, valued_pack)
 
 
+class TestMatchFieldAccess(TestCase):
+    """Test the indexed field access of Match."""
+
+    def setUp(self):
+        """Create a match with several OpenFlow basic fields."""
+        self.match = Match(oxm_match_fields=[
+            _tlv(OxmOfbMatchField.OFPXMT_OFB_IN_PORT, b'\x00\x00\x00\x02'),
+            _tlv(OxmOfbMatchField.OFPXMT_OFB_ETH_SRC, b'\x0a' * 6),
+            _tlv(OxmOfbMatchField.OFPXMT_OFB_IPV4_DST,
+                 b'\x0a\x00\x00\x01\xff\xff\xff\x00', hasmask=True),
+            _tlv(OxmOfbMatchField.OFPXMT_OFB_IPV6_SRC, bytes(15) + b'\x01')])
+
+    def test_get_value(self):
+        """Values should be decoded to ints and addresses."""
+        get_value = self.match.get_value
+        self.assertEqual(get_value(OxmOfbMatchField.OFPXMT_OFB_IN_PORT), 2)
+        self.assertEqual(get_value(OxmOfbMatchField.OFPXMT_OFB_ETH_SRC),
+                         HWAddress('0a:0a:0a:0a:0a:0a'))
+        address = get_value(OxmOfbMatchField.OFPXMT_OFB_IPV4_DST)
+        self.assertIsInstance(address, IPAddress)
+        self.assertEqual(str(address), '10.0.0.1')
+        address = get_value(OxmOfbMatchField.OFPXMT_OFB_IPV6_SRC)
+        self.assertIsInstance(address, IPv6Address)
+        self.assertEqual(address, IPv6Address('::1'))
+        self.assertIsNone(get_value(OxmOfbMatchField.OFPXMT_OFB_ETH_TYPE))
+
+    def test_get_field(self):
+        """The raw value of the first TLV of the field should be returned."""
+        fields = self.match.oxm_match_fields
+        fields.append(_tlv(OxmOfbMatchField.OFPXMT_OFB_IN_PORT, bytes(4)))
+        self.assertEqual(
+            self.match.get_field(OxmOfbMatchField.OFPXMT_OFB_IN_PORT),
+            b'\x00\x00\x00\x02')
+        self.assertIs(self.match.get_tlv(5), None)
+
+    def test_index_invalidation(self):
+        """Changing the list should drop the index."""
+        field = OxmOfbMatchField.OFPXMT_OFB_IN_PORT
+        fields = self.match.oxm_match_fields
+        self.assertIs(self.match.get_tlv(field), fields[0])
+        fields[0] = _tlv(field, b'\x00\x00\x00\x03')
+        self.assertEqual(self.match.get_value(field), 3)
+        del fields[0]
+        self.assertIsNone(self.match.get_tlv(field))
+        fields.insert(0, _tlv(field, b'\x00\x00\x00\x04'))
+        self.assertEqual(self.match.get_value(field), 4)
+        fields.clear()
+        self.assertIsNone(self.match.get_tlv(field))
+
+    def test_read_only_lookup(self):
+        """Looking up fields should leave the TLVs untouched."""
+        fields = self.match.oxm_match_fields
+        attributes = [dict(tlv.__dict__) for tlv in fields]
+        self.match.get_value(OxmOfbMatchField.OFPXMT_OFB_IN_PORT)
+        self.match.match_key()
+        for tlv, tlv_attributes in zip(fields, attributes):
+            self.assertIs(type(tlv), OxmTLV)
+            self.assertEqual(tlv.__dict__, tlv_attributes)
+
+    def test_unpacked_and_copied(self):
+        """Unpacked and copied matches should keep an indexed list."""
+        unpacked = Match()
+        unpacked.unpack(self.match.pack())
+        for match in unpacked, deepcopy(self.match):
+            self.assertIsInstance(match.oxm_match_fields, OxmMatchFields)
+            self.assertEqual(
+                match.get_value(OxmOfbMatchField.OFPXMT_OFB_IN_PORT), 2)
+
+    def test_plain_list(self):
+        """A plain list assigned to the match should be searched."""
+        self.match.oxm_match_fields = list(self.match.oxm_match_fields)
+        self.assertEqual(
+            self.match.get_value(OxmOfbMatchField.OFPXMT_OFB_IN_PORT), 2)
+
+
+def _tlv(field, value, hasmask=False):
+    """Return an OpenFlow basic TLV."""
+    return OxmTLV(oxm_field=field, oxm_hasmask=hasmask, oxm_value=value)
+
+
 class TestOxmTLV(TestCase):
     """Test OXM TLV pack and unpack."""
 
@@ -113,3 +196,138 @@ class TestOxmTLV(TestCase):
         unpacked = OxmTLV()
         unpacked.unpack(self.tlv.pack())
         self.assertEqual(self.tlv, unpacked)
+
+
+class TestMatchKey(TestCase):
+    """Test the canonical key of Match."""
+
+    def setUp(self):
+        """Create a match with a masked field."""
+        self.fields = [
+            OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_METADATA, 1),
+            OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_ETH_TYPE, 0x800),
+            OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_IPV4_DST,
+                              '10.1.2.3', '255.0.0.0')]
+        self.match = Match(oxm_match_fields=self.fields)
+
+    def test_order_and_masks(self):
+        """The field order and bits outside the masks should not matter."""
+        other = Match(oxm_match_fields=[
+            OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_IPV4_DST,
+                              '10.0.0.0', '255.0.0.0'),
+            OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_ETH_TYPE, 0x800),
+            OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_METADATA, 1,
+                              2**64 - 1)])
+        self.assertEqual(self.match, other)
+        self.assertEqual(hash(self.match), hash(other))
+        self.assertNotEqual(self.match.pack(), other.pack())
+
+    def test_unpacked(self):
+        """Unpacked matches should have the same key."""
+        unpacked = Match()
+        unpacked.unpack(self.match.pack())
+        self.assertEqual({self.match: 1}[unpacked], 1)
+
+    def test_cache(self):
+        """The cached key should be dropped when the fields change."""
+        key = self.match.match_key()
+        self.assertIs(self.match.match_key()[1], key[1])
+        self.match.oxm_match_fields.pop()
+        self.assertEqual(len(self.match.match_key()[1]), 2)
+        self.assertNotEqual(self.match.match_key(), key)
+
+    def test_tlv_replacement(self):
+        """Replacing a TLV should change the key and the hash."""
+        other = deepcopy(self.match)
+        self.assertEqual(hash(self.match), hash(other))
+        self.match.oxm_match_fields[1] = OxmTLV.from_value(
+            OxmOfbMatchField.OFPXMT_OFB_ETH_TYPE, 0x86dd)
+        self.assertEqual(self.match.match_key()[1][1][2], b'\x86\xdd')
+        self.assertNotEqual(self.match, other)
+        self.assertNotEqual(hash(self.match), hash(other))
+
+
+class TestOxmCodecs(TestCase):
+    """Test the typed values of OpenFlow basic TLVs."""
+
+    def test_registry(self):
+        """Every OpenFlow basic field should have a codec."""
+        self.assertEqual(set(OXM_CODECS), set(OxmOfbMatchField))
+        codec = OXM_CODECS[OxmOfbMatchField.OFPXMT_OFB_PBB_ISID]
+        self.assertEqual((codec.width, codec.mask_width), (3, 3))
+        codec = OXM_CODECS[OxmOfbMatchField.OFPXMT_OFB_IN_PORT]
+        self.assertEqual((codec.width, codec.mask_width), (4, 0))
+
+    def test_from_value(self):
+        """TLVs should be packed from ints and addresses."""
+        cases = [
+            (OxmOfbMatchField.OFPXMT_OFB_IN_PORT, 2, None,
+             b'\x80\x00\x00\x04\x00\x00\x00\x02'),
+            (OxmOfbMatchField.OFPXMT_OFB_PBB_ISID, 0x10203, 0xffffff,
+             b'\x80\x00\x4b\x06\x01\x02\x03\xff\xff\xff'),
+            (OxmOfbMatchField.OFPXMT_OFB_ETH_DST, '01:02:03:04:05:06', None,
+             b'\x80\x00\x06\x06\x01\x02\x03\x04\x05\x06'),
+            (OxmOfbMatchField.OFPXMT_OFB_IPV4_SRC, IPAddress('10.0.0.1'),
+             '255.0.0.0',
+             b'\x80\x00\x17\x08\x0a\x00\x00\x01\xff\x00\x00\x00')]
+        for field, value, mask, packed in cases:
+            with self.subTest(field=field):
+                tlv = OxmTLV.from_value(field, value, mask)
+                self.assertEqual(tlv.pack(), packed)
+                unpacked = OxmTLV()
+                unpacked.unpack(packed)
+                self.assertEqual(unpacked.typed_value, value)
+                self.assertEqual(unpacked.typed_mask, mask)
+
+    def test_typed_address(self):
+        """Address fields should be decoded to address types."""
+        tlv = OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_IPV6_DST, '::1')
+        self.assertIsInstance(tlv.typed_value, IPv6Address)
+        tlv = OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_ARP_SHA,
+                                HWAddress('0a:0b:0c:0d:0e:0f'))
+        self.assertIsInstance(tlv.typed_value, HWAddress)
+        self.assertIsNone(tlv.typed_mask)
+
+    def test_prefix_length(self):
+        """The prefix length of IP addresses should become the mask."""
+        for value in '10.1.0.0/8', IPAddress('10.1.0.0/8'):
+            tlv = OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_IPV4_DST,
+                                    value)
+            self.assertTrue(tlv.oxm_hasmask)
+            self.assertEqual(str(tlv.typed_value), '10.1.0.0')
+            self.assertEqual(str(tlv.typed_mask), '255.0.0.0')
+        tlv = OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_IPV6_SRC,
+                                '2001:db8::/32')
+        self.assertEqual(bytes(tlv.oxm_value)[16:], b'\xff' * 4 + bytes(12))
+        tlv = OxmTLV.from_value(OxmOfbMatchField.OFPXMT_OFB_IPV4_DST,
+                                '10.0.0.1/32')
+        self.assertFalse(tlv.oxm_hasmask)
+        self.assertEqual(bytes(tlv.oxm_value), b'\x0a\x00\x00\x01')
+
+    def test_invalid_values(self):
+        """Invalid values, masks and fields should raise ValueError."""
+        for field, value, mask in (
+                (OxmOfbMatchField.OFPXMT_OFB_VLAN_PCP, 256, None),
+                (OxmOfbMatchField.OFPXMT_OFB_IN_PORT, 1, 1),
+                (OxmOfbMatchField.OFPXMT_OFB_ETH_SRC, 'invalid', None),
+                (OxmOfbMatchField.OFPXMT_OFB_IN_PORT, -1, None),
+                (OxmOfbMatchField.OFPXMT_OFB_PBB_ISID, 1 << 24, None),
+                (OxmOfbMatchField.OFPXMT_OFB_PBB_ISID, -1, None),
+                (OxmOfbMatchField.OFPXMT_OFB_PBB_ISID, 1, 1 << 24),
+                (OxmOfbMatchField.OFPXMT_OFB_IPV4_DST, '10.0.0.0/8',
+                 '255.0.0.0'),
+                (OxmOfbMatchField.OFPXMT_OFB_IPV4_DST, '10.0.0.0/40', None),
+                (42, 1, None)):
+            with self.subTest(field=field, value=value, mask=mask):
+                self.assertRaises(ValueError, OxmTLV.from_value, field,
+                                  value, mask)
+
+    def test_invalid_size(self):
+        """A value of the wrong size should raise UnpackException."""
+        tlv = OxmTLV(oxm_field=OxmOfbMatchField.OFPXMT_OFB_IN_PORT,
+                     oxm_value=b'abc')
+        with self.assertRaises(UnpackException):
+            tlv.typed_value  # pylint: disable=pointless-statement
+        tlv.oxm_class = OxmClass.OFPXMC_EXPERIMENTER
+        with self.assertRaises(ValueError):
+            tlv.typed_value  # pylint: disable=pointless-statement
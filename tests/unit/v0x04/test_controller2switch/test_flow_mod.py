@@ -1,10 +1,15 @@
 """FlowMod test."""
-from pyof.v0x04.common.action import ActionOutput, ListOfActions
+from copy import deepcopy
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyof.v0x04.common.action import ActionHeader, ActionOutput, ListOfActions
 from pyof.v0x04.common.flow_instructions import (
     InstructionApplyAction, ListOfInstruction)
 from pyof.v0x04.common.flow_match import (
     Match, MatchType, OxmClass, OxmOfbMatchField, OxmTLV)
 from pyof.v0x04.common.port import PortNo
+from pyof.v0x04.common.utils import unpack_message
 from pyof.v0x04.controller2switch.flow_mod import FlowMod, FlowModCommand
 from tests.unit.test_struct import TestStruct
 
@@ -23,6 +28,26 @@ class TestFlowMod(TestStruct):
         super().set_minimum_size(56)
 
 
+class TestFlowModLists(TestCase):
+    """Test the list classes of unpacked and copied FlowMods."""
+
+    def test_unpacked_list_classes(self):
+        """The instruction and action lists should keep their classes."""
+        message = FlowMod(xid=1, command=FlowModCommand.OFPFC_ADD,
+                          match=_new_match(),
+                          instructions=_new_list_of_instructions())
+        with patch.object(ActionHeader, 'iter_unpack',
+                          wraps=ActionHeader.iter_unpack) as iter_unpack:
+            unpacked = unpack_message(message.pack())
+        iter_unpack.assert_called_once()
+        for flow_mod in unpacked, deepcopy(unpacked):
+            self.assertIs(type(flow_mod.instructions), ListOfInstruction)
+            actions = flow_mod.instructions[0].actions
+            self.assertIs(type(actions), ListOfActions)
+            self.assertIsInstance(actions[0], ActionOutput)
+            self.assertEqual(flow_mod, message)
+
+
 def _new_match():
     """Crate new Match instance."""
     oxm_tlv1 = OxmTLV(oxm_class=OxmClass.OFPXMC_OPENFLOW_BASIC,
@@ -2,8 +2,8 @@
 from unittest import TestCase
 
 from pyof.v0x04.controller2switch.meter_mod import (
-    MeterBandDrop, MeterBandDscpRemark, MeterBandExperimenter, MeterBandHeader,
-    MeterMod)
+    ListOfMeterBandHeader, MeterBandDrop, MeterBandDscpRemark,
+    MeterBandExperimenter, MeterBandHeader, MeterBandType, MeterMod)
 
 
 class TestMeterMod(TestCase):
@@ -13,6 +13,20 @@ class TestMeterMod(TestCase):
         """Test minimum message size."""
         self.assertEqual(16, MeterMod().get_size())
 
+    def test_unpack_bands(self):
+        """Each band should be unpacked with the class of its type."""
+        bands = [MeterBandDrop(rate=10, burst_size=1),
+                 MeterBandExperimenter(rate=20, burst_size=2,
+                                       experimenter=0x2320),
+                 MeterBandDscpRemark(rate=30, burst_size=3, prec_level=1)]
+        packed = MeterMod(xid=1, command=0, flags=1, meter_id=5,
+                          bands=ListOfMeterBandHeader(bands)).pack()
+        message = MeterMod()
+        message.unpack(packed[8:])
+        self.assertEqual([type(band) for band in message.bands],
+                         [type(band) for band in bands])
+        self.assertEqual(message.bands[1].experimenter, 0x2320)
+
 
 class TestMeterBandHeader(TestCase):
     """MeterBandHeader test."""
@@ -21,6 +35,13 @@ class TestMeterBandHeader(TestCase):
         """Test minimum message size."""
         self.assertEqual(12, MeterBandHeader().get_size())
 
+    def test_find_class(self):
+        """Band types should find the classes that unpack them."""
+        self.assertEqual([band_type.find_class()
+                          for band_type in MeterBandType],
+                         [MeterBandDrop, MeterBandDscpRemark,
+                          MeterBandExperimenter])
+
 
 class TestMeterBandDrop(TestCase):
     """MeterBandDrop test."""